@@ -0,0 +1,64 @@
+# benchmarks/compare.py
+#
+# Compares two benchmarks.run result files case by case.
+# Usage: python -m benchmarks.compare base.json head.json --threshold 0.10
+# Exits with status 1 when any case got slower (or used more memory) than the threshold allows.
+
+import argparse
+import json
+
+
+def load_results(path):
+    with open(path, "r") as f:
+        report = json.load(f)
+    return report["meta"], {
+        (r["case"], r["signals"], r["nodes"]): r for r in report["results"] if "skipped" not in r
+    }
+
+
+def ratio(head, base):
+    return head / base if base else float("inf") if head else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, e.g. 0.10 = 10%%")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="ignore timing noise below this")
+    args = parser.parse_args()
+
+    base_meta, base = load_results(args.base)
+    head_meta, head = load_results(args.head)
+    print(f"base: {base_meta.get('commit')}  head: {head_meta.get('commit')}\n")
+    print(f"{'case':<34} {'signals':>9} {'nodes':>8} {'base s':>9} {'head s':>9} {'time':>7} {'memory':>7}")
+
+    regressions = []
+    for key in sorted(set(base) & set(head), key=lambda k: (k[1], k[2], k[0])):
+        b, h = base[key], head[key]
+        time_ratio = ratio(h["seconds"], b["seconds"])
+        memory_ratio = ratio(h.get("peak_bytes", 0), b.get("peak_bytes", 0))
+
+        flags = ""
+        if max(b["seconds"], h["seconds"]) >= args.min_seconds and time_ratio > 1 + args.threshold:
+            flags += " ⚠️ slower"
+            regressions.append(key)
+        if "peak_bytes" in b and "peak_bytes" in h and memory_ratio > 1 + args.threshold:
+            flags += " ⚠️ memory"
+            regressions.append(key)
+
+        print(f"{key[0]:<34} {key[1]:>9} {key[2]:>8} {b['seconds']:>9.4f} {h['seconds']:>9.4f} "
+              f"{time_ratio:>6.2f}x {memory_ratio:>6.2f}x{flags}")
+
+    missing = sorted(set(base) - set(head))
+    for key in missing:
+        print(f"{key[0]:<34} {key[1]:>9} {key[2]:>8} missing from head")
+
+    if regressions:
+        print(f"\n❌ {len(set(regressions))} case(s) regressed beyond {args.threshold:.0%}")
+        raise SystemExit(1)
+    print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
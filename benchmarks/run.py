@@ -0,0 +1,244 @@
+# benchmarks/run.py
+#
+# Times and memory-profiles the analysis hot paths on synthetic populations
+# and saves the results as JSON for benchmarks.compare.
+# Usage: python -m benchmarks.run --preset small medium --output results.json
+#        python -m benchmarks.run --signals 50000 --nodes 5000 --cases build_graph track_co_occurrence
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from benchmarks.synthetic import make_population
+from src.co_occurrence import CoOccurrenceIndex, decay_weighted_lookup, track_co_occurrence
+from src.contradiction_utils import ContradictionEngine, detect_contradictions
+from src.export_utils import (
+    export_graph_to_json, export_nodes_to_csv, export_propagation_timeline, export_signals_to_csv,
+    stream_propagation_timeline,
+)
+from src.dedup import collapse_duplicates
+from src.graph_utils import build_graph, compute_power_index, detect_cross_platform_bridges
+from src.cascade import simulate_cascades
+from src.signal_store import SignalStore
+from src.simulator import simulate_propagation
+from src.text_features import FeatureExtractor
+
+# (signals, nodes)
+PRESETS = {
+    "tiny": (1_000, 100),
+    "small": (10_000, 1_000),
+    "medium": (100_000, 10_000),
+    "large": (1_000_000, 100_000),
+    "xlarge": (10_000_000, 1_000_000),
+}
+
+LOOKUP_TEXTS = 10_000
+EXACT_CENTRALITY_MAX_NODES = 5_000
+CENTRALITY_SAMPLES = 200
+MAX_CONTRADICTION_PAIRS = 2_000_000
+CASCADE_SIGNALS = 200
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[["Workload"], object]
+    # Returns a reason string when the case should be skipped at this size
+    skip: Optional[Callable[["Workload"], Optional[str]]] = None
+
+
+class Workload:
+    """One synthetic population plus the intermediate results later cases reuse."""
+
+    def __init__(self, signals: int, nodes: int, seed: int, workdir: str):
+        self.size = {"signals": signals, "nodes": nodes}
+        self.nodes, self.signals = make_population(signals, nodes, seed=seed)
+        self.workdir = workdir
+        with quiet():
+            self.graph = build_graph(self.nodes, self.signals)
+            self.co_map = track_co_occurrence(self.signals, engine="sparse", nodes=self.nodes)
+            self.timeline = simulate_propagation(self.signals)
+        self.index = CoOccurrenceIndex.from_map(self.co_map)
+        self.texts = [s.content for s in self.signals[:LOOKUP_TEXTS]]
+        self.power_scores = {node: 1.0 for node in self.graph.nodes()}
+
+    def path(self, filename):
+        return os.path.join(self.workdir, filename)
+
+    @property
+    def exact_centrality(self):
+        return self.graph.number_of_nodes() <= EXACT_CENTRALITY_MAX_NODES
+
+
+@contextlib.contextmanager
+def quiet():
+    """The analysis functions print per node/signal; send that to /dev/null while timing."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def upsert_fresh_store(w):
+    """Every signal into an empty store: one transaction of inserts."""
+    path = w.path("signals.sqlite")
+    if os.path.exists(path):
+        os.remove(path)
+    store = SignalStore(path)
+    try:
+        return store.upsert(w.signals)
+    finally:
+        store.close()
+
+
+def extract_text_features(w):
+    """Fresh memo each time; leaves the workload's signals without features so later cases scan text."""
+    extractor = FeatureExtractor(w.nodes)
+    return [extractor.extract(s.title, s.content) for s in w.signals]
+
+
+def skip_loop_engine(w):
+    if w.size["signals"] * w.size["nodes"] > 5e9:
+        return "loop engine is O(signals x entities)"
+
+
+def skip_pair_listing(w):
+    pairs = ContradictionEngine(w.signals).count()
+    if pairs > MAX_CONTRADICTION_PAIRS:
+        return f"{pairs} pairs to list"
+
+
+CASES = [
+    Case("build_graph", lambda w: build_graph(w.nodes, w.signals)),
+    Case("track_co_occurrence[sparse]", lambda w: track_co_occurrence(w.signals, engine="sparse", nodes=w.nodes)),
+    Case("track_co_occurrence[loop]", lambda w: track_co_occurrence(w.signals, engine="loop", nodes=w.nodes),
+         skip=skip_loop_engine),
+    Case("decay_weighted_lookup", lambda w: [decay_weighted_lookup(text, w.co_map) for text in w.texts]),
+    Case("co_occurrence_index.top_1_batch", lambda w: w.index.top_1_batch(w.texts)),
+    Case("collapse_duplicates", lambda w: collapse_duplicates(w.signals)),
+    Case("extract_text_features", extract_text_features),
+    Case("detect_cross_platform_bridges", lambda w: detect_cross_platform_bridges(w.signals, w.nodes)),
+    Case("compute_power_index", lambda w: compute_power_index(
+        w.graph, approximate=not w.exact_centrality, samples=None if w.exact_centrality else CENTRALITY_SAMPLES
+    )),
+    Case("contradictions[count+mark]", lambda w: ContradictionEngine(w.signals).mark()),
+    Case("detect_contradictions", lambda w: sum(1 for _ in detect_contradictions(w.signals)), skip=skip_pair_listing),
+    Case("simulate_propagation", lambda w: simulate_propagation(w.signals)),
+    Case("simulate_cascades", lambda w: simulate_cascades(w.graph, w.signals[:CASCADE_SIGNALS], seed=1)),
+    Case("export_signals_to_csv", lambda w: export_signals_to_csv(w.signals, w.path("signals.csv"))),
+    Case("export_nodes_to_csv", lambda w: export_nodes_to_csv(w.graph, w.power_scores, w.path("nodes.csv"))),
+    Case("export_graph_to_json", lambda w: export_graph_to_json(w.graph, w.path("graph.json"))),
+    Case("export_propagation_timeline", lambda w: export_propagation_timeline(w.timeline, w.path("timeline.csv"))),
+    Case("signal_store.upsert", upsert_fresh_store),
+    Case("stream_propagation_timeline", lambda w: stream_propagation_timeline(w.signals, w.path("timeline.csv"))),
+]
+CASE_NAMES = [case.name for case in CASES]
+
+
+def measure(case: Case, workload: Workload, repeat: int, memory: bool) -> dict:
+    result = {"case": case.name, **workload.size}
+    if case.skip is not None:
+        reason = case.skip(workload)
+        if reason:
+            result["skipped"] = reason
+            return result
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        with quiet():
+            start = time.perf_counter()
+            case.run(workload)
+            times.append(time.perf_counter() - start)
+    result["seconds"] = min(times)
+    result["seconds_all"] = times
+
+    if memory:
+        # Separate pass: tracemalloc slows allocation-heavy code several times over
+        gc.collect()
+        tracemalloc.start()
+        with quiet():
+            case.run(workload)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_bytes"] = peak
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the signal-geometry hot paths on synthetic data")
+    parser.add_argument("--preset", nargs="+", choices=PRESETS, help="named sizes (default: small)")
+    parser.add_argument("--signals", type=int, help="custom signal count (with --nodes)")
+    parser.add_argument("--nodes", type=int, help="custom node count (with --signals)")
+    parser.add_argument("--cases", nargs="+", choices=CASE_NAMES, help="subset of cases to run")
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs per case; the minimum is reported")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/<commit>.json)")
+    args = parser.parse_args()
+
+    sizes = [PRESETS[name] for name in args.preset or []]
+    if args.signals or args.nodes:
+        sizes.append((args.signals or 10_000, args.nodes or 1_000))
+    sizes = sizes or [PRESETS["small"]]
+    cases = [case for case in CASES if not args.cases or case.name in args.cases]
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for signals, nodes in sizes:
+            print(f"\n📦 signals={signals} nodes={nodes}: generating workload...")
+            start = time.perf_counter()
+            workload = Workload(signals, nodes, args.seed, workdir)
+            print(f"   ready in {time.perf_counter() - start:.1f}s "
+                  f"({workload.graph.number_of_nodes()} graph nodes, {workload.graph.number_of_edges()} edges)")
+
+            for case in cases:
+                result = measure(case, workload, args.repeat, memory=not args.no_memory)
+                report["results"].append(result)
+                if "skipped" in result:
+                    print(f"   {case.name:<34} skipped ({result['skipped']})")
+                else:
+                    peak = f"{result['peak_bytes'] / 2**20:9.1f} MiB" if "peak_bytes" in result else ""
+                    print(f"   {case.name:<34} {result['seconds']:9.4f}s {peak}")
+            del workload
+            gc.collect()
+
+    output = args.output or os.path.join("benchmarks", "results", f"{commit or 'local'}.json")
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
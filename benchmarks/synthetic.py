@@ -0,0 +1,138 @@
+# benchmarks/synthetic.py
+#
+# Seeded synthetic Node / Signal populations for benchmarks.
+# The same (count, seed) always produces the same population.
+
+from typing import Iterator, List
+
+import numpy as np
+
+from src.model import Node, Signal
+
+SOURCES = ("reddit", "newsapi", "twitter")
+SOURCE_WEIGHTS = (0.5, 0.3, 0.2)
+SUBREDDITS = ("worldnews", "politics", "technology", "india", "europe", "geopolitics", "economics", "news")
+FILLER = (
+    "market", "vote", "border", "summit", "leak", "press", "report", "deal", "tariff", "rally",
+    "policy", "election", "sanctions", "court", "ceasefire", "budget", "protest", "trade", "energy", "strike",
+)
+PLATFORM_WORDS = ("twitter", "reddit", "youtube", "tweet", "thread", "viral", "trending")
+CONTRADICTION_WORDS = ("false", "fake", "hoax", "debunked", "misleading", "never")
+
+# Route length distribution (hops incl. origin); most routes are 2-4 nodes long
+ROUTE_LENGTHS = (1, 2, 3, 4, 5, 6, 8)
+ROUTE_LENGTH_WEIGHTS = (0.12, 0.33, 0.27, 0.14, 0.07, 0.04, 0.03)
+
+# Share of node types; platforms get a region so bridge detection has work to do
+NODE_TYPES = ("influencer", "institution", "platform", "machine", "router")
+NODE_TYPE_WEIGHTS = (0.05, 0.10, 0.05, 0.02, 0.78)
+REGIONS = ("us", "uk", "india", "china", "russia", "eu", "global")
+
+BASE_EPOCH = 1735689600  # 2025-01-01T00:00:00Z
+
+
+def node_id(i: int) -> str:
+    # Zero-padded so one id is never a substring of another
+    return f"node_{i:07d}"
+
+
+def popularity(count: int, exponent: float = 1.1) -> np.ndarray:
+    """Zipf-like probabilities: a few nodes appear in most routes and mentions."""
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def make_nodes(count: int, seed: int = 42) -> List[Node]:
+    rng = np.random.default_rng(seed)
+    types = rng.choice(len(NODE_TYPES), size=count, p=NODE_TYPE_WEIGHTS)
+    regions = rng.integers(0, len(REGIONS), size=count)
+    nodes = []
+    for i, (t, r) in enumerate(zip(types.tolist(), regions.tolist())):
+        node_type = NODE_TYPES[t]
+        metadata = {"region": REGIONS[r]} if node_type in ("platform", "influencer", "institution") else None
+        nodes.append(Node(id=node_id(i), type=node_type, metadata=metadata))
+    return nodes
+
+
+def iter_signal_chunks(count: int, nodes: List[Node], seed: int = 42, chunk_size: int = 100_000,
+                       words: int = 14, mention_rate: float = 1.5, platform_rate: float = 0.3,
+                       contradiction_rate: float = 0.2, span_seconds: int = 7 * 24 * 3600) -> Iterator[List[Signal]]:
+    """
+    Yields lists of at most chunk_size signals.
+
+    Each signal gets a route drawn from ROUTE_LENGTHS over Zipf-popular nodes,
+    `words` filler words, a Poisson(mention_rate) number of node-id mentions,
+    and platform / contradiction keywords with the given probabilities.
+    """
+    rng = np.random.default_rng(seed)
+    ids = [node.id for node in nodes]
+    node_p = popularity(len(ids))
+    length_p = np.asarray(ROUTE_LENGTH_WEIGHTS) / sum(ROUTE_LENGTH_WEIGHTS)
+
+    for start in range(0, count, chunk_size):
+        n = min(chunk_size, count - start)
+        lengths = rng.choice(ROUTE_LENGTHS, size=n, p=length_p)
+        hops = rng.choice(len(ids), size=int(lengths.sum()), p=node_p)
+        # Popular nodes would otherwise often follow themselves; keep consecutive hops distinct
+        repeated = np.flatnonzero(hops[1:] == hops[:-1]) + 1
+        hops[repeated] = (hops[repeated] + 1) % len(ids)
+        route_offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+        mentions = rng.poisson(mention_rate, size=n)
+        mention_ids = rng.choice(len(ids), size=int(mentions.sum()), p=node_p)
+        mention_offsets = np.concatenate(([0], np.cumsum(mentions)))
+
+        filler = rng.integers(0, len(FILLER), size=(n, words))
+        platform = rng.random(n) < platform_rate
+        platform_word = rng.integers(0, len(PLATFORM_WORDS), size=n)
+        contradiction = rng.random(n) < contradiction_rate
+        contradiction_word = rng.integers(0, len(CONTRADICTION_WORDS), size=n)
+
+        sources = rng.choice(len(SOURCES), size=n, p=SOURCE_WEIGHTS)
+        subreddits = rng.integers(0, len(SUBREDDITS), size=n)
+        epochs = BASE_EPOCH + rng.integers(0, span_seconds, size=n)
+        metrics = rng.random((n, 3)).round(2)
+
+        chunk = []
+        for k in range(n):
+            tokens = [FILLER[w] for w in filler[k]]
+            tokens += [ids[m] for m in mention_ids[mention_offsets[k]:mention_offsets[k + 1]]]
+            if platform[k]:
+                tokens.append(PLATFORM_WORDS[platform_word[k]])
+            if contradiction[k]:
+                tokens.append(CONTRADICTION_WORDS[contradiction_word[k]])
+            # Cheap deterministic rotation so mentions are not always at the end
+            rotate = (k * 7919) % len(tokens)
+            tokens = tokens[rotate:] + tokens[:rotate]
+
+            route = [ids[h] for h in hops[route_offsets[k]:route_offsets[k + 1]]]
+            source = SOURCES[sources[k]]
+            entropy, velocity, impact = metrics[k].tolist()
+            chunk.append(Signal(
+                id=f"synthetic_{start + k}",
+                content=" ".join(tokens),
+                title=" ".join(tokens[:6]),
+                source=source,
+                timestamp=int(epochs[k]),
+                entropy=entropy,
+                velocity=velocity,
+                impact=impact,
+                node=route[0],
+                route=route,
+                subreddit=SUBREDDITS[subreddits[k]] if source == "reddit" else None,
+                seed_node=route[0]
+            ))
+        yield chunk
+
+
+def make_signals(count: int, nodes: List[Node], seed: int = 42, **kwargs) -> List[Signal]:
+    signals = []
+    for chunk in iter_signal_chunks(count, nodes, seed=seed, **kwargs):
+        signals.extend(chunk)
+    return signals
+
+
+def make_population(signals: int, nodes: int, seed: int = 42):
+    """(nodes, signals) for one benchmark size."""
+    node_list = make_nodes(nodes, seed=seed)
+    return node_list, make_signals(signals, node_list, seed=seed + 1)
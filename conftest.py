@@ -0,0 +1,16 @@
+# conftest.py
+
+from src.model import Signal
+
+# Makes a live PRAW call on import; run it by hand with credentials instead
+collect_ignore = ["test_collector.py"]
+
+SIGNAL_DEFAULTS = {
+    "id": "s0", "content": "", "title": "", "source": "test", "timestamp": "2025-01-01T00:00:00Z",
+    "entropy": 0.5, "velocity": 0.5, "impact": 1.0,
+}
+
+
+def make_signal(**overrides) -> Signal:
+    """Test signal with neutral defaults; tests pass only the fields they care about."""
+    return Signal(**{**SIGNAL_DEFAULTS, **overrides})
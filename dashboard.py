@@ -1,7 +1,8 @@
 # dashboard.py
 
 import streamlit as st
-import pandas as pd
+
+from src.dashboard_data import SIGNAL_COLUMNS, load_signal_table, load_summary, page_count, source_options
 
 st.set_page_config(layout="wide")
 st.title("🧠 Signal Geometry Dashboard")
@@ -9,31 +10,43 @@ st.title("🧠 Signal Geometry Dashboard")
 # --- Section 1: Full Raw Signal Data Table ---
 st.header("📄 Raw Signal Dataset")
 
-# Load enriched signal.csv
+# Load enriched signals once per export (signals.parquet when present, else signals.csv)
 try:
-    df = pd.read_csv("signals.csv")
+    table = load_signal_table("signals", SIGNAL_COLUMNS)
 except FileNotFoundError:
-    st.error("signals.csv not found. Please run main.py to generate data.")
+    st.error("signals.parquet / signals.csv not found. Please run main.py to generate data.")
     st.stop()
-
-# Define expected columns (order + categories)
-columns = [
-    "id", "title", "subreddit", "source",                    # Basic
-    "entropy", "velocity", "impact",                         # Core
-    "route", "route_length",                                 # Propagation
-    "drift_score", "nsi_score",                              # Narrative/Truth
-    "recursion_score", "recursive_depth",                    # Feedback Loop
-    "power_index", "seed_node"                               # Influence
-]
-
-# Ensure all fields are present and format table
-def format_cell(val):
-    if pd.isna(val) or val == "":
-        return "❌"
-    return val
-
-styled_df = df[columns].style.format(format_cell)
-st.dataframe(styled_df, use_container_width=True, height=500)
+summary = load_summary(table)
+
+# Summary aggregates come precomputed from the export
+metric_cols = st.columns(4)
+metric_cols[0].metric("Signals", f"{summary['rows']:,}")
+for col, name in zip(metric_cols[1:], ("entropy", "velocity", "nsi_score")):
+    mean = summary["metrics"][name]["mean"]
+    col.metric(f"Mean {name}", "❌" if mean is None else f"{mean:.3f}")
+
+# Filters, sorting and paging run server-side; only the visible page is formatted
+with st.sidebar:
+    st.header("🔎 Filter signals")
+    search = st.text_input("Title contains")
+    sources = st.multiselect("Source", source_options(summary))
+    entropy_range = st.slider("Entropy", 0.0, 1.0, (0.0, 1.0), step=0.05)
+    sort_by = st.selectbox("Sort by", ["(export order)"] + SIGNAL_COLUMNS)
+    descending = st.checkbox("Descending", value=True)
+    page_size = st.selectbox("Rows per page", [50, 100, 250, 500], index=1)
+
+ranges = {} if entropy_range == (0.0, 1.0) else {"entropy": entropy_range}
+rows = table.query(
+    search=search, sources=sources, ranges=ranges,
+    sort_by=None if sort_by == "(export order)" else sort_by, descending=descending
+)
+pages = page_count(rows, page_size)
+page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1) - 1
+st.caption(f"{len(rows):,} matching signals")
+st.dataframe(table.page(rows, page, page_size), use_container_width=True, height=500)
+
+with st.expander("Per-source averages", expanded=False):
+    st.dataframe(summary["by_source"], use_container_width=True)
 
 # --- Section 2: Metric Legend (no nesting error) ---
 st.markdown("---")
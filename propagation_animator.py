@@ -1,32 +1,19 @@
 # src/propagation_animator.py
+#
+# Renders timeline.csv/.parquet over graph.json as propagation_highdef.gif.
+# Usage: python propagation_animator.py [--workers 4] [--dpi 200]
 
+import argparse
 import json
-import matplotlib.pyplot as plt
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
 import networkx as nx
-import matplotlib.animation as animation
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from pathlib import Path
-
-# Load graph
-with open("graph.json", "r") as f:
-    data = json.load(f)
-G = nx.node_link_graph(data)
-
-# Load and preprocess timeline
-df = pd.read_csv("timeline.csv")
-df["parsed_time"] = pd.to_datetime(df["arrival_time"])
-df = df.sort_values("parsed_time")
-
-# Map timestamps to time steps
-time_step_map = {t: i for i, t in enumerate(sorted(df["parsed_time"].unique()))}
-df["time_step"] = df["parsed_time"].map(time_step_map)
-
-# Build arrival lookup
-arrival_time = {}
-for _, row in df.iterrows():
-    step = row["time_step"]
-    arrival_time.setdefault(step, []).append(row["node"])
+from src.export_utils import read_export
 
 # Layout logic
 type_colors = {
@@ -43,41 +30,180 @@ layer_y = {
     "platform": 0,
     "machine": -1
 }
-pos = {}
-for i, node in enumerate(G.nodes):
-    t = G.nodes[node].get("type", "router")
-    pos[node] = (i % 10, layer_y.get(t, 1))
-
-# Animation
-fig, ax = plt.subplots(figsize=(12, 8), dpi=200)
-plt.axis("off")
-
-def update(frame):
-    ax.clear()
-    plt.title("Signal Propagation Over Time", fontsize=14)
-    plt.axis("off")
-    
-    highlighted = set()
-    for t in range(frame + 1):
-        highlighted.update(arrival_time.get(t, []))
-
-    node_colors = [
-        "#e74c3c" if node in highlighted else "#d3d3d3"
-        for node in G.nodes
+
+ARRIVED_COLOR = "#e74c3c"
+WAITING_COLOR = "#d3d3d3"
+
+
+@dataclass
+class AnimationState:
+    """
+    Everything a frame needs, computed once: node and edge positions plus the
+    time step at which each node first receives a signal. A node is lit from
+    its step on, and an edge is active once its target is lit, so frame f is
+    a comparison against f instead of a replay of steps 0..f. Edges are
+    sorted by step, which makes the active edges of any frame a prefix.
+    """
+    nodes: List[str]
+    positions: np.ndarray     # (n, 2)
+    node_step: np.ndarray     # first arrival step per node; frames if never reached
+    edges: np.ndarray         # (m, 2) node indices, sorted by edge_step
+    edge_step: np.ndarray
+    frames: int
+
+
+def load_state(graph_path="graph.json", timeline_stem="timeline") -> AnimationState:
+    with open(graph_path, "r") as f:
+        G = nx.node_link_graph(json.load(f))
+
+    # Time step = rank of the arrival time among all distinct arrival times
+    df = read_export(timeline_stem, columns=["node", "arrival_time"])
+    parsed_time = pd.to_datetime(df["arrival_time"], utc=True)
+    df = df.assign(time_step=parsed_time.rank(method="dense") - 1).dropna(subset=["time_step"])
+    frames = int(df["time_step"].max()) + 1 if len(df) else 0
+    first_step = df.groupby("node")["time_step"].min()
+
+    nodes = list(G.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    node_step = np.full(len(nodes), frames, dtype=np.int64)
+    known = first_step[first_step.index.isin(index)]
+    node_step[[index[node] for node in known.index]] = known.to_numpy(dtype=np.int64)
+
+    positions = np.array(
+        [(i % 10, layer_y.get(G.nodes[node].get("type", "router"), 1)) for i, node in enumerate(nodes)],
+        dtype=np.float64
+    ).reshape(-1, 2)
+    edges = np.array([(index[u], index[v]) for u, v in G.edges], dtype=np.int64).reshape(-1, 2)
+    edge_step = node_step[edges[:, 1]]
+    order = np.argsort(edge_step, kind="stable")
+    return AnimationState(nodes, positions, node_step, edges[order], edge_step[order], frames)
+
+
+def label_coverage(state: AnimationState, ax, figsize, dpi):
+    """
+    Rasterises the (black) node labels once over white, in the same axes
+    geometry as ax, and returns the covered pixels with their coverage.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    label_ax = fig.add_axes(ax.get_position())
+    label_ax.axis("off")
+    label_ax.set_xlim(ax.get_xlim())
+    label_ax.set_ylim(ax.get_ylim())
+    for (x, y), node in zip(state.positions.tolist(), state.nodes):
+        label_ax.text(x, y, str(node), fontsize=8, horizontalalignment="center", verticalalignment="center")
+    canvas.draw()
+    coverage = 1.0 - np.asarray(canvas.buffer_rgba())[..., 0] / 255.0
+    covered = np.nonzero(coverage > 0)
+    return covered, coverage[covered][:, None]
+
+
+def render_frames(state: AnimationState, frames: List[int], dpi=200, figsize=(12, 8)):
+    """
+    Renders the given frames as palette images. The static layer (title,
+    all edges) is drawn once and restored per frame; only the active edges
+    and nodes are redrawn, and the pre-rasterised labels are multiplied in.
+    Every worker derives the same palette, so frames match across ranges.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
+    from PIL import Image
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_title("Signal Propagation Over Time", fontsize=14)
+    ax.axis("off")
+
+    G = nx.DiGraph()
+    G.add_nodes_from(range(len(state.nodes)))
+    G.add_edges_from(state.edges.tolist())
+    pos = dict(enumerate(state.positions.tolist()))
+    segments = state.positions[state.edges]
+
+    nx.draw_networkx_edges(G, pos, edge_color="#c0c0c0", alpha=0.2, arrows=True, ax=ax)
+    active = LineCollection([], colors="#3498db", linewidths=2, animated=True)
+    ax.add_collection(active, autolim=False)
+    nodes = nx.draw_networkx_nodes(G, pos, node_color=WAITING_COLOR, node_size=500, edgecolors="black", ax=ax)
+    nodes.set_animated(True)
+
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    covered, coverage = label_coverage(state, ax, figsize, dpi)
+    node_colors = np.array([WAITING_COLOR, ARRIVED_COLOR])
+
+    def draw(frame):
+        canvas.restore_region(background)
+        active.set_segments(segments[:np.searchsorted(state.edge_step, frame, side="right")])
+        nodes.set_facecolor(node_colors[(state.node_step <= frame).astype(np.int64)])
+        ax.draw_artist(active)
+        ax.draw_artist(nodes)
+        pixels = np.array(canvas.buffer_rgba())[..., :3]
+        pixels[covered] = (pixels[covered] * (1.0 - coverage)).astype(np.uint8)
+        return pixels
+
+    # Fixed palette from the first and last states: cheaper than per-frame quantizing
+    palette = Image.fromarray(np.vstack([draw(-1), draw(state.frames - 1)])).quantize(
+        colors=255, method=Image.Quantize.FASTOCTREE
+    )
+    return [
+        Image.fromarray(draw(frame)).quantize(palette=palette, dither=Image.Dither.NONE)
+        for frame in frames
     ]
 
-    nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=500, edgecolors="black", ax=ax)
-    nx.draw_networkx_labels(G, pos, ax=ax, font_size=8)
 
-    active_edges = []
-    for t in range(frame + 1):
-        for node in arrival_time.get(t, []):
-            active_edges.extend([(src, node) for src, _ in G.in_edges(node)])
-    
-    nx.draw_networkx_edges(G, pos, edgelist=G.edges, edge_color="#c0c0c0", alpha=0.2, arrows=True, ax=ax)
-    nx.draw_networkx_edges(G, pos, edgelist=active_edges, edge_color="#3498db", width=2, arrows=True, ax=ax)
+def key_frames(state: AnimationState) -> Tuple[List[int], List[int]]:
+    """
+    Time steps at which the picture changes (some node is first reached) and
+    how many steps each one stays on screen. Steps in between would render
+    identical frames, so they are folded into the previous frame's duration.
+    """
+    steps = np.unique(np.concatenate(([0], state.node_step[state.node_step < state.frames])))
+    return steps.tolist(), np.diff(np.append(steps, state.frames)).tolist()
+
+
+def render_gif(state: AnimationState, output="propagation_highdef.gif", dpi=200,
+               workers: Optional[int] = None, duration=1000):
+    """
+    Renders the key frames and writes the GIF (one time step per second, as
+    before). With workers > 1, contiguous runs of frames render in separate
+    processes and are assembled in order.
+    """
+    frames, spans = key_frames(state)
+    workers = min(workers or os.cpu_count() or 1, len(frames))
+    if workers == 1:
+        images = render_frames(state, frames, dpi)
+    else:
+        parts = [part.tolist() for part in np.array_split(frames, workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            images = [image for part in pool.map(render_frames, [state] * workers, parts, [dpi] * workers)
+                      for image in part]
+
+    images[0].save(output, save_all=True, append_images=images[1:],
+                   duration=[span * duration for span in spans], loop=0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Animate signal propagation over the influence graph")
+    parser.add_argument("--graph", default="graph.json")
+    parser.add_argument("--timeline", default="timeline", help="export stem; .parquet is preferred over .csv")
+    parser.add_argument("--output", default="propagation_highdef.gif")
+    parser.add_argument("--dpi", type=int, default=200)
+    parser.add_argument("--workers", type=int, help="render processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    state = load_state(args.graph, args.timeline)
+    if state.frames == 0:
+        print("❌ Timeline is empty, nothing to animate.")
+        return 1
+    render_gif(state, args.output, dpi=args.dpi, workers=args.workers)
+    print(f"✅ Saved: {args.output}")
+    return 0
 
-ani = animation.FuncAnimation(fig, update, frames=max(arrival_time.keys()) + 1, interval=1000, repeat=False)
 
-ani.save("propagation_highdef.gif", writer="pillow")
-print("✅ Saved: propagation_highdef.gif")
\ No newline at end of file
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,162 @@
+# src/cascade.py
+
+import heapq
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.csr_graph import CSRGraph
+from src.model import Signal, MISSING_EPOCH
+from src.simulator import delay_factors
+
+HOP_SECONDS = 30  # same base delay per hop as simulator.simulate_propagation
+CHUNK_ROWS = 100_000  # timeline rows per yielded chunk
+
+
+class CascadeSimulator:
+    """
+    Independent-cascade spread over the influence graph.
+
+    When a node activates it gets one chance to activate each out-neighbour.
+    The chance is velocity * (1 - entropy) of that edge (times
+    probability_scale). A success arrives after the route simulator's delay,
+    hop_seconds * max(0.1, (1 - velocity + entropy) / 2), rounded to whole
+    seconds. A node keeps its earliest arrival.
+
+    Events live in a heap keyed by integer arrival time. Every node arriving
+    at the same second is expanded as one frontier through the CSR arrays,
+    so the per-event Python work is one heap operation.
+    """
+
+    def __init__(self, graph, probability_scale: float = 1.0, hop_seconds: int = HOP_SECONDS,
+                 horizon: Optional[int] = None, seed: Optional[int] = None):
+        self.graph = graph if isinstance(graph, CSRGraph) else CSRGraph.from_networkx(graph)
+        velocity = self.graph.velocity.astype(np.float64)
+        entropy = self.graph.entropy.astype(np.float64)
+        self.probability = np.clip(probability_scale * velocity * (1.0 - entropy), 0.0, 1.0)
+        self.delay = np.maximum(1, (hop_seconds * delay_factors(velocity, entropy)).astype(np.int64))
+        self.horizon = horizon
+        self.rng = np.random.default_rng(seed)
+
+        # Scratch state reused across cascades; only touched entries are reset
+        self._arrival = np.full(self.graph.n, np.iinfo(np.int64).max, dtype=np.int64)
+        self._settled = np.zeros(self.graph.n, dtype=bool)
+
+    def _out_edges(self, frontier: np.ndarray) -> np.ndarray:
+        """Positions in indices of every out-edge of the frontier nodes."""
+        starts = self.graph.indptr[frontier]
+        counts = self.graph.indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(starts, counts) + offsets
+
+    def run(self, sources) -> tuple:
+        """
+        One cascade from the given node indices at time 0. Returns the
+        activated node indices and their arrival offsets in seconds, in
+        activation order.
+        """
+        arrival, settled = self._arrival, self._settled
+        sources = np.unique(np.asarray(sources, dtype=np.int64))
+        arrival[sources] = 0
+        heap = [0]
+        pending = {0: sources}
+        activated, times, touched = [], [], [sources]
+
+        while heap:
+            now = heapq.heappop(heap)
+            frontier = pending.pop(now)
+            frontier = np.unique(frontier[(arrival[frontier] == now) & ~settled[frontier]])
+            if not frontier.size:
+                continue
+            settled[frontier] = True
+            activated.append(frontier)
+            times.append(np.full(frontier.size, now, dtype=np.int64))
+
+            edges = self._out_edges(frontier)
+            edges = edges[self.rng.random(edges.size) < self.probability[edges]]
+            targets = self.graph.indices[edges].astype(np.int64)
+            candidate = now + self.delay[edges]
+            improves = ~settled[targets] & (candidate < arrival[targets])
+            if self.horizon is not None:
+                improves &= candidate <= self.horizon
+            targets, candidate = targets[improves], candidate[improves]
+            if not targets.size:
+                continue
+
+            np.minimum.at(arrival, targets, candidate)
+            touched.append(targets)
+            for time in np.unique(candidate).tolist():
+                if time in pending:
+                    pending[time] = np.concatenate((pending[time], targets[candidate == time]))
+                else:
+                    pending[time] = targets[candidate == time]
+                    heapq.heappush(heap, time)
+
+        nodes = np.concatenate(activated) if activated else sources[:0]
+        offsets = np.concatenate(times) if times else sources[:0]
+        arrival[np.concatenate(touched)] = np.iinfo(np.int64).max
+        settled[nodes] = False
+        return nodes, offsets
+
+    def iter_chunks(self, signals: Iterable[Signal], chunk_rows: int = CHUNK_ROWS) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Cascades seeded at each signal's first route hop and started at its
+        timestamp, in the column-chunk layout of simulator.iter_timeline_chunks.
+        Seeds missing from the graph produce just their own row.
+
+        A chunk is flushed once it holds chunk_rows rows, so memory is bounded
+        by chunk_rows plus one cascade (at most every node of the graph),
+        however far each signal spreads.
+        """
+        node_ids = np.empty(self.graph.n, dtype=object)
+        node_ids[:] = self.graph.node_ids
+        ids, nodes, arrivals = [], [], []
+        rows = 0
+        for signal in signals:
+            if not signal.route:
+                continue
+            seed = signal.route[0]
+            base_time = signal.epoch
+            if seed in self.graph.index:
+                reached, offsets = self.run([self.graph.index[seed]])
+                names = node_ids[reached]
+            else:
+                names, offsets = np.array([seed], dtype=object), np.zeros(1, dtype=np.int64)
+            ids.append(np.full(len(names), signal.id, dtype=object))
+            nodes.append(names)
+            arrivals.append(np.full(len(names), MISSING_EPOCH, dtype=np.int64)
+                            if base_time == MISSING_EPOCH else base_time + offsets)
+            rows += len(names)
+
+            if rows >= chunk_rows:
+                yield _chunk(ids, nodes, arrivals)
+                ids, nodes, arrivals = [], [], []
+                rows = 0
+        if ids:
+            yield _chunk(ids, nodes, arrivals)
+
+
+def _chunk(ids, nodes, arrivals) -> Dict[str, np.ndarray]:
+    return {
+        "signal_id": np.concatenate(ids),
+        "node": np.concatenate(nodes),
+        "arrival_time": np.concatenate(arrivals),
+    }
+
+
+def simulate_cascades(graph, signals: List[Signal], **options) -> List[Dict]:
+    """
+    Cascade timeline as the list of dicts simulator.simulate_propagation
+    returns; graph may be a networkx graph, a CSRGraph or a CascadeSimulator.
+    """
+    from src.simulator import format_epochs
+
+    simulator = graph if isinstance(graph, CascadeSimulator) else CascadeSimulator(graph, **options)
+    timeline = []
+    for chunk in simulator.iter_chunks(signals):
+        for signal_id, node, arrival_time in zip(
+            chunk["signal_id"].tolist(), chunk["node"].tolist(), format_epochs(chunk["arrival_time"])
+        ):
+            timeline.append({"signal_id": signal_id, "node": node, "arrival_time": arrival_time})
+    return timeline
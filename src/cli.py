@@ -0,0 +1,120 @@
+# src/cli.py
+
+import argparse
+import sys
+
+from src.pipeline import ANALYSIS_SCOPES, PipelineConfig, STAGE_NAMES, run_pipeline
+
+
+def split_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def sample_count(value):
+    from src.graph_utils import MIN_SAMPLES
+
+    samples = int(value)
+    if samples < MIN_SAMPLES:
+        raise argparse.ArgumentTypeError(f"needs at least {MIN_SAMPLES} pivots")
+    return samples
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="signal-geometry",
+        description="Collect signals, build the influence graph and export the analysis."
+    )
+    parser.add_argument("--config", help="JSON or TOML pipeline config; flags override its values")
+    parser.add_argument("--subreddits", type=split_list, help="comma-separated subreddits to scan")
+    parser.add_argument("--topics", type=split_list, help="comma-separated news topics to scan")
+    parser.add_argument("--twitter-nodes", type=split_list, help="comma-separated seed node ids to fetch from Twitter")
+    parser.add_argument("--no-collect", action="store_true", help="skip collection and analyze stored signals")
+    parser.add_argument("--analysis-scope", choices=ANALYSIS_SCOPES,
+                        help="analyze this run's signals, only never-stored ones, or a query of the signal store")
+    parser.add_argument("--store-sources", type=split_list, help="comma-separated sources to load with --analysis-scope store")
+    parser.add_argument("--since", help="earliest timestamp or date to load with --analysis-scope store")
+    parser.add_argument("--until", help="latest timestamp or date (whole day included) to load with --analysis-scope store")
+    parser.add_argument("--no-dedup", action="store_true", help="keep near-duplicate signals instead of merging them")
+    parser.add_argument("--no-plots", action="store_true", help="skip all matplotlib charts")
+    parser.add_argument("--no-response-cache", action="store_true", help="always hit the APIs")
+    parser.add_argument("--approximate-centrality", action="store_true", help="sample centrality pivots")
+    parser.add_argument("--centrality-samples", type=sample_count, help="pivots to sample with --approximate-centrality")
+    parser.add_argument("--graph-backend", choices=["networkx", "csr"], help="backend for centrality and SCC analytics")
+    parser.add_argument("--export-formats", nargs="+", choices=["csv", "parquet"], help="output file formats")
+    parser.add_argument("--stream-timeline", action="store_true", help="write the propagation timeline in bounded memory")
+    parser.add_argument("--propagation-model", choices=["route", "cascade"], help="replay routes or simulate cascades over the graph")
+    parser.add_argument("--resume-from", choices=STAGE_NAMES, help="reuse cached outputs of earlier stages and rerun from this one")
+    parser.add_argument("--no-stage-cache", action="store_true", help="recompute every stage and write no checkpoints")
+    parser.add_argument("--interactive", action="store_true", help="prompt for any sources not given as flags")
+    return parser
+
+
+def prompt_sources(config: PipelineConfig):
+    """The original input() prompts, used only for interactive runs."""
+    if not config.subreddits:
+        config.subreddits = split_list(input("Enter subreddits to scan (comma-separated): "))
+    if not config.news_topics:
+        config.news_topics = split_list(input("Enter news topics to scan (comma-separated, e.g., Ukraine, AI): "))
+    if not config.twitter_nodes:
+        from src.twitter_collector import prompt_twitter_nodes
+        config.twitter_nodes = prompt_twitter_nodes()
+
+
+def config_from_args(args) -> PipelineConfig:
+    config = PipelineConfig.from_file(args.config) if args.config else PipelineConfig()
+    if args.subreddits is not None:
+        config.subreddits = args.subreddits
+    if args.topics is not None:
+        config.news_topics = args.topics
+    if args.twitter_nodes is not None:
+        config.twitter_nodes = args.twitter_nodes
+    if args.no_collect:
+        config.collect = False
+        if config.analysis_scope == "collected":
+            config.analysis_scope = "store"  # nothing else to analyze
+    if args.analysis_scope is not None:
+        config.analysis_scope = args.analysis_scope
+    if args.store_sources is not None:
+        config.store_sources = args.store_sources
+    if args.since is not None:
+        config.store_since = args.since
+    if args.until is not None:
+        config.store_until = args.until
+    if args.no_dedup:
+        config.collapse_duplicates = False
+    if args.no_plots:
+        config.plots = False
+    if args.no_response_cache:
+        config.use_response_cache = False
+    if args.approximate_centrality:
+        config.approximate_centrality = True
+    if args.centrality_samples is not None:
+        config.centrality_samples = args.centrality_samples
+    if args.graph_backend is not None:
+        config.graph_backend = args.graph_backend
+    if args.export_formats is not None:
+        config.export_formats = args.export_formats
+    if args.stream_timeline:
+        config.stream_timeline = True
+    if args.propagation_model is not None:
+        config.propagation_model = args.propagation_model
+    if args.resume_from is not None:
+        config.resume_from = args.resume_from
+    if args.no_stage_cache:
+        config.use_stage_cache = False
+    return config
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config = config_from_args(args)
+
+    # Without any configured source, a terminal session falls back to the old prompts;
+    # cron jobs and workers (no TTY) never block on input()
+    no_sources = not (config.subreddits or config.news_topics or config.twitter_nodes)
+    if args.interactive or (no_sources and config.collect and config.resume_from is None and sys.stdin.isatty()):
+        prompt_sources(config)
+
+    result = run_pipeline(config)
+    # Nothing new since the last run is a normal outcome for scheduled 'new' runs
+    return 0 if result.signals or config.analysis_scope == "new" else 1
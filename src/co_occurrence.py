@@ -1,14 +1,42 @@
+import hashlib
+import re
 from collections import defaultdict
 from src.model import Signal
 from src.seed_nodes import seed_nodes
 
+CO_OCCURRENCE_ENGINES = ("loop", "sparse")
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _valid_entity_ids(nodes=None) -> list[str]:
+    # Valid influencer + institution nodes
+    nodes = seed_nodes if nodes is None else nodes
+    return [node.id for node in nodes if node.type in ("influencer", "institution")]
+
+
+def track_co_occurrence(signals: list[Signal], engine: str = "loop", nodes=None) -> dict:
+    """
+    Builds the weighted co-occurrence memory map {a: {b: {count, weight}}}.
+
+    engine="loop" is the original substring scan; engine="sparse" matches
+    entities on word boundaries and derives counts from one sparse product.
+    """
+    return weight_co_occurrences(count_co_occurrences(signals, engine=engine, nodes=nodes))
+
+
+def count_co_occurrences(signals: list[Signal], engine: str = "loop", nodes=None) -> dict:
+    """Returns raw symmetric pair counts {a: {b: count}} for a batch of signals."""
+    if engine == "sparse":
+        index = build_entity_index(nodes)
+        return pair_counts_from_incidence(build_incidence_matrix(signals, index), index.entity_ids)
+    if engine != "loop":
+        raise ValueError(f"Unknown co-occurrence engine: {engine!r} (expected one of {CO_OCCURRENCE_ENGINES})")
 
-def track_co_occurrence(signals: list[Signal]) -> dict:
     raw_counts = defaultdict(lambda: defaultdict(int))
     context_totals = defaultdict(int)
 
-    # Valid influencer + institution nodes
-    valid_nodes = [node.id for node in seed_nodes if node.type in ("influencer", "institution")]
+    valid_nodes = _valid_entity_ids(nodes)
 
     for signal in signals:
         text = f"{signal.title} {signal.content}".lower()
@@ -28,19 +56,122 @@ def track_co_occurrence(signals: list[Signal]) -> dict:
                 raw_counts[a][b] += 1
                 raw_counts[b][a] += 1
 
+    return raw_counts
+
+
+def weigh_co_occurrence_row(neighbors: dict) -> dict:
+    """Normalises one row of raw counts by its max count."""
+    max_count = max(neighbors.values()) if neighbors else 1
+    return {
+        b: {"count": count, "weight": round(count / max_count, 4)}
+        for b, count in neighbors.items()
+    }
+
+
+def weight_co_occurrences(raw_counts: dict) -> dict:
     # Compute weighted memory map
-    weighted_memory = {}
-    for a, neighbors in raw_counts.items():
-        weighted_memory[a] = {}
-        max_count = max(neighbors.values()) if neighbors else 1
-        for b, count in neighbors.items():
-            weight = count / max_count
-            weighted_memory[a][b] = {
-                "count": count,
-                "weight": round(weight, 4)
-            }
+    return {a: weigh_co_occurrence_row(neighbors) for a, neighbors in raw_counts.items()}
+
+
+# === Sparse Incidence Engine ===
+
+class EntityIndex:
+    """
+    One multi-pattern matcher over all entity ids.
+
+    Matches are case-insensitive and bounded by word boundaries, so "xi" no
+    longer fires inside "taxi" the way the substring scan does. Single-token
+    ids (the common case) are found with one tokenisation pass and hash
+    lookups; ids spanning several tokens go through one compiled alternation.
+    """
+
+    def __init__(self, entity_ids: list[str]):
+        # Keep first occurrence order; column j of the incidence matrix is entity_ids[j]
+        self.entity_ids = list(dict.fromkeys(entity_ids))
+        self.columns = {node_id.lower(): j for j, node_id in enumerate(self.entity_ids)}
+        # Identifies the entity list, so precomputed mentions are only reused against the same one
+        self.digest = hashlib.blake2b("\0".join(self.entity_ids).encode("utf-8"), digest_size=8).hexdigest()
+
+        phrases = [key for key in self.columns if not _TOKEN.fullmatch(key)]
+        # Longest alternatives first so a shorter id never shadows a longer one
+        phrases.sort(key=len, reverse=True)
+        self.phrase_pattern = (
+            re.compile(r"(?<!\w)(?:" + "|".join(map(re.escape, phrases)) + r")(?!\w)")
+            if phrases else None
+        )
+
+    def __len__(self):
+        return len(self.entity_ids)
+
+    def match(self, text: str) -> set[int]:
+        """Returns the column ids of every entity mentioned in text."""
+        return self.match_lowered(text.lower())
+
+    def match_lowered(self, text: str) -> set[int]:
+        columns = self.columns
+        found = {columns[token] for token in _TOKEN.findall(text) if token in columns}
+        if self.phrase_pattern is not None:
+            found.update(columns[m] for m in self.phrase_pattern.findall(text))
+        return found
+
+
+def build_entity_index(nodes=None) -> EntityIndex:
+    return EntityIndex(_valid_entity_ids(nodes))
+
+
+def build_incidence_matrix(signals: list[Signal], index: EntityIndex):
+    """
+    Returns a binary CSR matrix A of shape (signals, entities) where
+    A[i, j] = 1 when signal i mentions entity j. Mentions precomputed by
+    text_features against the same entity list are reused.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    indptr = [0]
+    indices = []
+    for signal in signals:
+        features = getattr(signal, "features", None)
+        if features is not None and features.entity_digest == index.digest:
+            indices.extend(sorted(index.columns[entity.lower()] for entity in features.entities))
+        else:
+            indices.extend(sorted(index.match(f"{signal.title} {signal.content}")))
+        indptr.append(len(indices))
+
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(signals), len(index))
+    )
 
-    return weighted_memory
+
+def pair_counts_from_incidence(incidence, entity_ids: list[str]) -> dict:
+    """
+    Computes raw pair counts from an incidence matrix with one sparse
+    product: C = Aᵀ·A holds pair counts off the diagonal.
+    """
+    import numpy as np
+
+    counts = (incidence.T @ incidence).tocsr()
+    counts.setdiag(0)
+    counts.eliminate_zeros()
+
+    rows = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+    raw_counts = {}
+    for a, b, count in zip(rows.tolist(), counts.indices.tolist(), counts.data.tolist()):
+        raw_counts.setdefault(entity_ids[a], {})[entity_ids[b]] = count
+
+    return raw_counts
+
+
+def co_occurrence_from_incidence(incidence, entity_ids: list[str]) -> dict:
+    return weight_co_occurrences(pair_counts_from_incidence(incidence, entity_ids))
+
+
+def track_co_occurrence_sparse(signals: list[Signal], index: EntityIndex = None) -> dict:
+    index = index or build_entity_index()
+    incidence = build_incidence_matrix(signals, index)
+    return co_occurrence_from_incidence(incidence, index.entity_ids)
 
 
 # === New: Decay-Aware Lookup ===
@@ -59,4 +190,130 @@ def decay_weighted_lookup(text, co_occurrence_map, decay=0.85):
                 weighted_scores[target] += weight * decay
 
     sorted_nodes = sorted(weighted_scores.items(), key=lambda x: -x[1])
-    return [node for node, _ in sorted_nodes]
\ No newline at end of file
+    return [node for node, _ in sorted_nodes]
+
+# === Compiled Lookup Index ===
+
+class CoOccurrenceIndex:
+    """
+    decay_weighted_lookup compiled once from a co-occurrence map.
+
+    Each token row holds its target ids and decayed weights as flat CSR-style
+    arrays, so scoring a text is a gather plus one bincount, and many texts
+    can be scored together. Ties keep decay_weighted_lookup's order: targets
+    first reached earlier in the text rank first.
+    """
+
+    def __init__(self, co_occurrence_map: dict, decay: float = 0.85):
+        import numpy as np
+
+        self.decay = decay
+        self.vocab = {}
+        self.targets = []
+        target_ids = {}
+        indptr = [0]
+        indices = []
+        scores = []
+
+        for token, neighbors in co_occurrence_map.items():
+            self.vocab[token] = len(indptr) - 1
+            for target, entry in neighbors.items():
+                if target not in target_ids:
+                    target_ids[target] = len(self.targets)
+                    self.targets.append(target)
+                indices.append(target_ids[target])
+                scores.append(entry.get("weight", 0) * decay)
+            indptr.append(len(indices))
+
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.scores = np.asarray(scores, dtype=np.float64)
+
+    @classmethod
+    def from_map(cls, co_occurrence_map: dict, decay: float = 0.85):
+        return cls(co_occurrence_map, decay)
+
+    def _rows(self, text: str) -> list[int]:
+        vocab = self.vocab
+        return [vocab[word] for word in text.lower().split() if word in vocab]
+
+    def _gather(self, rows, owners=None):
+        """Expands token rows into (owner, target, score) entries in text order."""
+        import numpy as np
+
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        total = int(lengths.sum())
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        entries = np.repeat(starts, lengths) + offsets
+        owners = np.repeat(np.asarray(owners, dtype=np.int64), lengths) if owners is not None else None
+        return owners, self.indices[entries], self.scores[entries]
+
+    def _score(self, text: str):
+        import numpy as np
+
+        _, targets, scores = self._gather(self._rows(text))
+        unique, first_seen, inverse = np.unique(targets, return_index=True, return_inverse=True)
+        return unique, first_seen, np.bincount(inverse, weights=scores, minlength=len(unique))
+
+    def top_k(self, text: str, k: int = None) -> list[str]:
+        """
+        Returns the k best targets for text (all of them when k is None) using
+        partial selection; only the k survivors are fully ordered.
+        """
+        import numpy as np
+
+        unique, first_seen, totals = self._score(text)
+        if k is not None and k < len(totals):
+            if k <= 0:
+                return []
+            kth = np.partition(totals, len(totals) - k)[len(totals) - k]
+            keep = np.flatnonzero(totals >= kth)
+            unique, first_seen, totals = unique[keep], first_seen[keep], totals[keep]
+
+        order = np.lexsort((first_seen, -totals))
+        if k is not None:
+            order = order[:k]
+        return [self.targets[t] for t in unique[order].tolist()]
+
+    def lookup(self, text: str) -> list[str]:
+        """Same result as decay_weighted_lookup(text, co_occurrence_map, decay)."""
+        return self.top_k(text)
+
+    def top_1_batch(self, texts: list[str]) -> list:
+        """
+        Scores every text in one vectorized pass and returns the best target
+        per text, or None where no token is known.
+        """
+        import numpy as np
+
+        best = [None] * len(texts)
+        rows = []
+        owners = []
+        for i, text in enumerate(texts):
+            text_rows = self._rows(text)
+            rows.extend(text_rows)
+            owners.extend([i] * len(text_rows))
+
+        owners, targets, scores = self._gather(rows, owners)
+        if len(targets) == 0:
+            return best
+
+        # One group per (text, target); keys sort by text first
+        keys = owners * len(self.targets) + targets
+        unique, first_seen, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        totals = np.bincount(inverse, weights=scores, minlength=len(unique))
+
+        group_owner = unique // len(self.targets)
+        starts = np.flatnonzero(np.r_[True, group_owner[1:] != group_owner[:-1]])
+        lengths = np.diff(np.r_[starts, len(unique)])
+
+        # Highest total per text, earliest first mention among ties
+        segment_max = np.repeat(np.maximum.reduceat(totals, starts), lengths)
+        candidates = np.where(totals == segment_max, first_seen, len(keys))
+        winners = np.minimum.reduceat(candidates, starts)
+
+        for owner, target in zip(group_owner[starts].tolist(), targets[winners].tolist()):
+            best[owner] = self.targets[target]
+        return best
\ No newline at end of file
@@ -0,0 +1,141 @@
+# src/co_occurrence_store.py
+
+import json
+import os
+from datetime import datetime, timezone
+
+from src.co_occurrence import count_co_occurrences, weigh_co_occurrence_row, weight_co_occurrences
+
+
+class CoOccurrenceStore:
+    """
+    Persistent co-occurrence memory that accumulates raw pair counts across runs.
+
+    On disk the store is a directory with a compact snapshot of raw counts plus
+    an append-only log of per-run deltas. update() only touches the pairs seen
+    in the new batch, re-weights just the rows that changed and appends one
+    delta line; the snapshot is rewritten only when the log is compacted.
+
+    The default engine is "sparse", which matches entities on word
+    boundaries: "xi" no longer counts inside "taxi" as it did with the
+    original substring scan, so counts differ from memory built by the
+    "loop" engine. Pass engine="loop" to keep the old counts. The store
+    replaces the co_occurrence_map.json file the old step rewrote every
+    run; export() still writes it for consumers of that file.
+    """
+
+    SNAPSHOT = "snapshot.json"
+    DELTAS = "deltas.jsonl"
+
+    def __init__(self, path="co_occurrence_store", engine="sparse", nodes=None, compact_every=50):
+        self.path = path
+        self.engine = engine
+        self.nodes = nodes
+        self.compact_every = compact_every
+        self.counts = {}
+        self.weighted = {}
+        self.pending_deltas = 0
+
+    @classmethod
+    def open(cls, path="co_occurrence_store", **kwargs):
+        store = cls(path, **kwargs)
+        store.load()
+        return store
+
+    # --- persistence ---
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def load(self):
+        self.counts = {}
+        self.pending_deltas = 0
+
+        snapshot = self._file(self.SNAPSHOT)
+        if os.path.exists(snapshot):
+            with open(snapshot, "r") as f:
+                self.counts = json.load(f)
+
+        deltas = self._file(self.DELTAS)
+        if os.path.exists(deltas):
+            with open(deltas, "r") as f:
+                for line in f:
+                    if line.strip():
+                        self._apply_pairs(json.loads(line)["pairs"])
+                        self.pending_deltas += 1
+
+        self.weighted = weight_co_occurrences(self.counts)
+        return self
+
+    def _append_delta(self, pairs):
+        os.makedirs(self.path, exist_ok=True)
+        record = {"ts": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"), "pairs": pairs}
+        with open(self._file(self.DELTAS), "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.pending_deltas += 1
+
+    def compact(self):
+        """Folds the delta log into a fresh snapshot."""
+        os.makedirs(self.path, exist_ok=True)
+        tmp = self._file(self.SNAPSHOT + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.counts, f, separators=(",", ":"))
+        os.replace(tmp, self._file(self.SNAPSHOT))
+
+        deltas = self._file(self.DELTAS)
+        if os.path.exists(deltas):
+            os.remove(deltas)
+        self.pending_deltas = 0
+
+    # --- updates ---
+
+    def _apply_pairs(self, pairs):
+        changed = set()
+        for a, b, count in pairs:
+            row_a = self.counts.setdefault(a, {})
+            row_a[b] = row_a.get(b, 0) + count
+            row_b = self.counts.setdefault(b, {})
+            row_b[a] = row_b.get(a, 0) + count
+            changed.update((a, b))
+        return changed
+
+    def update(self, new_signals) -> set:
+        """
+        Adds the pair counts of new_signals to memory and returns the set of
+        rows whose weights were recomputed.
+        """
+        batch_counts = count_co_occurrences(new_signals, engine=self.engine, nodes=self.nodes)
+
+        # Counts are symmetric, so the delta only needs one direction per pair
+        pairs = [
+            [a, b, count]
+            for a, neighbors in batch_counts.items()
+            for b, count in neighbors.items()
+            if a < b
+        ]
+        if not pairs:
+            return set()
+
+        changed = self._apply_pairs(pairs)
+        for row in changed:
+            self.weighted[row] = weigh_co_occurrence_row(self.counts[row])
+
+        self._append_delta(pairs)
+        if self.compact_every and self.pending_deltas >= self.compact_every:
+            self.compact()
+
+        return changed
+
+    # --- reads ---
+
+    def weighted_map(self) -> dict:
+        """Returns the live {a: {b: {count, weight}}} map; treat it as read-only."""
+        return self.weighted
+
+    def export(self, filepath="co_occurrence_map.json"):
+        """Writes the full weighted map, for consumers that still read the JSON file."""
+        from src.export_utils import export_co_occurrence_map
+        export_co_occurrence_map(self.weighted, filepath)
+
+    def __len__(self):
+        return len(self.counts)
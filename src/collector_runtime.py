@@ -0,0 +1,130 @@
+# src/collector_runtime.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.model import Signal
+
+# Max in-flight requests per source; keeps us under each API's rate limits
+DEFAULT_SOURCE_LIMITS = {"reddit": 4, "news": 8, "twitter": 2}
+
+
+@dataclass
+class CollectorTask:
+    """One unit of collection work: a subreddit, a news topic or a Twitter node."""
+    source: str
+    key: str
+    fetch: Callable[[], List[Signal]]
+
+
+def make_pooled_session(pool_connections=4, pool_maxsize=16):
+    """requests.Session with keep-alive pools sized for concurrent fetches per host."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def news_tasks(topics, limit=10, session=None, base_url=None, cache=None) -> List[CollectorTask]:
+    from src.news_collector import fetch_news_topic, NEWSAPI_URL
+
+    session = session or make_pooled_session()
+    base_url = base_url or NEWSAPI_URL
+    return [
+        CollectorTask("news", topic, lambda topic=topic: fetch_news_topic(topic, limit, session, base_url, cache))
+        for topic in topics
+    ]
+
+
+def reddit_tasks(subreddits, limit=5, cache=None) -> List[CollectorTask]:
+    from src.signal_collector import make_reddit_client, fetch_subreddit_signals
+
+    # praw clients are not thread-safe, so each worker thread gets its own
+    local = threading.local()
+
+    def fetch(subreddit):
+        if not hasattr(local, "reddit"):
+            local.reddit = make_reddit_client()
+        return fetch_subreddit_signals(local.reddit, subreddit, limit=limit, cache=cache)
+
+    return [CollectorTask("reddit", subreddit, lambda s=subreddit: fetch(s)) for subreddit in subreddits]
+
+
+def twitter_tasks(node_ids, limit=10, cache=None) -> List[CollectorTask]:
+    from src.twitter_handles import twitter_handles
+    from src.twitter_collector import fetch_twitter_node_signals
+
+    tasks = []
+    for node_id in node_ids:
+        if node_id not in twitter_handles:
+            print(f"⚠️ No Twitter handle found for '{node_id}' in twitter_handles.py")
+            continue
+        tasks.append(CollectorTask(
+            "twitter", node_id, lambda n=node_id: fetch_twitter_node_signals(n, limit=limit, cache=cache)
+        ))
+    return tasks
+
+
+class CollectorRuntime:
+    """
+    Runs collector tasks from all sources on one bounded thread pool.
+
+    At most max_workers tasks run at once, and never more than
+    source_limits[source] for a single source; queued tasks are started as
+    soon as a slot for their source frees up. A failing task is reported and
+    skipped without stopping the others.
+    """
+
+    def __init__(self, max_workers=16, source_limits: Optional[Dict[str, int]] = None):
+        self.max_workers = max_workers
+        self.source_limits = {**DEFAULT_SOURCE_LIMITS, **(source_limits or {})}
+
+    def run(self, tasks: List[CollectorTask]) -> Iterator[Tuple[int, CollectorTask, List[Signal]]]:
+        """Yields (task index, task, signals) in completion order."""
+        queued = defaultdict(deque)
+        for index, task in enumerate(tasks):
+            queued[task.source].append((index, task))
+        running = defaultdict(int)
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            def fill():
+                for source, pending in queued.items():
+                    limit = self.source_limits.get(source, self.max_workers)
+                    while pending and running[source] < limit and len(in_flight) < self.max_workers:
+                        index, task = pending.popleft()
+                        running[source] += 1
+                        in_flight[pool.submit(task.fetch)] = (index, task)
+
+            fill()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, task = in_flight.pop(future)
+                    running[task.source] -= 1
+                    try:
+                        signals = future.result()
+                    except Exception as e:
+                        print(f"❌ Error collecting {task.source} '{task.key}': {e}")
+                        signals = []
+                    yield index, task, signals
+                fill()
+
+    def stream(self, tasks: List[CollectorTask]) -> Iterator[Signal]:
+        """One merged stream of signals from every task, as they arrive."""
+        for _, _, signals in self.run(tasks):
+            yield from signals
+
+    def collect(self, tasks: List[CollectorTask]) -> List[Signal]:
+        """All signals, ordered by task order regardless of completion order."""
+        results = [None] * len(tasks)
+        for index, _, signals in self.run(tasks):
+            results[index] = signals
+        return [signal for signals in results for signal in signals]
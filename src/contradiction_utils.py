@@ -1,42 +1,146 @@
 # src/contradiction_utils.py
 
+import heapq
+import re
+from bisect import bisect_right
+from collections import defaultdict
+from itertools import islice
+from typing import Iterator
 from src.model import Signal
-from itertools import combinations
 
 # Simple keyword list indicating potential contradiction or refutation
 CONTRADICTION_KEYWORDS = [
     "not", "no", "never", "false", "fake", "hoax", "debunked", "refuted", "misleading", "incorrect"
 ]
 
+# One compiled scan replaces a per-keyword substring loop; still a plain substring match
+_CONTRADICTION_PATTERN = re.compile("|".join(map(re.escape, CONTRADICTION_KEYWORDS)))
+
+def has_contradiction_marker(content: str) -> bool:
+    """True if the content mentions any contradiction keyword."""
+    return _CONTRADICTION_PATTERN.search(content.lower()) is not None
+
+def contradiction_flag(signal: Signal) -> bool:
+    """has_contradiction_marker, read from signal.features when text_features has run."""
+    features = getattr(signal, "features", None)
+    return features.contradiction if features is not None else has_contradiction_marker(signal.content)
+
 def is_contradictory(content_a: str, content_b: str) -> bool:
     """
     Heuristic: If one mentions a keyword and the other doesn't, flag as contradiction.
     You can later improve this using NLP-based stance detection.
     """
-    a = content_a.lower()
-    b = content_b.lower()
-    has_contra_a = any(word in a for word in CONTRADICTION_KEYWORDS)
-    has_contra_b = any(word in b for word in CONTRADICTION_KEYWORDS)
-    return has_contra_a != has_contra_b
-
-def detect_contradictions(signals: list[Signal]) -> list[tuple[Signal, Signal]]:
-    contradictory_pairs = []
-    # Pairwise comparison
-    for s1, s2 in combinations(signals, 2):
-        if s1.subreddit != s2.subreddit and is_contradictory(s1.content, s2.content):
-            contradictory_pairs.append((s1, s2))
-            s1.is_contradiction = True
-            s2.is_contradiction = True
-    return contradictory_pairs
-
-def analyze_contradictions(signals: list[Signal]):
-    contradictory_pairs = detect_contradictions(signals)
+    return has_contradiction_marker(content_a) != has_contradiction_marker(content_b)
+
+class ContradictionEngine:
+    """
+    Grouped contradiction detection.
+
+    The pairwise predicate only depends on one keyword flag per signal and on
+    the subreddit, so signals are bucketed by (subreddit, flag) once. Pair
+    counts then follow arithmetically and pairs are produced lazily by
+    crossing opposite-flag buckets of different subreddits.
+    """
+
+    def __init__(self, signals: list[Signal]):
+        self.signals = list(signals)
+        self.flags = [contradiction_flag(s) for s in self.signals]
+        self.groups = defaultdict(list)
+        for i, (signal, flag) in enumerate(zip(self.signals, self.flags)):
+            self.groups[(signal.subreddit, flag)].append(i)
+        self.flag_totals = {True: sum(self.flags), False: len(self.flags) - sum(self.flags)}
+
+    def count(self) -> int:
+        """Number of contradictory pairs, without enumerating them."""
+        same_subreddit = sum(
+            len(flagged) * len(self.groups.get((subreddit, False), ()))
+            for (subreddit, flag), flagged in self.groups.items() if flag
+        )
+        return self.flag_totals[True] * self.flag_totals[False] - same_subreddit
+
+    def index_pairs(self, limit: int = None):
+        """Yields (i, j) index pairs with i < j, grouped by bucket, up to limit."""
+        if limit is not None and limit <= 0:
+            return
+        produced = 0
+        unflagged = [(subreddit, idx) for (subreddit, flag), idx in self.groups.items() if not flag]
+        for (subreddit_a, flag), flagged in self.groups.items():
+            if not flag:
+                continue
+            for subreddit_b, others in unflagged:
+                if subreddit_a == subreddit_b:
+                    continue
+                for i in flagged:
+                    for j in others:
+                        yield (i, j) if i < j else (j, i)
+                        produced += 1
+                        if limit is not None and produced >= limit:
+                            return
+
+    def ordered_index_pairs(self, limit: int = None):
+        """
+        index_pairs in (i, j) order, the order of the former pairwise scan.
+        Still lazy: for each i the later partners of every opposite bucket
+        are merged on the fly.
+        """
+        if limit is not None and limit <= 0:
+            return
+        produced = 0
+        partners = {
+            (subreddit, flag): [idx for (other, other_flag), idx in self.groups.items()
+                                if other_flag != flag and other != subreddit]
+            for subreddit, flag in self.groups
+        }
+        for i, (signal, flag) in enumerate(zip(self.signals, self.flags)):
+            later = [islice(idx, bisect_right(idx, i), None) for idx in partners[(signal.subreddit, flag)]]
+            for j in heapq.merge(*later):
+                yield i, j
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+
+    def pairs(self, limit: int = None):
+        """Lazily yields contradictory (Signal, Signal) pairs, up to limit."""
+        for i, j in self.index_pairs(limit):
+            yield self.signals[i], self.signals[j]
+
+    def mark(self):
+        """Sets is_contradiction on every signal that belongs to at least one pair."""
+        opposite_in_subreddit = defaultdict(int)
+        for (subreddit, flag), idx in self.groups.items():
+            opposite_in_subreddit[(subreddit, not flag)] = len(idx)
+        for (subreddit, flag), idx in self.groups.items():
+            if self.flag_totals[not flag] - opposite_in_subreddit[(subreddit, flag)] > 0:
+                for i in idx:
+                    self.signals[i].is_contradiction = True
+
+def detect_contradictions(signals: list[Signal], limit: int = None) -> Iterator[tuple[Signal, Signal]]:
+    """
+    Marks is_contradiction right away and returns a lazy iterator over the
+    contradictory pairs, in the order of the former pairwise comparison.
+    Only the pairs consumed are ever built; use ContradictionEngine.count()
+    when just the number is needed.
+    """
+    engine = ContradictionEngine(signals)
+    engine.mark()
+    return ((engine.signals[i], engine.signals[j]) for i, j in engine.ordered_index_pairs(limit))
+
+def analyze_contradictions(signals: list[Signal], limit: int = None) -> list[tuple[Signal, Signal]]:
+    """
+    Prints and returns the contradictory pairs (up to limit), in the order of
+    detect_contradictions. The total is printed when a limit is set; unlike
+    detect_contradictions, is_contradiction is left untouched on the signals.
+    """
+    engine = ContradictionEngine(signals)
+    total = engine.count()
+    if limit is not None:
+        print(f"\n{total} contradictory pairs in total, showing up to {limit}.")
     print("\nContradiction Analysis:")
-    if not contradictory_pairs:
+    if not total:
         print("No contradictory signal pairs detected.")
-    else:
-        for s1, s2 in contradictory_pairs:
-            print(f"- {s1.subreddit}_{s1.id} ⟷ {s2.subreddit}_{s2.id}")
-            print(f"  → A: {s1.content[:80]}...")
-            print(f"  → B: {s2.content[:80]}...\n")
-    return contradictory_pairs
\ No newline at end of file
+    pairs = [(engine.signals[i], engine.signals[j]) for i, j in engine.ordered_index_pairs(limit)]
+    for s1, s2 in pairs:
+        print(f"- {s1.subreddit}_{s1.id} ⟷ {s2.subreddit}_{s2.id}")
+        print(f"  → A: {s1.content[:80]}...")
+        print(f"  → B: {s2.content[:80]}...\n")
+    return pairs
\ No newline at end of file
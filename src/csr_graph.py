@@ -0,0 +1,340 @@
+# src/csr_graph.py
+
+import hashlib
+import random
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.model import Node, Signal, node_registry
+
+# Edge attributes kept as parallel arrays; everything else stays in networkx
+EDGE_FIELDS = ("velocity", "entropy", "signal_count")
+
+
+class CSRGraph:
+    """
+    Frozen influence graph in compressed sparse row form, for analytics.
+
+    Nodes are numbered 0..n-1 in the same order networkx would hold them;
+    out-edges of node i are indices[indptr[i]:indptr[i + 1]], with
+    velocity, entropy and signal_count arrays aligned to indices. About 20
+    bytes per edge, against several hundred for a networkx DiGraph.
+    Use to_networkx() for drawing.
+    """
+
+    def __init__(self, node_ids: List[str], indptr, indices, node_data: Optional[List[dict]] = None, **edge_data):
+        self.node_ids = list(node_ids)
+        self.index = {node: i for i, node in enumerate(self.node_ids)}
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.node_data = node_data
+        m = len(self.indices)
+        self.velocity = np.asarray(edge_data.get("velocity", np.zeros(m)), dtype=np.float32)
+        self.entropy = np.asarray(edge_data.get("entropy", np.zeros(m)), dtype=np.float32)
+        self.signal_count = np.asarray(edge_data.get("signal_count", np.ones(m)), dtype=np.int32)
+
+    # --- construction ---
+
+    @classmethod
+    def from_edges(cls, node_ids, sources, targets, node_data=None, **edge_data):
+        """Builds the CSR arrays from parallel (source, target) index arrays."""
+        n = len(node_ids)
+        sources = np.asarray(sources, dtype=np.int64)
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+        edge_data = {name: np.asarray(values)[order] for name, values in edge_data.items()}
+        return cls(node_ids, indptr, np.asarray(targets)[order], node_data=node_data, **edge_data)
+
+    @classmethod
+    def from_networkx(cls, graph):
+        node_ids = list(graph.nodes())
+        index = {node: i for i, node in enumerate(node_ids)}
+        edges = list(graph.edges(data=True))
+        sources = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges))
+        targets = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges))
+        edge_data = {
+            name: np.array([data.get(name, default) for _, _, data in edges], dtype=np.float64)
+            for name, default in (("velocity", 0.0), ("entropy", 0.0), ("signal_count", 1))
+        }
+        node_data = [dict(data) for _, data in graph.nodes(data=True)]
+        return cls.from_edges(node_ids, sources, targets, node_data=node_data, **edge_data)
+
+    @classmethod
+    def from_signals(cls, nodes: List[Node], signals: List[Signal]):
+        """
+        Same graph as graph_utils.build_graph, built straight from the
+        aggregated hops without ever creating the networkx graph.
+        """
+        from src.graph_utils import aggregate_hops
+
+        sources, targets, stats = aggregate_hops(signals)
+        seed_keys = [node_registry.intern(node.id) for node in nodes]
+        node_data = [{"type": node.type, **(node.metadata or {})} for node in nodes]
+
+        # Route nodes that are not seed nodes follow in first-seen order, as in build_graph
+        hop_keys = np.column_stack((sources, targets)).ravel()
+        unique_keys, first = np.unique(hop_keys, return_index=True)
+        route_keys = unique_keys[np.argsort(first, kind="stable")]
+        route_keys = route_keys[~np.isin(route_keys, seed_keys)]
+
+        keys = np.concatenate((np.asarray(seed_keys, dtype=np.int64), route_keys)).astype(np.int64)
+        node_ids = [node.id for node in nodes] + node_registry.names(route_keys.tolist())
+        node_data += [{"type": "router"} for _ in range(len(route_keys))]
+
+        lookup = np.full(max(len(node_registry), 1), -1, dtype=np.int64)
+        lookup[keys] = np.arange(len(keys))
+        if stats is None:
+            return cls.from_edges(node_ids, [], [], node_data=node_data)
+        return cls.from_edges(
+            node_ids, lookup[sources], lookup[targets], node_data=node_data,
+            velocity=stats["velocity"], entropy=stats["entropy"], signal_count=stats["signal_count"]
+        )
+
+    def to_networkx(self):
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        node_data = self.node_data or [{} for _ in self.node_ids]
+        graph.add_nodes_from(zip(self.node_ids, node_data))
+        sources = np.repeat(np.arange(self.n), np.diff(self.indptr)).tolist()
+        names = self.node_ids
+        graph.add_edges_from(
+            (names[u], names[v], {"velocity": velocity, "entropy": entropy, "signal_count": count})
+            for u, v, velocity, entropy, count in zip(
+                sources, self.indices.tolist(), self.velocity.tolist(),
+                self.entropy.tolist(), self.signal_count.tolist()
+            )
+        )
+        return graph
+
+    # --- basic structure ---
+
+    @property
+    def n(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def m(self) -> int:
+        return len(self.indices)
+
+    def number_of_nodes(self):
+        return self.n
+
+    def number_of_edges(self):
+        return self.m
+
+    def matrix(self, weight: Optional[str] = None):
+        """scipy CSR adjacency; weight is None (ones) or an edge field name."""
+        from scipy.sparse import csr_array
+
+        data = np.ones(self.m, dtype=np.float64) if weight is None else getattr(self, weight).astype(np.float64)
+        matrix = csr_array((data, self.indices.copy(), self.indptr.copy()), shape=(self.n, self.n))
+        # Rows keep networkx's insertion order here; scipy kernels expect sorted columns
+        matrix.sort_indices()
+        return matrix
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        return np.bincount(self.indices, minlength=self.n)
+
+    def fingerprint(self) -> str:
+        """Same digest as graph_utils.graph_fingerprint on the equivalent networkx graph."""
+        digest = hashlib.sha1()
+        for node in sorted(map(str, self.node_ids)):
+            digest.update(node.encode("utf-8") + b"\0")
+        digest.update(b"\1")
+        names = [str(node) for node in self.node_ids]
+        sources = np.repeat(np.arange(self.n), np.diff(self.indptr)).tolist()
+        for u, v in sorted((names[u], names[v]) for u, v in zip(sources, self.indices.tolist())):
+            digest.update(u.encode("utf-8") + b"\0" + v.encode("utf-8") + b"\0")
+        return digest.hexdigest()
+
+    def _expand(self, frontier: np.ndarray):
+        """All out-edges of the frontier nodes as (source, target) arrays."""
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return frontier[:0], self.indices[:0]
+        sources = np.repeat(frontier, counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return sources, self.indices[np.repeat(starts, counts) + offsets]
+
+    # --- traversal ---
+
+    def bfs_levels(self, sources) -> np.ndarray:
+        """Hop distance from the nearest source to every node (-1 = unreachable)."""
+        distance = np.full(self.n, -1, dtype=np.int64)
+        frontier = np.unique(np.atleast_1d(np.asarray(sources, dtype=np.int64)))
+        distance[frontier] = 0
+        level = 0
+        while frontier.size:
+            _, targets = self._expand(frontier)
+            frontier = np.unique(targets[distance[targets] < 0])
+            level += 1
+            distance[frontier] = level
+        return distance
+
+    def reachable(self, source_ids) -> List[str]:
+        """Node ids reachable from any of the given node ids (including them)."""
+        distance = self.bfs_levels([self.index[node] for node in source_ids])
+        return [self.node_ids[i] for i in np.flatnonzero(distance >= 0).tolist()]
+
+    # --- components and cycles ---
+
+    def strongly_connected_components(self):
+        """(count, label per node) via scipy's linear-time SCC."""
+        from scipy.sparse.csgraph import connected_components
+        return connected_components(self.matrix(), directed=True, connection="strong")
+
+    def cyclic_component_labels(self):
+        """Labels of components that can hold a cycle (size > 1 or a self-loop), largest first."""
+        _, labels = self.strongly_connected_components()
+        sizes = np.bincount(labels)
+        sources = np.repeat(np.arange(self.n), np.diff(self.indptr))
+        self_loop_labels = labels[sources[sources == self.indices]]
+        cyclic = np.flatnonzero(sizes > 1)
+        cyclic = np.union1d(cyclic, self_loop_labels)
+        return labels, cyclic[np.argsort(-sizes[cyclic], kind="stable")], sizes
+
+    def condensation_summary(self) -> Dict:
+        """Same fields as loop_utils.condensation_summary."""
+        labels, cyclic, sizes = self.cyclic_component_labels()
+        return {
+            "nodes": self.n,
+            "components": int(len(sizes)),
+            "cyclic_components": int(len(cyclic)),
+            "largest_cyclic_component": int(sizes[cyclic[0]]) if len(cyclic) else 0,
+            "nodes_in_cycles": int(sizes[cyclic].sum()),
+            "component_sizes": sizes[cyclic].tolist(),
+        }
+
+    def cycle_participation(self, max_length: int = 3) -> Dict[str, int]:
+        """loop_utils.cycle_participation over the whole CSR matrix at once."""
+        from src.loop_utils import closed_walk_counts
+
+        labels, cyclic, _ = self.cyclic_component_labels()
+        adjacency = self.matrix().astype(np.int64)
+        # Edges between components never lie on a cycle
+        rows = np.repeat(np.arange(self.n), np.diff(adjacency.indptr))
+        adjacency.data[labels[rows] != labels[adjacency.indices]] = 0
+        adjacency.eliminate_zeros()
+        totals = closed_walk_counts(adjacency, max_length)
+        return dict(zip(self.node_ids, totals.tolist()))
+
+    # --- centrality ---
+
+    def _pivots(self, k: Optional[int], seed) -> np.ndarray:
+        if k is None or k >= self.n:
+            return np.arange(self.n)
+        # Same draw as networkx / sampled_closeness_centrality for the same node order
+        return np.asarray(random.Random(seed).sample(range(self.n), k), dtype=np.int64)
+
+    def betweenness(self, k: Optional[int] = None, seed=None) -> np.ndarray:
+        """
+        Normalized betweenness (networkx conventions, endpoints excluded) by
+        Brandes' algorithm, one vectorised BFS level at a time. With k, only
+        k sampled sources are used and the result is rescaled like
+        graph_utils.sampled_betweenness_centrality (networkx >= 3.5), which
+        also rejects k below MIN_SAMPLES.
+        """
+        from src.graph_utils import check_samples
+
+        check_samples(k)
+        n = self.n
+        between = np.zeros(n)
+        pivots = self._pivots(k, seed)
+        distance = np.full(n, -1, dtype=np.int64)
+        sigma = np.zeros(n)
+        delta = np.zeros(n)
+
+        for s in pivots.tolist():
+            distance[s], sigma[s] = 0, 1.0
+            frontier = np.array([s], dtype=np.int64)
+            visited = [frontier]
+            dag = []
+            level = 0
+            while frontier.size:
+                sources, targets = self._expand(frontier)
+                fresh = targets[distance[targets] < 0]
+                frontier = np.unique(fresh)
+                distance[frontier] = level + 1
+                # Shortest-path DAG edges into the next level
+                on_dag = distance[targets] == level + 1
+                sources, targets = sources[on_dag], targets[on_dag]
+                np.add.at(sigma, targets, sigma[sources])
+                dag.append((sources, targets))
+                visited.append(frontier)
+                level += 1
+
+            for sources, targets in reversed(dag):
+                np.add.at(delta, sources, sigma[sources] / sigma[targets] * (1.0 + delta[targets]))
+
+            delta[s] = 0.0
+            between += delta
+            touched = np.concatenate(visited)
+            distance[touched], sigma[touched], delta[touched] = -1, 0.0, 0.0
+
+        # Directed, normalized, endpoints=False; sampled as in graph_utils.sampled_betweenness_centrality
+        N = n - 1
+        if N < 2:
+            return between
+        if len(pivots) == n:
+            return between / (N * (N - 1))
+        K = len(pivots)
+        scale = np.full(n, 1 / (K * (N - 1)))
+        scale[pivots] = 1 / ((K - 1) * (N - 1))
+        return between * scale
+
+    def closeness(self, k: Optional[int] = None, seed=None) -> np.ndarray:
+        """
+        Wasserman-Faust closeness over incoming distances (networkx's directed
+        convention). Exact with k=None; otherwise estimated from k BFS pivots
+        like graph_utils.sampled_closeness_centrality.
+        """
+        from scipy.sparse.csgraph import shortest_path
+
+        n = self.n
+        if n <= 1:
+            return np.zeros(n)
+        pivots = self._pivots(k, seed)
+        adjacency = self.matrix()
+        reached = np.zeros(n)
+        total = np.zeros(n)
+        # Batches bound the dense (batch x n) distance block to about 64 MiB
+        batch_size = max(1, min(64, 2 ** 23 // n))
+        for start in range(0, len(pivots), batch_size):
+            batch = pivots[start:start + batch_size]
+            distances = shortest_path(adjacency, method="D", directed=True, unweighted=True, indices=batch)
+            finite = np.isfinite(distances)
+            finite[np.arange(len(batch)), batch] = False
+            reached += finite.sum(axis=0)
+            total += np.where(finite, distances, 0).sum(axis=0)
+
+        others = np.full(n, float(len(pivots)))
+        if len(pivots) < n:
+            others[pivots] -= 1
+        else:
+            others -= 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            closeness = reached ** 2 / (total * others)
+        closeness[(total == 0) | (others == 0)] = 0.0
+        return closeness
+
+    def power_index(self, approximate=False, samples=None, seed=42):
+        """
+        (scores, betweenness, closeness) with compute_power_index's weighting:
+        in-degree 1.0, out-degree 1.2, betweenness 2.0, closeness 1.5.
+        """
+        k = samples if approximate else None
+        between = self.betweenness(k, seed)
+        close = self.closeness(k, seed)
+        scores = self.in_degree() * 1.0 + self.out_degree() * 1.2 + between * 2.0 + close * 1.5
+        return scores, between, close
+
+    def as_dict(self, values: np.ndarray) -> Dict[str, float]:
+        return dict(zip(self.node_ids, values.tolist()))
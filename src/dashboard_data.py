@@ -0,0 +1,136 @@
+# src/dashboard_data.py
+
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.export_utils import export_path, file_signature, read_export, summarize_signals
+
+SIGNAL_COLUMNS = [
+    "id", "title", "subreddit", "source",                    # Basic
+    "entropy", "velocity", "impact",                         # Core
+    "route", "route_length",                                 # Propagation
+    "drift_score", "nsi_score",                              # Narrative/Truth
+    "recursion_score", "recursive_depth",                    # Feedback Loop
+    "power_index", "seed_node"                               # Influence
+]
+SUMMARY_FILE = "signals_summary.json"
+QUERY_CACHE_SIZE = 16
+
+_tables: Dict[str, Tuple[tuple, "SignalTable"]] = {}
+
+
+def load_signal_table(stem="signals", columns: Sequence[str] = SIGNAL_COLUMNS) -> "SignalTable":
+    """
+    The signal export as a SignalTable, loaded once per version of the file.
+    Streamlit reruns the script in the same process, so every interaction
+    after the first reuses the table until the export changes on disk.
+    Raises FileNotFoundError when neither signals.parquet nor .csv exists.
+    """
+    signature = file_signature(export_path(stem)) + (tuple(columns),)
+    cached = _tables.get(stem)
+    if cached is None or cached[0] != signature:
+        _tables[stem] = (signature, SignalTable(read_export(stem, columns=list(columns))))
+    return _tables[stem][1]
+
+
+def load_summary(table: Optional["SignalTable"] = None, path=SUMMARY_FILE, stem="signals") -> Dict:
+    """
+    Export-time aggregates; computed from the table when the file is missing
+    or stale, i.e. when the export the table was loaded from (see
+    export_path) is not one the summary was written with, unchanged.
+    """
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            summary = json.load(f)
+        if table is None:
+            return summary
+        source = export_path(stem)
+        if os.path.exists(source) and list(file_signature(source)) in summary.get("exports", []):
+            return summary
+    return summarize_signals(table.frame) if table is not None else {}
+
+
+class SignalTable:
+    """
+    Filtering, sorting and pagination over the loaded signal columns.
+
+    Queries return row positions (numpy arrays) and the last few results
+    are memoised, so paging through one filter/sort combination costs a
+    slice. Only page() builds display values, for the visible rows alone.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame.reset_index(drop=True)
+        self._queries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+
+    def __len__(self):
+        return len(self.frame)
+
+    def query(self, search: str = "", sources: Sequence[str] = (), ranges: Optional[Dict[str, Tuple[float, float]]] = None,
+              sort_by: Optional[str] = None, descending: bool = True) -> np.ndarray:
+        """
+        Row positions matching every filter, in display order. search is a
+        case-insensitive substring of the title, sources restricts the
+        source column, and ranges maps numeric columns to inclusive bounds.
+        """
+        ranges = ranges or {}
+        key = (search, tuple(sorted(sources)), tuple(sorted(ranges.items())), sort_by, descending)
+        if key in self._queries:
+            self._queries.move_to_end(key)
+            return self._queries[key]
+
+        mask = np.ones(len(self.frame), dtype=bool)
+        if sources:
+            mask &= self.frame["source"].isin(list(sources)).to_numpy()
+        for column, (low, high) in ranges.items():
+            values = self.frame[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            mask &= (values >= low) & (values <= high)
+        if search:
+            # Only the rows that survived the cheaper filters are scanned
+            candidates = np.flatnonzero(mask)
+            titles = self.frame["title"].take(candidates).astype(str)
+            mask[candidates[~titles.str.contains(search, case=False, regex=False).to_numpy()]] = False
+        rows = np.flatnonzero(mask)
+
+        if sort_by:
+            order = self.frame[sort_by].take(rows).reset_index(drop=True).sort_values(
+                ascending=not descending, kind="stable", na_position="last"
+            ).index.to_numpy()
+            rows = rows[order]
+
+        self._queries[key] = rows
+        if len(self._queries) > QUERY_CACHE_SIZE:
+            self._queries.popitem(last=False)
+        return rows
+
+    def page(self, rows: np.ndarray, page: int, page_size: int) -> pd.DataFrame:
+        """Display frame for one page of query() results, formatted."""
+        start = max(page, 0) * page_size
+        visible = self.frame.take(rows[start:start + page_size])
+        return format_page(visible)
+
+
+def page_count(rows: np.ndarray, page_size: int) -> int:
+    return max(1, -(-len(rows) // page_size))
+
+
+def format_cell(val):
+    if isinstance(val, (list, tuple, np.ndarray)):
+        return " → ".join(map(str, val)) if len(val) else "❌"
+    if pd.isna(val) or val == "":
+        return "❌"
+    return val
+
+
+def format_page(frame: pd.DataFrame) -> pd.DataFrame:
+    """Missing values as ❌ and Parquet route lists joined like the CSV, for the given rows only."""
+    return frame.apply(lambda column: column.map(format_cell)).reset_index(drop=True)
+
+
+def source_options(summary: Dict) -> List[str]:
+    return [group["source"] for group in summary.get("by_source", [])]
@@ -0,0 +1,153 @@
+# src/dedup.py
+
+import re
+import zlib
+from collections import Counter
+from typing import List, Sequence
+
+import numpy as np
+
+from src.model import Signal, MISSING_EPOCH
+
+_TOKEN = re.compile(r"\w+")
+
+PRIME = 4294967311  # smallest prime above 2^32; (a * x + b) stays below 2^64 for 32-bit a, b, x
+SHINGLE_SIZE = 3  # words per shingle
+NUM_PERM = 64
+BANDS = 16  # 4 rows per band: pairs above ~0.5 Jaccard almost always share a bucket
+THRESHOLD = 0.5
+SIGNATURE_BLOCK = 1 << 15  # shingles permuted per numpy block
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """CRC32 of each distinct run of `size` lowercase words; shorter texts are one shingle."""
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) <= size:
+        grams = {" ".join(tokens)} if tokens else set()
+    else:
+        grams = {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+    return np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams))
+
+
+class MinHasher:
+    """
+    MinHash signatures from universal hashes (a * x + b) mod PRIME.
+
+    The fraction of equal signature positions between two texts estimates
+    the Jaccard similarity of their shingle sets. All texts are hashed
+    together: shingles are permuted in numpy blocks and reduced per text
+    with minimum.reduceat.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, num_perm, dtype=np.uint64)
+
+    def signatures(self, shingles: Sequence[np.ndarray]) -> np.ndarray:
+        """(len(shingles), num_perm) signatures; every shingle array must be non-empty."""
+        lengths = np.fromiter((len(s) for s in shingles), dtype=np.int64, count=len(shingles))
+        signatures = np.empty((len(shingles), self.num_perm), dtype=np.uint64)
+        if not len(shingles):
+            return signatures
+        flat = np.concatenate(shingles)
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+
+        # Blocks end on text boundaries so each text is reduced in one piece
+        first = 0
+        while first < len(shingles):
+            last = max(first + 1, int(np.searchsorted(ends, starts[first] + SIGNATURE_BLOCK, side="right")))
+            block = flat[starts[first]:ends[last - 1]]
+            permuted = (block[:, None] * self.a + self.b) % PRIME
+            signatures[first:last] = np.minimum.reduceat(permuted, starts[first:last] - starts[first], axis=0)
+            first = last
+        return signatures
+
+
+def similar_pairs(signatures: np.ndarray, bands: int = BANDS, threshold: float = THRESHOLD) -> np.ndarray:
+    """
+    (k, 2) row pairs whose estimated similarity reaches threshold, found by
+    banding: rows are compared only when some band of their signatures is
+    identical, each against the first row of its bucket. Costs a sort per
+    band instead of a comparison per pair.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    mix = np.random.default_rng(0).integers(1, 1 << 63, rows, dtype=np.uint64) | np.uint64(1)
+    pairs = []
+    for band in range(bands):
+        # Wrapping multiply-add folds the band into one key; collisions are caught by the check below
+        keys = (signatures[:, band * rows:(band + 1) * rows] * mix).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        run_start = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        run_length = np.diff(np.r_[run_start, n])
+        members = np.flatnonzero(np.repeat(run_length, run_length) > 1)
+        if not members.size:
+            continue
+        heads = order[np.repeat(run_start, run_length)[members]]
+        others = order[members]
+        keep = heads != others
+        heads, others = heads[keep], others[keep]
+        similarity = (signatures[heads] == signatures[others]).mean(axis=1)
+        matched = similarity >= threshold
+        pairs.append(np.column_stack((heads[matched], others[matched])))
+    return np.unique(np.concatenate(pairs), axis=0) if pairs else np.empty((0, 2), dtype=np.int64)
+
+
+def duplicate_clusters(signals: Sequence[Signal], num_perm: int = NUM_PERM, bands: int = BANDS,
+                       threshold: float = THRESHOLD) -> List[List[int]]:
+    """Index lists (in input order) of near-duplicate signals; singletons are left out."""
+    from scipy.sparse import coo_array
+    from scipy.sparse.csgraph import connected_components
+
+    shingles = [shingle_hashes(f"{signal.title} {signal.content}") for signal in signals]
+    hashed = np.flatnonzero([len(s) > 0 for s in shingles])  # texts without words never match
+    if len(hashed) < 2:
+        return []
+    signatures = MinHasher(num_perm).signatures([shingles[i] for i in hashed])
+    pairs = similar_pairs(signatures, bands, threshold)
+    if not len(pairs):
+        return []
+
+    n = len(hashed)
+    adjacency = coo_array((np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+    _, labels = connected_components(adjacency, directed=False)
+    sizes = np.bincount(labels)
+    clustered = np.flatnonzero(sizes[labels] > 1)
+    clusters = {}
+    for position in clustered.tolist():
+        clusters.setdefault(labels[position], []).append(int(hashed[position]))
+    return sorted(clusters.values())
+
+
+def collapse_duplicates(signals: List[Signal], **options) -> List[Signal]:
+    """
+    One signal per cluster of near-duplicates, in input order. The earliest
+    member (highest impact on ties; members without a timestamp come last)
+    stands for the cluster, as a copy with
+    duplicate_ids (the other members' ids) and source_counts (members per
+    source, itself included). Signals without duplicates pass through
+    unchanged and leave those fields unset.
+    """
+    clusters = duplicate_clusters(signals, **options)
+    replacement = {}
+    dropped = set()
+    for cluster in clusters:
+        canonical = min(cluster, key=lambda i: (
+            signals[i].epoch == MISSING_EPOCH, signals[i].epoch, -signals[i].impact, i
+        ))
+        restore, args = signals[canonical].__reduce__()
+        merged = restore(*args)
+        merged.duplicate_ids = [signals[i].id for i in cluster if i != canonical]
+        merged.source_counts = dict(Counter(signals[i].source for i in cluster))
+        replacement[cluster[0]] = merged
+        dropped.update(cluster[1:])
+
+    collapsed = [replacement.get(i, signal) for i, signal in enumerate(signals) if i not in dropped]
+    if clusters:
+        print(f"🧬 Collapsed {len(signals) - len(collapsed) + len(clusters)} near-duplicate signals "
+              f"into {len(clusters)} narratives ({len(collapsed)} distinct)")
+    return collapsed
@@ -2,7 +2,12 @@
 import networkx as nx
 import csv
 import json
+import os
 from typing import List, Dict
+from src.model import TIMESTAMP_FORMAT
+from src.signal_batch import SignalBatch
+
+PARQUET_COMPRESSION = "zstd"
 
 def export_signals_to_csv(signals, filename="signals.csv"):
     fields = [
@@ -11,29 +16,16 @@ def export_signals_to_csv(signals, filename="signals.csv"):
         "route", "route_length",                        # Propagation Metrics
         "drift_score", "nsi_score",                     # Truth & Narrative
         "recursion_score", "recursive_depth",           # Feedback Loops
-        "power_index", "seed_node"                      # Influence
+        "power_index", "seed_node",                     # Influence
+        "duplicate_ids", "source_counts"                # Merged near-duplicates
     ]
     with open(filename, mode='w', newline='', encoding='utf-8') as file:
         writer = csv.DictWriter(file, fieldnames=fields)
         writer.writeheader()
-        for s in signals:
-            writer.writerow({
-                "id": s.id,
-                "title": getattr(s, "title", ""),
-                "subreddit": getattr(s, "subreddit", "unknown"),
-                "source": s.source,
-                "entropy": round(s.entropy, 4),
-                "velocity": round(getattr(s, "velocity", 0.0), 4),
-                "impact": round(getattr(s, "impact", 0.0), 4),
-                "route": " → ".join(getattr(s, "route", [])),
-                "route_length": len(getattr(s, "route", [])),
-                "drift_score": round(getattr(s, "drift_score", 0.0), 4),
-                "nsi_score": round(getattr(s, "nsi_score", 0.0), 4),
-                "recursion_score": round(getattr(s, "recursion_score", 0.0), 4),
-                "recursive_depth": getattr(s, "recursive_depth", 0),
-                "power_index": round(getattr(s, "power_index", 0.0), 4),
-                "seed_node": getattr(s, "seed_node", "")
-            })
+        # Rows come straight from whole columns instead of per-field getattr/round
+        batch = signals if isinstance(signals, SignalBatch) else SignalBatch.from_signals(signals)
+        columns = batch.export_columns()
+        csv.writer(file).writerows(zip(*(columns[f] for f in fields)))
     print(f"✅ Signals exported to {filename} with all metrics.")
 
 def export_nodes_to_csv(graph, power_scores, filename="nodes.csv"):
@@ -72,4 +64,210 @@ def export_co_occurrence_map(co_occurrence_map, filepath="co_occurrence_map.json
             json.dump(co_occurrence_map, f, indent=2)
         print(f"✅ Co-occurrence map exported to {filepath}")
     except Exception as e:
-        print(f"❌ Failed to export co-occurrence map: {e}")
\ No newline at end of file
+        print(f"❌ Failed to export co-occurrence map: {e}")
+
+# === Parquet exports ===
+# Columnar, typed and compressed counterparts of the CSV exports; readers can
+# load single columns and skip row groups. pyarrow is imported on first use.
+
+def write_parquet(table, filename, partition_by=None, compression=PARQUET_COMPRESSION):
+    """
+    Writes a table to one Parquet file. With partition_by, rows are grouped by
+    that column (stable order within a group) and each group gets its own row
+    groups, so filters on it skip whole row groups via the column statistics.
+    """
+    import numpy as np
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    if not partition_by or table.num_rows == 0:
+        pq.write_table(table, filename, compression=compression)
+        return
+
+    table = table.take(pc.sort_indices(table, sort_keys=[(partition_by, "ascending")]))
+    keys = pc.dictionary_encode(table.column(partition_by)).combine_chunks().indices.to_numpy(zero_copy_only=False)
+    starts = np.flatnonzero(np.diff(keys, prepend=-2)).tolist() + [table.num_rows]
+    with pq.ParquetWriter(filename, table.schema, compression=compression) as writer:
+        for start, end in zip(starts, starts[1:]):
+            writer.write_table(table.slice(start, end - start))
+
+def export_signals_to_parquet(signals, filename="signals.parquet", partition_by="date", compression=PARQUET_COMPRESSION):
+    """Signals with native dtypes; partition_by is 'date' (UTC day), 'source' or None."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    batch = signals if isinstance(signals, SignalBatch) else SignalBatch.from_signals(signals)
+    table = batch.to_arrow()
+    if partition_by == "date":
+        table = table.append_column("date", pc.cast(table.column("timestamp"), pa.date32()))
+    write_parquet(table, filename, partition_by, compression)
+    print(f"✅ Signals exported to {filename} ({table.num_rows} rows, {compression})")
+
+def export_nodes_to_parquet(graph, power_scores, filename="nodes.parquet", compression=PARQUET_COMPRESSION):
+    import pyarrow as pa
+
+    nodes = list(graph.nodes(data=True))
+    table = pa.table({
+        "id": pa.array([str(node) for node, _ in nodes], type=pa.string()),
+        "type": pa.array([data.get("type", "unknown") for _, data in nodes], type=pa.string()),
+        "power_score": pa.array([power_scores.get(node, 0) for node, _ in nodes], type=pa.float32()),
+    })
+    write_parquet(table, filename, compression=compression)
+    print(f"✅ Nodes exported to {filename}")
+
+def export_propagation_timeline_to_parquet(timeline: List[Dict], filename="timeline.parquet",
+                                           partition_by=None, compression=PARQUET_COMPRESSION):
+    """Timeline rows with arrival_time as a UTC timestamp column; partition_by may be 'date'."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    arrival = pc.strptime(
+        pa.array([row["arrival_time"] for row in timeline], type=pa.string()),
+        format=TIMESTAMP_FORMAT, unit="s", error_is_null=True
+    )
+    table = pa.table({
+        "signal_id": pa.array([row["signal_id"] for row in timeline], type=pa.string()),
+        "node": pa.array([row["node"] for row in timeline], type=pa.string()),
+        "arrival_time": arrival.cast(pa.timestamp("s", tz="UTC")),
+    })
+    if partition_by == "date":
+        table = table.append_column("date", pc.cast(table.column("arrival_time"), pa.date32()))
+    write_parquet(table, filename, partition_by, compression)
+    print(f"✅ Propagation timeline exported to {filename}")
+
+def stream_propagation_timeline(signals, filename="timeline.csv", parquet_filename=None,
+                                chunk_size=None, compression=PARQUET_COMPRESSION):
+    """
+    Simulates the propagation timeline and writes it chunk by chunk, so peak
+    memory depends on chunk_size rather than the total number of hops.
+    Either filename may be None to skip that format. Returns the rows written.
+    """
+    from src.simulator import TIMELINE_CHUNK_SIGNALS, iter_timeline_chunks
+
+    chunks = iter_timeline_chunks(signals, chunk_size or TIMELINE_CHUNK_SIGNALS)
+    return write_timeline_chunks(chunks, filename, parquet_filename, compression)
+
+def write_timeline_chunks(chunks, filename="timeline.csv", parquet_filename=None, compression=PARQUET_COMPRESSION):
+    """
+    Writes timeline column chunks (signal_id, node, int64 arrival_time) as
+    they are produced; arrival times are only formatted per chunk.
+    """
+    from src.model import MISSING_EPOCH
+    from src.simulator import TIMELINE_FIELDS, format_epochs
+
+    csvfile = open(filename, "w", newline="") if filename else None
+    parquet_writer = None
+    rows = 0
+    try:
+        if csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(TIMELINE_FIELDS)
+        if parquet_filename:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            schema = pa.schema([
+                ("signal_id", pa.string()), ("node", pa.string()), ("arrival_time", pa.timestamp("s", tz="UTC")),
+            ])
+            parquet_writer = pq.ParquetWriter(parquet_filename, schema, compression=compression)
+
+        for chunk in chunks:
+            arrival = chunk["arrival_time"]
+            if csvfile:
+                writer.writerows(zip(chunk["signal_id"].tolist(), chunk["node"].tolist(), format_epochs(arrival)))
+            if parquet_writer:
+                parquet_writer.write_table(pa.table({
+                    "signal_id": pa.array(chunk["signal_id"].tolist(), type=pa.string()),
+                    "node": pa.array(chunk["node"].tolist(), type=pa.string()),
+                    "arrival_time": pa.array(arrival, type=pa.int64(), mask=arrival == MISSING_EPOCH)
+                    .cast(pa.timestamp("s", tz="UTC")),
+                }, schema=schema))
+            rows += len(arrival)
+    finally:
+        if csvfile:
+            csvfile.close()
+        if parquet_writer:
+            parquet_writer.close()
+
+    for name in (filename, parquet_filename):
+        if name:
+            print(f"✅ Propagation timeline streamed to {name} ({rows} rows)")
+    return rows
+
+def file_signature(path) -> tuple:
+    """(path, mtime, size): changes whenever the export is rewritten."""
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+def export_path(stem):
+    """The file read_export(stem) loads: <stem>.parquet when present, else <stem>.csv."""
+    return f"{stem}.parquet" if os.path.exists(f"{stem}.parquet") else f"{stem}.csv"
+
+def read_export(stem, columns=None, filters=None):
+    """
+    Loads an export as a pandas DataFrame, preferring <stem>.parquet (only the
+    requested columns / matching row groups are read) over <stem>.csv.
+    """
+    import pandas as pd
+
+    path = export_path(stem)
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns, filters=filters)
+    return pd.read_csv(path, usecols=columns)
+
+# === Summary export ===
+
+SUMMARY_METRICS = ("entropy", "velocity", "impact", "drift_score", "nsi_score", "recursion_score", "power_index")
+SUMMARY_GROUP_METRICS = ("entropy", "velocity", "nsi_score")
+
+def summarize_signals(columns):
+    """
+    Dashboard aggregates over a mapping of column name -> values (SignalBatch
+    columns or a DataFrame): row count, per-metric statistics and
+    per-source / per-subreddit means.
+    """
+    import numpy as np
+    import pandas as pd
+
+    frame = pd.DataFrame({
+        name: np.asarray(columns[name], dtype=np.float64 if name in SUMMARY_METRICS else object)
+        for name in ("source", "subreddit") + SUMMARY_METRICS
+    })
+
+    def clean(value):
+        return None if pd.isna(value) else round(float(value), 4)
+
+    metrics = {}
+    for name in SUMMARY_METRICS:
+        values = frame[name].dropna()
+        metrics[name] = {
+            "count": int(len(values)),
+            **{stat: clean(getattr(values, stat)()) if len(values) else None for stat in ("mean", "min", "max")},
+            "p50": clean(values.quantile(0.5)) if len(values) else None,
+            "p90": clean(values.quantile(0.9)) if len(values) else None,
+        }
+
+    def by(key):
+        groups = frame.groupby(key, dropna=False, sort=True)
+        means = groups[list(SUMMARY_GROUP_METRICS)].mean()
+        counts = groups.size()
+        return [
+            {key: "" if pd.isna(value) else str(value), "count": int(counts[value]),
+             **{name: clean(means.at[value, name]) for name in SUMMARY_GROUP_METRICS}}
+            for value in counts.index
+        ]
+
+    return {"rows": int(len(frame)), "metrics": metrics, "by_source": by("source"), "by_subreddit": by("subreddit")}
+
+def export_signal_summary(signals, filename="signals_summary.json", exports=()):
+    """
+    Writes summarize_signals() for the dashboard, so it never aggregates the
+    full table. exports are the signal files just written; their signatures
+    are stored so a reader can tell whether the summary still describes them.
+    """
+    batch = signals if isinstance(signals, SignalBatch) else SignalBatch.from_signals(signals)
+    summary = summarize_signals({name: getattr(batch, name) for name in ("source", "subreddit") + SUMMARY_METRICS})
+    summary["exports"] = [list(file_signature(path)) for path in exports]
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"✅ Signal summary exported to {filename}")
\ No newline at end of file
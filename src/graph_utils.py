@@ -2,50 +2,145 @@
 
 import networkx as nx
 from typing import List
-from src.model import Node, Signal
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+from src.model import Node, Signal, node_registry
 import json
-from collections import defaultdict
-from src.co_occurrence import decay_weighted_lookup
-
-def build_graph(nodes: List[Node], signals: List[Signal]) -> nx.DiGraph:
+import hashlib
+import math
+import os
+import random
+from collections import Counter, defaultdict
+from src.co_occurrence import decay_weighted_lookup, CoOccurrenceIndex
+
+def aggregate_hops(signals: List[Signal], max_signal_ids: int = 0):
+    """
+    One pass over all routes, grouping hops by (source, target) node key.
+
+    Returns the unique edges in first-seen order as (source_keys, target_keys,
+    stats) where stats holds per-edge arrays: signal_count, velocity (mean),
+    velocity_max, entropy (mean), recursive_fraction, first_signal (index
+    into signals) and, with max_signal_ids > 0, signal_ids: lists of at
+    most that many signal indices in signal order.
+    """
+    import numpy as np
+
+    routes = [s.route_keys for s in signals]
+    lengths = np.fromiter(map(len, routes), dtype=np.int64, count=len(routes))
+    hop_counts = np.maximum(lengths - 1, 0)
+    if not hop_counts.any():
+        return np.empty(0, np.int64), np.empty(0, np.int64), None
+
+    # Routes are int32 arrays of node keys, so they concatenate as raw bytes
+    keys = np.frombuffer(b"".join(route.tobytes() for route in routes), dtype=np.int32).astype(np.int64)
+    # A hop starts at every route position except each route's last one
+    route_ends = np.cumsum(lengths)
+    is_start = np.ones(len(keys), dtype=bool)
+    is_start[route_ends[lengths > 0] - 1] = False
+    sources = keys[is_start]
+    targets = keys[np.flatnonzero(is_start) + 1]
+    hop_signal = np.repeat(np.arange(len(signals)), hop_counts)
+
+    velocity = np.array([s.velocity for s in signals], dtype=np.float64)[hop_signal]
+    entropy = np.array([s.entropy for s in signals], dtype=np.float64)[hop_signal]
+    recursive = np.array([bool(getattr(s, "is_recursive", False)) for s in signals])[hop_signal]
+
+    pair = sources * (int(keys.max()) + 1) + targets
+    _, first_hop, inverse, counts = np.unique(pair, return_index=True, return_inverse=True, return_counts=True)
+    # np.unique sorts by pair; renumber edges by first appearance to keep insertion order
+    order = np.argsort(first_hop, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    edge = rank[inverse]
+    counts = counts[order]
+    first_hop = first_hop[order]
+
+    velocity_max = np.full(len(counts), -np.inf)
+    np.maximum.at(velocity_max, edge, velocity)
+    stats = {
+        "signal_count": counts,
+        "velocity": np.bincount(edge, weights=velocity) / counts,
+        "velocity_max": velocity_max,
+        "entropy": np.bincount(edge, weights=entropy) / counts,
+        "recursive_fraction": np.bincount(edge, weights=recursive) / counts,
+        "first_signal": hop_signal[first_hop],
+    }
+    if max_signal_ids:
+        members = hop_signal[np.argsort(edge, kind="stable")].tolist()
+        starts = (np.cumsum(counts) - counts).tolist()
+        stats["signal_ids"] = [members[start:start + max_signal_ids] for start in starts]
+    return sources[first_hop], targets[first_hop], stats
+
+
+def build_graph(nodes: List[Node], signals: List[Signal], max_signal_ids: int = 0) -> nx.DiGraph:
+    """
+    Builds the influence graph with one edge per distinct hop.
+
+    Hops shared by several signals are aggregated instead of overwritten:
+    each edge carries signal_count, mean velocity (as `velocity`),
+    velocity_max, mean entropy (as `entropy`), recursive_fraction,
+    is_recursive (any recursive signal), the first signal's signal_id and,
+    with max_signal_ids > 0, up to that many signal_ids.
+    """
     G = nx.DiGraph()
-    for node in nodes:
-        G.add_node(node.id, type=node.type, **(node.metadata or {}))
-
-    for signal in signals:
-        for i in range(len(signal.route) - 1):
-            source = signal.route[i]
-            target = signal.route[i + 1]
-
-            if source not in G.nodes:
-                G.add_node(source, type='router')
-            if target not in G.nodes:
-                G.add_node(target, type='router')
-
-            if i == 0:
-                G.nodes[source]["signal"] = {
-                    "id": signal.id,
-                    "entropy": signal.entropy,
-                    "title": getattr(signal, "title", ""),
-                    "subreddit": getattr(signal, "subreddit", ""),
-                }
-
-            G.add_edge(
-                source,
-                target,
-                signal_id=signal.id,
-                velocity=signal.velocity,
-                entropy=signal.entropy,
-                is_recursive=signal.is_recursive if hasattr(signal, "is_recursive") else False
-            )
+    G.add_nodes_from((node.id, {"type": node.type, **(node.metadata or {})}) for node in nodes)
+
+    sources, targets, stats = aggregate_hops(signals, max_signal_ids)
+    if stats is None:
+        return G
+
+    # Route nodes that are not seed nodes become routers, in first-seen order
+    source_names = node_registry.names(sources.tolist())
+    target_names = node_registry.names(targets.tolist())
+    route_nodes = dict.fromkeys(node for hop in zip(source_names, target_names) for node in hop)
+    G.add_nodes_from((node, {"type": "router"}) for node in route_nodes if node not in G)
+
+    # The last signal leaving a node is the one shown on it
+    last_signal = {signal.route_keys[0]: signal for signal in signals if len(signal.route_keys) > 1}
+    for key, signal in last_signal.items():
+        G.nodes[node_registry.name(key)]["signal"] = {
+            "id": signal.id,
+            "entropy": signal.entropy,
+            "title": getattr(signal, "title", ""),
+            "subreddit": getattr(signal, "subreddit", ""),
+        }
+
+    signal_ids = [signal.id for signal in signals]
+    rows = zip(
+        source_names, target_names,
+        *(stats[name].tolist() for name in (
+            "first_signal", "signal_count", "velocity", "velocity_max", "entropy", "recursive_fraction"
+        ))
+    )
+    edges = [
+        (source, target, {
+            "signal_id": signal_ids[first],
+            "signal_count": count,
+            "velocity": velocity,
+            "velocity_max": velocity_max,
+            "entropy": entropy,
+            "recursive_fraction": recursive_fraction,
+            "is_recursive": recursive_fraction > 0,
+        })
+        for source, target, first, count, velocity, velocity_max, entropy, recursive_fraction in rows
+    ]
+    if max_signal_ids:
+        for (_, _, data), members in zip(edges, stats["signal_ids"]):
+            data["signal_ids"] = [signal_ids[k] for k in members]
+    G.add_edges_from(edges)
 
     return G
 
 
-def visualize_graph(G, recursion_signals=None, contradiction_pairs=None):
-    pos = nx.spring_layout(G, seed=42)
+def visualize_graph(G, recursion_signals=None, contradiction_pairs=None, layout_cache=None):
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+
+    if layout_cache is not None:
+        # Warm-started from the last run's positions so the picture stays stable
+        from src.layout_cache import incremental_layout
+        pos = incremental_layout(G, layout_cache)
+        layout_cache.save()
+    else:
+        pos = nx.spring_layout(G, seed=42)
     node_colors = []
     node_borders = []
 
@@ -111,21 +206,206 @@ def visualize_graph(G, recursion_signals=None, contradiction_pairs=None):
     print("Graph saved as influence_graph.png (recursion enhanced)")
 
 
-def compute_power_index(graph):
+def graph_fingerprint(graph) -> str:
+    """Structural hash of a graph: node ids and directed edges, ignoring attributes."""
+    digest = hashlib.sha1()
+    for node in sorted(map(str, graph.nodes())):
+        digest.update(node.encode("utf-8") + b"\0")
+    digest.update(b"\1")
+    for u, v in sorted((str(u), str(v)) for u, v in graph.edges()):
+        digest.update(u.encode("utf-8") + b"\0" + v.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+class PowerIndexCache:
+    """
+    Centrality results keyed by graph fingerprint and sampling parameters.
+    Kept in memory, and mirrored as JSON files when a directory is given.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.entries = {}
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        if key in self.entries:
+            return self.entries[key]
+        if self.directory and os.path.exists(self._path(key)):
+            with open(self._path(key), "r") as f:
+                self.entries[key] = json.load(f)
+            return self.entries[key]
+        return None
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(key), "w") as f:
+                json.dump(value, f, separators=(",", ":"))
+
+
+def betweenness_sample_size(n, epsilon, delta=0.1):
+    """
+    Pivots needed so every normalized betweenness estimate is within epsilon
+    of the exact value with probability 1 - delta (Hoeffding + union bound).
+    """
+    if n <= 2:
+        return n
+    return min(n, math.ceil(math.log(2 * n / delta) / (2 * epsilon ** 2)))
+
+
+MIN_SAMPLES = 2  # a lone pivot has no other pivots to scale its own dependency sum by
+
+
+def check_samples(samples):
+    """Rejects pivot counts the sampled estimators cannot scale."""
+    if samples is not None and samples < MIN_SAMPLES:
+        raise ValueError(f"Centrality sampling needs at least {MIN_SAMPLES} pivots, got {samples}")
+
+
+def sampled_betweenness_centrality(graph, k, seed=None):
+    """
+    Betweenness estimated from k source pivots, drawn and scaled as in
+    networkx >= 3.5: a node's dependency sum is divided by the pivots that
+    are not the node itself, times (n - 2). networkx 3.4 scales sampled
+    results by n / k instead, so the raw sums come from
+    betweenness_centrality_subset and the scaling is applied here. k must be
+    at least MIN_SAMPLES.
+    """
+    check_samples(k)
+    nodes = list(graph.nodes())
+    n = len(nodes)
+    pivots = random.Random(seed).sample(nodes, min(k, n))
+    between = nx.betweenness_centrality_subset(graph, sources=pivots, targets=nodes, normalized=False)
+    if n - 1 < 2:
+        return between
+    pivot_set = set(pivots)
+    scale = {True: 1 / ((len(pivots) - 1) * (n - 2)), False: 1 / (len(pivots) * (n - 2))}
+    return {node: value * scale[node in pivot_set] for node, value in between.items()}
+
+
+def sampled_closeness_centrality(graph, k, seed=None):
+    """
+    Closeness estimated from k BFS pivots (Eppstein-Wang style).
+
+    Uses networkx's directed convention (distances *to* each node) and the
+    Wasserman-Faust scaling, with both the reachable count and the distance
+    sum estimated from the pivots.
+    """
+    nodes = list(graph.nodes())
+    n = len(nodes)
+    if n <= 1:
+        return {node: 0.0 for node in nodes}
+    pivots = random.Random(seed).sample(nodes, min(k, n))
+
+    reached = defaultdict(int)
+    distance_sum = defaultdict(int)
+    for pivot in pivots:
+        for node, distance in nx.single_source_shortest_path_length(graph, pivot).items():
+            if node != pivot:
+                reached[node] += 1
+                distance_sum[node] += distance
+
+    pivot_set = set(pivots)
+    closeness = {}
+    for node in nodes:
+        others = len(pivots) - (1 if node in pivot_set else 0)
+        total = distance_sum.get(node, 0)
+        closeness[node] = reached[node] ** 2 / (total * others) if total and others else 0.0
+    return closeness
+
+
+def centrality_scores(graph, approximate=False, samples=None, epsilon=None, delta=0.1, seed=42, cache=None):
+    """
+    Returns (betweenness, closeness) dicts.
+
+    approximate=True samples pivots instead of running the all-pairs
+    algorithms: `samples` pivots, or enough pivots for an `epsilon` error
+    bound on betweenness (default epsilon=0.05); samples below MIN_SAMPLES
+    raise ValueError. With a PowerIndexCache,
+    results for a structurally unchanged graph are reused. A CSRGraph is
+    scored with its vectorised kernels, with the same pivots and scaling.
+    """
+    from src.csr_graph import CSRGraph
+
+    is_csr = isinstance(graph, CSRGraph)
+    n = graph.number_of_nodes()
+    check_samples(samples)
+    if approximate:
+        k = samples or betweenness_sample_size(n, epsilon or 0.05, delta)
+        k = min(k, n)
+        mode = f"approx:k={k}:seed={seed}"
+    else:
+        mode = "exact"
+
+    key = None
+    if cache is not None:
+        fingerprint = graph.fingerprint() if is_csr else graph_fingerprint(graph)
+        key = hashlib.sha1(f"{fingerprint}:{mode}".encode("utf-8")).hexdigest()
+        cached = cache.get(key)
+        if cached is not None:
+            # JSON turns node ids into strings; map back onto the graph's own ids
+            ids = {str(node): node for node in (graph.node_ids if is_csr else graph.nodes())}
+            return (
+                {ids[node]: value for node, value in cached["between"].items()},
+                {ids[node]: value for node, value in cached["close"].items()},
+            )
+
+    if is_csr:
+        pivots = k if approximate and k < n else None
+        between = graph.as_dict(graph.betweenness(pivots, seed=seed))
+        close = graph.as_dict(graph.closeness(pivots, seed=seed))
+    elif approximate and k < n:
+        between = sampled_betweenness_centrality(graph, k, seed=seed)
+        close = sampled_closeness_centrality(graph, k, seed=seed)
+    else:
+        between = nx.betweenness_centrality(graph)
+        close = nx.closeness_centrality(graph)
+
+    if cache is not None:
+        cache.put(key, {
+            "between": {str(node): value for node, value in between.items()},
+            "close": {str(node): value for node, value in close.items()},
+        })
+    return between, close
+
+
+def compute_power_index(graph, approximate=False, samples=None, epsilon=None, seed=42, cache=None, backend="networkx"):
+    """
+    Scores every node by degree, betweenness and closeness. backend="csr"
+    (or passing a CSRGraph) runs the analytics on frozen CSR arrays. A
+    DiGraph is converted first, so both are held while scoring; only a
+    CSRGraph built with CSRGraph.from_signals avoids the DiGraph.
+    """
     import operator
+    from src.csr_graph import CSRGraph
+
+    check_samples(samples)
     print("\nNode Power Index (Influence Ranking):")
 
-    in_deg = dict(graph.in_degree())
-    out_deg = dict(graph.out_degree())
-    between = nx.betweenness_centrality(graph)
-    close = nx.closeness_centrality(graph)
+    if backend == "csr" and not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_networkx(graph)
+    if isinstance(graph, CSRGraph):
+        nodes = graph.node_ids
+        in_deg = graph.as_dict(graph.in_degree())
+        out_deg = graph.as_dict(graph.out_degree())
+    else:
+        nodes = list(graph.nodes())
+        in_deg = dict(graph.in_degree())
+        out_deg = dict(graph.out_degree())
+    between, close = centrality_scores(
+        graph, approximate=approximate, samples=samples, epsilon=epsilon, seed=seed, cache=cache
+    )
 
     print("\n🔍 DEGREE DIAGNOSTICS:")
-    for node in graph.nodes():
+    for node in nodes:
         print(f"{node}: in={in_deg.get(node, 0)}, out={out_deg.get(node, 0)}, between={round(between.get(node, 0), 4)}, close={round(close.get(node, 0), 4)}")
 
     scores = {}
-    for node in graph.nodes():
+    for node in nodes:
         score = (
             in_deg.get(node, 0) * 1.0 +
             out_deg.get(node, 0) * 1.2 +
@@ -165,6 +445,9 @@ def compute_narrative_stability_index(graph, signals, power_scores):
 
 
 def visualize_structured_graph(G):
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+
     from collections import defaultdict
     layer_y = {
         "influencer": 2,
@@ -246,27 +529,103 @@ def infer_route_from_memory(signal, co_map):
     return []
 
 
-def resolve_cross_platform_hop(signal, transition_map, bridge_nodes):
-    if not signal.route or len(signal.route) < 2:
-        return signal
+def infer_routes_from_memory(signals, memory_index):
+    """
+    Batch form of infer_route_from_memory: scores every signal against a
+    CoOccurrenceIndex in one pass and returns one route per signal.
+    A plain co-occurrence map is compiled on the fly.
+    """
+    if isinstance(memory_index, dict):
+        memory_index = CoOccurrenceIndex.from_map(memory_index)
+    texts = [(signal.title + ' ' + signal.content).lower() for signal in signals]
+    return [
+        ['user_1', 'user_2', top] if top is not None else []
+        for top in memory_index.top_1_batch(texts)
+    ]
 
-    src_platform = signal.source.lower()
-    candidate_jumps = [(a, b) for (a, b) in transition_map.keys() if a == src_platform]
 
-    if not candidate_jumps:
+class RouteEnrichmentIndex:
+    """
+    Cross-platform hop resolution, built once from the output of
+    detect_cross_platform_bridges.
+
+    best_target maps each source platform to its most frequent transition
+    target (ties keep the transition map's order), so a hop is one dict
+    lookup instead of a scan of every transition. Bridges are ranked by how
+    many cross-platform hops they carried, then by id, so the same data
+    always picks the same bridge whatever the set iteration order.
+    """
+
+    def __init__(self, transition_map, bridge_nodes):
+        self.transitions = dict(transition_map)
+        self.best_target = {}
+        best_count = {}
+        for (src, dst), count in self.transitions.items():
+            if src not in best_count or count > best_count[src]:
+                best_count[src] = count
+                self.best_target[src] = dst
+
+        counts = bridge_nodes if isinstance(bridge_nodes, dict) else dict.fromkeys(bridge_nodes, 0)
+        self.bridges = sorted(counts, key=lambda node: (-counts[node], node))
+        self.bridge_set = frozenset(self.bridges)
+
+    def next_bridge(self, route):
+        """Highest ranked bridge not already on the route; at most len(route) + 1 checks."""
+        used = set(route)
+        return next((bridge for bridge in self.bridges if bridge not in used), None)
+
+    def resolve_hop(self, signal):
+        """Appends a bridge and the source platform's most common next platform."""
+        if not signal.route or len(signal.route) < 2:
+            return signal
+        target_platform = self.best_target.get(signal.source.lower())
+        if target_platform is None:
+            return signal
+
+        bridge = self.next_bridge(signal.route)
+        if bridge:
+            signal.route.append(bridge)
+        signal.route.append(target_platform)
         return signal
 
-    # Pick most common transition
-    most_common_jump = max(candidate_jumps, key=lambda k: transition_map[k])
-    _, target_platform = most_common_jump
+    def reinforce(self, signal):
+        """Inserts a bridge after the first known platform transition that lacks one."""
+        route = list(signal.route or [])
+        if len(route) < 2:
+            return signal
+
+        for i in range(len(route) - 1):
+            if (route[i], route[i + 1]) not in self.transitions:
+                continue
+            if i + 2 >= len(route) or route[i + 2] not in self.bridge_set:
+                bridge = self.next_bridge(route)
+                if bridge is not None:
+                    signal.route = route[:i + 1] + [bridge] + route[i + 1:]
+                # Bridge availability does not depend on the position, so later hops cannot do better
+                break
+        return signal
 
-    # Add bridge node if exists
-    bridge = next((b for b in bridge_nodes if b not in signal.route), None)
-    if bridge:
-        signal.route.append(bridge)
-    signal.route.append(target_platform)
+    def enrich(self, signals, memory_index, reinforce=True):
+        """
+        Batch enrichment of every route-less signal: memory routes are
+        inferred for all of them in one pass, then cross-platform hops are
+        resolved and (with reinforce) bridges inserted. Returns the signals
+        that needed enrichment.
+        """
+        pending = [signal for signal in signals if not signal.route or len(signal.route) <= 1]
+        resolve = bool(self.transitions and self.bridges)
+        for signal, enriched_route in zip(pending, infer_routes_from_memory(pending, memory_index)):
+            if enriched_route:
+                signal.route = enriched_route
+            if resolve:
+                self.resolve_hop(signal)
+            if reinforce:
+                self.reinforce(signal)
+        return pending
 
-    return signal
+
+def resolve_cross_platform_hop(signal, transition_map, bridge_nodes):
+    return RouteEnrichmentIndex(transition_map, bridge_nodes).resolve_hop(signal)
 
 
 def resolve_missing_route(signal, co_map, transition_map=None, bridge_nodes=None):
@@ -281,17 +640,27 @@ def resolve_missing_route(signal, co_map, transition_map=None, bridge_nodes=None
     return signal
 
 
+def resolve_missing_routes(signals, memory_index, transition_map=None, bridge_nodes=None):
+    """
+    Batch form of resolve_missing_route for every route-less signal.
+    Returns the signals that needed enrichment.
+    """
+    index = RouteEnrichmentIndex(transition_map or {}, bridge_nodes or ())
+    return index.enrich(signals, memory_index, reinforce=False)
+
+
 def detect_cross_platform_bridges(signals, nodes):
+    """
+    Returns (transition_map, bridge_nodes): counts of consecutive platform
+    pairs on routes, and how often each node sat between two platforms.
+    """
     platform_nodes = {node.id: node.metadata.get("region", "") for node in nodes if node.type == "platform"}
-    platform_routes = defaultdict(list)
-    bridge_nodes = set()
+    bridge_nodes = Counter()
     transition_map = defaultdict(int)
 
     for signal in signals:
-        platforms_in_route = []
-        for node_id in signal.route:
-            if node_id in platform_nodes:
-                platforms_in_route.append(node_id)
+        route = list(signal.route)
+        platforms_in_route = [node_id for node_id in route if node_id in platform_nodes]
 
         for i in range(len(platforms_in_route) - 1):
             src = platforms_in_route[i]
@@ -299,42 +668,19 @@ def detect_cross_platform_bridges(signals, nodes):
             if src != dst:
                 transition_map[(src, dst)] += 1
 
-        for i in range(len(signal.route) - 2):
-            if signal.route[i] in platform_nodes and signal.route[i + 2] in platform_nodes:
-                bridge_nodes.add(signal.route[i + 1])
+        for i in range(len(route) - 2):
+            if route[i] in platform_nodes and route[i + 2] in platform_nodes:
+                bridge_nodes[route[i + 1]] += 1
 
     print("\n🌉 Cross-Platform Transitions:")
     for (src, dst), count in transition_map.items():
         print(f"{src} → {dst}: {count} times")
 
     print("\n🔗 Bridge Nodes Across Platforms:")
-    for node in bridge_nodes:
+    for node in RouteEnrichmentIndex({}, bridge_nodes).bridges:
         print(f"- {node}")
 
     return transition_map, bridge_nodes
 
 def reinforce_cross_platform_bridges(signal, transition_map, bridge_nodes):
-    # Check if signal jumps platforms
-    route = signal.route or []
-    if len(route) < 2:
-        return signal
-
-    # Find known platform transitions in this route
-    enriched = False
-    for i in range(len(route) - 1):
-        src = route[i]
-        dst = route[i + 1]
-
-        if (src, dst) in transition_map:
-            # If there's no bridge in between, insert one from the known bridge list
-            if i + 2 >= len(route) or route[i + 2] not in bridge_nodes:
-                for bridge in bridge_nodes:
-                    # Insert the bridge node if it hasn't already been used
-                    if bridge not in route:
-                        signal.route = route[:i + 1] + [bridge] + route[i + 1:]
-                        enriched = True
-                        break
-            if enriched:
-                break
-
-    return signal
\ No newline at end of file
+    return RouteEnrichmentIndex(transition_map, bridge_nodes).reinforce(signal)
@@ -0,0 +1,192 @@
+# src/http_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters and headers that carry credentials never become part of a cache key
+CREDENTIAL_PARAMS = {
+    "apikey", "api_key", "key", "token", "access_token", "bearer_token",
+    "client_id", "client_secret", "password", "signature",
+}
+CREDENTIAL_HEADERS = {"authorization", "proxy-authorization", "x-api-key", "cookie"}
+
+# Seconds a cached response is served without asking the API again
+DEFAULT_TTLS = {"news": 15 * 60, "reddit": 5 * 60, "twitter": 10 * 60}
+DEFAULT_TTL = 5 * 60
+
+
+class CachedResponse:
+    """Minimal requests.Response stand-in for responses served from the cache."""
+
+    def __init__(self, url, status_code, content: bytes, headers=None, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.from_cache = from_cache
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def request_key(method: str, url: str, params=None, headers=None) -> str:
+    """Stable cache key for a request, with credentials stripped."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True) + list((params or {}).items())
+    query = sorted((k, str(v)) for k, v in query if k.lower() not in CREDENTIAL_PARAMS)
+    safe_url = urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+    safe_headers = sorted(
+        (k.lower(), str(v)) for k, v in (headers or {}).items() if k.lower() not in CREDENTIAL_HEADERS
+    )
+    raw = json.dumps([method.upper(), safe_url, safe_headers], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    On-disk response cache shared by all collectors.
+
+    Entries live in one SQLite file and are keyed by request (credentials
+    stripped). Each source has its own TTL; stale entries that carry an ETag
+    or Last-Modified are revalidated with a conditional request, and a 304
+    refreshes them without a new body. The cache is bounded by max_bytes and
+    evicts least recently used entries first.
+
+    fetch() caches raw HTTP; memoize() caches JSON payloads for API clients
+    such as praw and tweepy that do not expose their HTTP layer.
+    """
+
+    def __init__(self, path=".cache/http_responses.sqlite", max_bytes=256 * 1024 * 1024, ttls=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self.db.commit()
+
+    def ttl(self, source):
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    # --- storage ---
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT status, body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+        status, body, etag, last_modified, stored_at = row
+        return {"status": status, "body": body, "etag": etag, "last_modified": last_modified, "stored_at": stored_at}
+
+    def put(self, key, source, body: bytes, status=200, etag=None, last_modified=None):
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, source, status, body, etag, last_modified, now, now, len(body))
+            )
+            self._evict()
+            self.db.commit()
+
+    def refresh(self, key):
+        """Marks an entry fresh again after a 304 Not Modified."""
+        now = time.time()
+        with self.lock:
+            self.db.execute("UPDATE responses SET stored_at = ?, last_access = ? WHERE key = ?", (now, now, key))
+            self.db.commit()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def is_fresh(self, entry, source):
+        return time.time() - entry["stored_at"] < self.ttl(source)
+
+    def clear(self):
+        with self.lock:
+            self.db.execute("DELETE FROM responses")
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    # --- HTTP ---
+
+    def fetch(self, session, url, source, params=None, headers=None, timeout=30) -> CachedResponse:
+        """GET through the cache. session is a requests.Session or the requests module."""
+        key = request_key("GET", url, params, headers)
+        entry = self.get(key)
+        if entry is not None and self.is_fresh(entry, source):
+            return CachedResponse(url, entry["status"], entry["body"], from_cache=True)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry["etag"]:
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, params=params, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and entry is not None:
+            self.refresh(key)
+            return CachedResponse(url, entry["status"], entry["body"], from_cache=True)
+
+        if response.status_code == 200:
+            self.put(
+                key, source, response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+        return CachedResponse(url, response.status_code, response.content, dict(response.headers))
+
+    # --- API clients ---
+
+    def memoize(self, source, key_parts, fetch_fn):
+        """
+        Returns fetch_fn()'s JSON-serialisable result, reusing it while it is
+        younger than the source's TTL. key_parts must not contain credentials.
+        """
+        key = hashlib.sha256(json.dumps([source, *key_parts], separators=(",", ":")).encode("utf-8")).hexdigest()
+        entry = self.get(key)
+        if entry is not None and self.is_fresh(entry, source):
+            return json.loads(entry["body"])
+
+        payload = fetch_fn()
+        self.put(key, source, json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        return payload
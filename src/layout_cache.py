@@ -0,0 +1,224 @@
+# src/layout_cache.py
+
+import hashlib
+import json
+import math
+import os
+from typing import Dict, Optional
+
+import networkx as nx
+import numpy as np
+
+LAYOUT_SEED = 42
+GRID_LAYOUT_MIN_NODES = 1000  # above this, "auto" uses the grid-approximated layout
+MAX_GRID_CELLS = 32  # per axis
+REPULSION_BLOCK = 2048
+
+
+class LayoutCache:
+    """
+    Node positions from the previous run, keyed by node id and stored as
+    JSON. Each entry also keeps a digest of the node's neighbours, so the
+    next run can tell which nodes kept the same surroundings and can stay
+    where they were.
+    """
+
+    def __init__(self, path=".cache/layout.json"):
+        self.path = path
+        self.entries: Dict[str, list] = {}
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                self.entries = json.load(f).get("nodes", {})
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, node):
+        entry = self.entries.get(str(node))
+        return None if entry is None else (entry[0], entry[1])
+
+    def digest(self, node):
+        entry = self.entries.get(str(node))
+        return None if entry is None else entry[2]
+
+    def update(self, G, pos):
+        """Replaces the cache with the current graph's nodes and positions."""
+        self.entries = {
+            str(node): [round(float(x), 6), round(float(y), 6), neighbour_digest(G, node)]
+            for node, (x, y) in pos.items()
+        }
+
+    def save(self):
+        if not self.path:
+            return
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": 1, "nodes": self.entries}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+
+def neighbour_digest(G, node) -> str:
+    """Short hash of a node's neighbours, ignoring edge direction."""
+    neighbours = set(G.successors(node)) | set(G.predecessors(node)) if G.is_directed() else set(G[node])
+    raw = "\0".join(sorted(str(n) for n in neighbours))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _repulsion(points, others, k2, mass=1.0, exclude=None):
+    """
+    Summed Fruchterman-Reingold repulsion (k^2 / distance) on points from
+    others, weighted by mass. Coincident pairs (a point and itself) and the
+    excluded column per row contribute nothing.
+    """
+    dx = points[:, 0:1] - others[:, 0]
+    dy = points[:, 1:2] - others[:, 1]
+    distance2 = dx * dx + dy * dy
+    weight = np.divide(k2 * mass, np.maximum(distance2, 1e-6 * k2), where=distance2 > 0, out=np.zeros_like(dx))
+    if exclude is not None:
+        weight[np.arange(len(points)), exclude] = 0.0
+    return points * weight.sum(axis=1)[:, None] - weight @ others
+
+
+def grid_force_layout(positions: np.ndarray, edges: np.ndarray, movable: np.ndarray,
+                      iterations=50, grid=None):
+    """
+    Fruchterman-Reingold on the movable nodes only, with repulsion
+    approximated on a grid: nodes in the same cell repel exactly, farther
+    nodes through their cell's centroid and count. Grid lines sit at
+    quantiles of each axis so cells stay evenly filled however the nodes are
+    spread. Each iteration costs about O(movable x cells + edges) instead of
+    O(n^2). Updates positions in place.
+    """
+    n = len(positions)
+    grid = grid or int(np.clip(round(math.sqrt(n) / 8), 4, MAX_GRID_CELLS))
+    moving = np.flatnonzero(movable)
+    if not moving.size or n < 2:
+        return positions
+
+    extent = float(np.ptp(positions, axis=0).max()) or 1.0
+    k = extent / math.sqrt(n)
+    temperature = 0.1 * extent
+    cooling = temperature / (iterations + 1)
+    edges = edges[movable[edges[:, 0]] | movable[edges[:, 1]]]
+
+    for _ in range(iterations):
+        displacement = np.zeros((n, 2))
+
+        # Bin every node; repulsion from other cells comes from their centroids
+        quantiles = np.linspace(0, 1, grid + 1)[1:-1]
+        cell = np.zeros(n, dtype=np.int64)
+        for axis in range(2):
+            lines = np.quantile(positions[:, axis], quantiles)
+            cell = cell * grid + np.searchsorted(lines, positions[:, axis], side="right")
+        mass = np.bincount(cell, minlength=grid * grid).astype(np.float64)
+        occupied = np.flatnonzero(mass)
+        centroid = np.column_stack([
+            np.bincount(cell, weights=positions[:, axis], minlength=grid * grid)[occupied] / mass[occupied]
+            for axis in range(2)
+        ])
+        occupied_index = np.full(grid * grid, -1)
+        occupied_index[occupied] = np.arange(len(occupied))
+
+        for start in range(0, len(moving), REPULSION_BLOCK):
+            block = moving[start:start + REPULSION_BLOCK]
+            displacement[block] += _repulsion(
+                positions[block], centroid, k * k, mass[occupied], exclude=occupied_index[cell[block]]
+            )
+
+        # Exact repulsion within each cell that holds movable nodes
+        order = np.argsort(cell, kind="stable")
+        bounds = np.searchsorted(cell[order], np.arange(grid * grid + 1))
+        for c in np.unique(cell[moving]).tolist():
+            members = order[bounds[c]:bounds[c + 1]]
+            movers = members[movable[members]]
+            rows = max(1, REPULSION_BLOCK * 1024 // len(members))
+            for start in range(0, len(movers), rows):
+                block = movers[start:start + rows]
+                displacement[block] += _repulsion(positions[block], positions[members], k * k)
+
+        # Attraction along edges touching a movable node
+        delta = positions[edges[:, 0]] - positions[edges[:, 1]]
+        pull = delta * (np.sqrt((delta ** 2).sum(axis=1)) / k)[:, None]
+        for axis in range(2):
+            displacement[:, axis] -= np.bincount(edges[:, 0], weights=pull[:, axis], minlength=n)
+            displacement[:, axis] += np.bincount(edges[:, 1], weights=pull[:, axis], minlength=n)
+
+        length = np.maximum(np.sqrt((displacement[moving] ** 2).sum(axis=1)), 1e-9)
+        step = np.minimum(length, temperature) / length
+        positions[moving] += displacement[moving] * step[:, None]
+        temperature -= cooling
+
+    return positions
+
+
+def incremental_layout(G, cache: Optional[LayoutCache] = None, iterations=50, seed=LAYOUT_SEED, method="auto"):
+    """
+    Positions for G that stay put from run to run.
+
+    Nodes whose cached neighbour digest still matches keep their cached
+    position and are held fixed. New nodes start next to their placed
+    neighbours, and only they and nodes whose neighbourhood changed are
+    iterated. If nothing changed, the cached positions come back without
+    any iterations. method is "spring" (networkx), "grid" (the
+    grid-approximated force layout for large graphs) or "auto". The cache,
+    when given, is updated but not saved.
+    """
+    nodes = list(G.nodes())
+    if method == "auto":
+        method = "grid" if len(nodes) > GRID_LAYOUT_MIN_NODES else "spring"
+    cached = {} if cache is None else {node: cache.get(node) for node in nodes}
+    cached = {node: xy for node, xy in cached.items() if xy is not None}
+
+    if not cached and method == "spring":
+        pos = nx.spring_layout(G, seed=seed)
+    else:
+        pos = _warm_layout(G, nodes, cached, cache, iterations, seed, method)
+    pos = {node: (float(x), float(y)) for node, (x, y) in pos.items()}
+
+    if cache is not None:
+        cache.update(G, pos)
+    return pos
+
+
+def _warm_layout(G, nodes, cached, cache, iterations, seed, method):
+    rng = np.random.default_rng(seed)
+    index = {node: i for i, node in enumerate(nodes)}
+    positions = np.zeros((len(nodes), 2))
+    placed = np.zeros(len(nodes), dtype=bool)
+    for node, xy in cached.items():
+        positions[index[node]] = xy
+        placed[index[node]] = True
+
+    movable = ~placed
+    for node in cached:
+        if cache.digest(node) != neighbour_digest(G, node):
+            movable[index[node]] = True
+    if not movable.any():
+        return dict(zip(nodes, positions))
+
+    # New nodes start at the mean of their placed neighbours, else anywhere in the current extent
+    low, high = (positions[placed].min(axis=0), positions[placed].max(axis=0)) if placed.any() else (0.0, 1.0)
+    spread = 0.05 * (float(np.max(np.subtract(high, low))) or 1.0)
+    undirected = G.to_undirected(as_view=True) if G.is_directed() else G
+    for i in np.flatnonzero(~placed).tolist():
+        neighbours = [index[n] for n in undirected[nodes[i]] if placed[index[n]]]
+        if neighbours:
+            positions[i] = positions[neighbours].mean(axis=0) + rng.normal(0.0, spread, 2)
+        else:
+            positions[i] = rng.uniform(low, high, 2) if placed.any() else rng.uniform(0.0, 1.0, 2)
+
+    if method == "spring":
+        # k scaled to the cached extent (networkx assumes a unit square); edges
+        # pull both ways, otherwise nodes with only in-edges drift off
+        fixed = [node for node in nodes if not movable[index[node]]]
+        extent = float(np.ptp(positions, axis=0).max()) or 1.0
+        return nx.spring_layout(
+            undirected, pos={node: positions[index[node]] for node in nodes}, fixed=fixed or None,
+            k=extent / math.sqrt(len(nodes)), iterations=iterations, seed=seed
+        )
+
+    edges = np.array([(index[u], index[v]) for u, v in G.edges() if u != v], dtype=np.int64).reshape(-1, 2)
+    grid_force_layout(positions, edges, movable, iterations)
+    return dict(zip(nodes, positions))
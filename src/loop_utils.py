@@ -0,0 +1,146 @@
+# src/loop_utils.py
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import networkx as nx
+
+
+@dataclass
+class LoopReport:
+    cycles: List[list] = field(default_factory=list)
+    truncated: bool = False
+    reason: Optional[str] = None  # 'max_cycles' or 'time_budget' when truncated
+    elapsed: float = 0.0
+
+
+def cyclic_components(graph) -> List[set]:
+    """Strongly connected components that can hold a cycle, largest first."""
+    components = [
+        component for component in nx.strongly_connected_components(graph)
+        if len(component) > 1 or any(graph.has_edge(node, node) for node in component)
+    ]
+    return sorted(components, key=len, reverse=True)
+
+
+def condensation_summary(graph) -> Dict:
+    """
+    Linear-time overview of where feedback loops can exist: every cycle lies
+    inside one strongly connected component, so nodes outside the cyclic
+    components never take part in a loop.
+    """
+    component_count = nx.number_strongly_connected_components(graph)
+    cyclic = cyclic_components(graph)
+    return {
+        "nodes": graph.number_of_nodes(),
+        "components": component_count,
+        "cyclic_components": len(cyclic),
+        "largest_cyclic_component": len(cyclic[0]) if cyclic else 0,
+        "nodes_in_cycles": sum(len(component) for component in cyclic),
+        "component_sizes": [len(component) for component in cyclic],
+    }
+
+
+def iter_cycles(graph, max_length: Optional[int] = 8):
+    """
+    Streams simple cycles one at a time, searching each cyclic component on
+    its own and skipping cycles longer than max_length (None = unbounded).
+    """
+    for component in cyclic_components(graph):
+        subgraph = graph.subgraph(component)
+        yield from nx.simple_cycles(subgraph, length_bound=max_length)
+
+
+def find_cycles(graph, max_length: Optional[int] = 8, max_cycles: Optional[int] = 1000,
+                time_budget: Optional[float] = 10.0) -> LoopReport:
+    """
+    Collects cycles like iter_cycles until max_cycles cycles have been found
+    or time_budget seconds have passed, whichever comes first.
+
+    The budget is checked before each cyclic component and after each cycle
+    found. networkx cannot be interrupted mid-search, so the run can
+    overshoot the budget by the time it takes one component to produce its
+    next cycle (or to finish without one); max_length keeps that wait short.
+    """
+    report = LoopReport()
+    start = time.perf_counter()
+
+    def out_of_time():
+        return time_budget is not None and time.perf_counter() - start > time_budget
+
+    def collect():
+        for component in cyclic_components(graph):
+            if out_of_time():
+                return "time_budget"
+            for cycle in nx.simple_cycles(graph.subgraph(component), length_bound=max_length):
+                report.cycles.append(cycle)
+                if max_cycles is not None and len(report.cycles) >= max_cycles:
+                    return "max_cycles"
+                if out_of_time():
+                    return "time_budget"
+        return None
+
+    report.reason = collect()
+    report.truncated = report.reason is not None
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def closed_walk_counts(adjacency, max_length: int = 3, max_nnz: int = 20_000_000):
+    """
+    Per-row self-loop count plus diag(A^k) for k = 2..max_length of an
+    integer scipy CSR adjacency matrix, with self-loops removed from A.
+
+    Rows are processed in blocks sized so the first product A[block] @ A
+    stays around max_nnz entries; hub-heavy graphs would not fit A² whole.
+    """
+    import numpy as np
+
+    # Self-loops count once as length-1 cycles and are kept out of longer walks
+    totals = adjacency.diagonal().astype(np.int64)
+    adjacency = adjacency.copy()
+    adjacency.setdiag(0)
+    adjacency.eliminate_zeros()
+
+    # diag(A^k) = rowsum(A^(k-1) ∘ Aᵀ), so A^k itself is never formed
+    transpose = adjacency.T.tocsr()
+    out_degree = np.diff(adjacency.indptr)
+    row_cost = np.maximum(adjacency @ out_degree.astype(np.float64), 1)
+    boundaries = np.searchsorted(np.cumsum(row_cost), np.arange(max_nnz, row_cost.sum(), max_nnz))
+    starts = np.unique(np.concatenate(([0], boundaries)))
+    ends = np.append(starts[1:], adjacency.shape[0])
+
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if start == end:
+            continue
+        walks = adjacency[start:end]
+        block_transpose = transpose[start:end]
+        for k in range(2, max_length + 1):
+            totals[start:end] += np.asarray(walks.multiply(block_transpose).sum(axis=1)).ravel().astype(np.int64)
+            if k < max_length:
+                walks = walks @ adjacency
+    return totals
+
+
+def cycle_participation(graph, max_length: int = 3) -> Dict[str, int]:
+    """
+    Per-node loop participation from closed-walk counts, without listing cycles.
+
+    For each node v this counts its self-loop plus diag(A^k)[v] for
+    k = 2..max_length over the node's cyclic component, with self-loops
+    removed from A. Up to length 3 such a closed walk is always a simple
+    cycle, so with max_length <= 3 the result is the exact number of cycles
+    through v of length <= 3. Longer walks can revisit nodes, so for larger
+    max_length the count is an upper bound that still ranks loop-heavy nodes.
+    """
+    import numpy as np
+
+    participation = {node: 0 for node in graph.nodes()}
+    for component in cyclic_components(graph):
+        nodes = list(component)
+        adjacency = nx.to_scipy_sparse_array(graph, nodelist=nodes, weight=None, format="csr").astype(np.int64)
+        totals = closed_walk_counts(adjacency, max_length)
+        for node, count in zip(nodes, totals.tolist()):
+            participation[node] = count
+    return participation
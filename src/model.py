@@ -1,27 +1,248 @@
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+import sys
+from array import array
+from collections.abc import MutableSequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Union
 
-@dataclass
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+MISSING_EPOCH = -(2 ** 63)
+
+
+def parse_epoch(timestamp: str) -> int:
+    """Parses a collector timestamp into UTC epoch seconds."""
+    if not timestamp:
+        return MISSING_EPOCH
+    parsed = datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+    return int(parsed.replace(tzinfo=timezone.utc).timestamp())
+
+
+def format_epoch(epoch: int) -> str:
+    if epoch == MISSING_EPOCH:
+        return ""
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+class NodeRegistry:
+    """Interns node ids to small integers for the lifetime of the process."""
+    __slots__ = ("_keys", "_names")
+
+    def __init__(self):
+        self._keys = {}
+        self._names = []
+
+    def intern(self, name: str) -> int:
+        key = self._keys.get(name)
+        if key is None:
+            key = len(self._names)
+            name = sys.intern(name)
+            self._keys[name] = key
+            self._names.append(name)
+        return key
+
+    def get(self, name: str, default=None):
+        """Key of an already interned id, without interning it."""
+        return self._keys.get(name, default)
+
+    def name(self, key: int) -> str:
+        return self._names[key]
+
+    def names(self, keys) -> List[str]:
+        names = self._names
+        return [names[k] for k in keys]
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._keys
+
+
+node_registry = NodeRegistry()
+
+
+class RouteView(MutableSequence):
+    """
+    List-like view over a route stored as an array of interned node keys.
+    Reads return node id strings; writes intern them.
+    """
+    __slots__ = ("keys",)
+
+    def __init__(self, keys: array):
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return node_registry.names(self.keys[index])
+        return node_registry.name(self.keys[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.keys[index] = array("i", map(node_registry.intern, value))
+        else:
+            self.keys[index] = node_registry.intern(value)
+
+    def __delitem__(self, index):
+        del self.keys[index]
+
+    def insert(self, index, value):
+        self.keys.insert(index, node_registry.intern(value))
+
+    def append(self, value):
+        self.keys.append(node_registry.intern(value))
+
+    def __iter__(self):
+        return iter(node_registry.names(self.keys))
+
+    def __contains__(self, value):
+        key = node_registry.get(value)
+        return key is not None and key in self.keys
+
+    def __eq__(self, other):
+        if isinstance(other, RouteView):
+            return self.keys == other.keys
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def _intern_text(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
 class Node:
     id: str
     type: str  # 'influencer', 'platform', 'institution', 'router'
     metadata: Optional[Dict[str, str]] = None
 
-@dataclass
+    @property
+    def key(self) -> int:
+        return node_registry.intern(self.id)
+
+
 class Signal:
-    id: str
-    content: str
-    title: str
-    source: str
-    timestamp: str
-    entropy: float
-    velocity: float
-    impact: float
-
-    # Optional fields to handle routing + platform specifics
-    node: Optional[str] = None
-    route: Optional[List[str]] = field(default_factory=list)
-    subreddit: Optional[str] = None
-    is_recursive: bool = False
-    recursive_depth: int = 0
-    seed_node: Optional[str] = None
\ No newline at end of file
+    """
+    Slotted signal record.
+
+    Routes are stored as int32 arrays of interned node keys and exposed as a
+    list-like RouteView; timestamps are stored once as UTC epoch seconds and
+    exposed as the collector string format. Derived metrics are declared
+    slots that stay unset (AttributeError / getattr default) until a stage
+    computes them.
+    """
+    __slots__ = (
+        "id", "content", "title", "source", "epoch",
+        "entropy", "velocity", "impact",
+        "node", "_route", "subreddit", "is_recursive", "recursive_depth", "seed_node",
+        # Derived metrics
+        "drift_score", "nsi_score", "recursion_score", "power_index", "is_contradiction",
+        "duplicate_ids", "source_counts", "features",
+    )
+
+    FIELDS = (
+        "id", "content", "title", "source", "timestamp", "entropy", "velocity", "impact",
+        "node", "route", "subreddit", "is_recursive", "recursive_depth", "seed_node",
+    )
+    METRICS = (
+        "drift_score", "nsi_score", "recursion_score", "power_index", "is_contradiction",
+        "duplicate_ids", "source_counts", "features",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        content: str,
+        title: str,
+        source: str,
+        timestamp: Union[str, int],
+        entropy: float,
+        velocity: float,
+        impact: float,
+        node: Optional[str] = None,
+        route: Optional[List[str]] = None,
+        subreddit: Optional[str] = None,
+        is_recursive: bool = False,
+        recursive_depth: int = 0,
+        seed_node: Optional[str] = None,
+    ):
+        self.id = id
+        self.content = content
+        self.title = title
+        self.source = _intern_text(source)
+        self.timestamp = timestamp
+        self.entropy = entropy
+        self.velocity = velocity
+        self.impact = impact
+        self.node = _intern_text(node)
+        self.route = route
+        self.subreddit = _intern_text(subreddit)
+        self.is_recursive = is_recursive
+        self.recursive_depth = recursive_depth
+        self.seed_node = _intern_text(seed_node)
+
+    @property
+    def route(self) -> RouteView:
+        return RouteView(self._route)
+
+    @route.setter
+    def route(self, value):
+        if isinstance(value, RouteView):
+            self._route = array("i", value.keys)
+        else:
+            self._route = array("i", map(node_registry.intern, value or ()))
+
+    @property
+    def route_keys(self) -> array:
+        return self._route
+
+    @property
+    def timestamp(self) -> str:
+        return format_epoch(self.epoch)
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self.epoch = int(value) if isinstance(value, (int, float)) else parse_epoch(value)
+
+    def _field_values(self):
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def _metric_values(self):
+        return {name: getattr(self, name) for name in self.METRICS if hasattr(self, name)}
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._field_values() == other._field_values()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self.FIELDS, self._field_values()))
+        return f"Signal({fields})"
+
+    def __reduce__(self):
+        # Pickle node ids by name; interned keys are only valid in this process
+        values = list(self._field_values())
+        values[4] = self.epoch
+        values[9] = list(values[9])
+        return _restore_signal, (tuple(values), self._metric_values())
+
+
+def _restore_signal(values, metrics):
+    signal = Signal(*values)
+    for name, value in metrics.items():
+        setattr(signal, name, value)
+    return signal
@@ -1,11 +1,13 @@
-import requests
+import hashlib
 import os
 from dotenv import load_dotenv
-from datetime import datetime
-from src.model import Signal
+from datetime import datetime, timezone
+from src.model import Signal, parse_epoch
 
 load_dotenv()
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
+REQUEST_TIMEOUT = 30
 
 def estimate_entropy(text: str) -> float:
     length = len(text or "")
@@ -13,66 +15,89 @@ def estimate_entropy(text: str) -> float:
 
 def estimate_velocity(published_at: str) -> float:
     try:
-        time_diff = (datetime.utcnow() - datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ")).total_seconds() / 3600
-        return min(round(1.0 / (time_diff + 1), 2), 1.0)
+        return estimate_velocity_from_epoch(parse_epoch(published_at))
     except:
         return 0.0
 
-def collect_signals_from_news(topics: list, limit=10):
+def estimate_velocity_from_epoch(published_epoch: int) -> float:
+    time_diff = (datetime.now(timezone.utc).timestamp() - published_epoch) / 3600
+    return min(round(1.0 / (time_diff + 1), 2), 1.0)
+
+def fetch_news_topic(topic: str, limit=10, session=None, base_url=NEWSAPI_URL, cache=None):
+    """
+    Fetches one topic from NewsAPI and returns its signals. Raises on HTTP errors.
+    With a ResponseCache, fresh responses are reused and stale ones revalidated.
+    """
+    http = session
+    if http is None:
+        import requests
+        http = requests
+    params = {"q": topic, "pageSize": limit, "sortBy": "publishedAt", "apiKey": NEWSAPI_KEY}
+    if cache is not None:
+        response = cache.fetch(http, base_url, "news", params=params, timeout=REQUEST_TIMEOUT)
+    else:
+        response = http.get(base_url, params=params, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return signals_from_articles(topic, response.json().get("articles", []))
+
+def article_id(topic: str, article: dict) -> str:
+    """Stable id from the article URL (title and date without one), so ids do not collide between runs."""
+    raw = article.get("url") or f"{article.get('title')}|{article.get('publishedAt')}"
+    return f"{topic}_{hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]}"
+
+def signals_from_articles(topic: str, articles: list):
     signals = []
 
-    for topic in topics:
-        url = (
-            f"https://newsapi.org/v2/everything?"
-            f"q={topic}&pageSize={limit}&sortBy=publishedAt&apiKey={NEWSAPI_KEY}"
-        )
+    for article in articles:
+        published_at = article.get("publishedAt", "")
+        if not published_at:
+            continue
 
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            articles = response.json().get("articles", [])
-
-            for i, article in enumerate(articles):
-                published_at = article.get("publishedAt", "")
-                if not published_at:
-                    continue
-
-                try:
-                    timestamp = datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ")
-                except ValueError:
-                    continue
-
-                content = (article.get("description") or article.get("content") or "").strip()
-                title = (article.get("title") or "").strip()
-
-                if not content:
-                    continue  # skip empty signals
-
-                entropy = estimate_entropy(content)
-                velocity = estimate_velocity(published_at)
-
-                # Temporary route: only includes AI node as source
-                route = ["news_aggregator_ai"]
-
-                if len(route) < 2:
-                    print(f"⚠️ Incomplete route for signal {topic}_{i}. Downstream nodes missing. Skipping extra hops.")
-
-                signal = Signal(
-                    id=f"{topic}_{i}",
-                    content=content,
-                    title=title[:80],
-                    source="newsapi",
-                    timestamp=timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    entropy=entropy,
-                    velocity=velocity,
-                    impact=round(entropy + velocity, 2),
-                    node="news_aggregator_ai",
-                    route=route,
-                    subreddit=topic,  # reuse this field to track original topic
-                    is_recursive=False
-                )
-                signals.append(signal)
+            timestamp = parse_epoch(published_at)
+        except ValueError:
+            continue
+
+        content = (article.get("description") or article.get("content") or "").strip()
+        title = (article.get("title") or "").strip()
+
+        if not content:
+            continue  # skip empty signals
+
+        entropy = estimate_entropy(content)
+        velocity = estimate_velocity_from_epoch(timestamp)
+
+        # Temporary route: only includes AI node as source
+        route = ["news_aggregator_ai"]
+
+        signal_id = article_id(topic, article)
+        if len(route) < 2:
+            print(f"⚠️ Incomplete route for signal {signal_id}. Downstream nodes missing. Skipping extra hops.")
+
+        signal = Signal(
+            id=signal_id,
+            content=content,
+            title=title[:80],
+            source="newsapi",
+            timestamp=timestamp,
+            entropy=entropy,
+            velocity=velocity,
+            impact=round(entropy + velocity, 2),
+            node="news_aggregator_ai",
+            route=route,
+            subreddit=topic,  # reuse this field to track original topic
+            is_recursive=False
+        )
+        signals.append(signal)
+
+    return signals
 
+def collect_signals_from_news(topics: list, limit=10, session=None):
+    signals = []
+
+    for topic in topics:
+        try:
+            signals.extend(fetch_news_topic(topic, limit=limit, session=session))
         except Exception as e:
             print(f"❌ Error fetching for topic '{topic}': {e}")
 
@@ -0,0 +1,543 @@
+# src/pipeline.py
+
+import json
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional
+
+from src.stages import Stage, StageRunner
+
+# Heavy or optional dependencies (matplotlib, praw, tweepy, requests) are
+# imported inside the step that needs them, so importing this module and
+# running a plot-free or single-source pipeline stays cheap.
+
+
+@dataclass
+class PipelineConfig:
+    subreddits: List[str] = field(default_factory=list)
+    news_topics: List[str] = field(default_factory=list)
+    twitter_nodes: List[str] = field(default_factory=list)
+    reddit_limit: int = 20
+    news_limit: int = 10
+    twitter_limit: int = 10
+
+    use_response_cache: bool = True
+    response_cache_path: str = ".cache/http_responses.sqlite"
+    collect: bool = True  # False = analyze what the signal store already holds
+    signal_store_path: Optional[str] = ".cache/signals.sqlite"  # None = keep signals in memory only
+    analysis_scope: str = "collected"  # 'collected' (this run), 'new' (never stored before) or 'store'
+    store_sources: List[str] = field(default_factory=list)  # with analysis_scope 'store'; empty = all
+    store_since: Optional[str] = None  # timestamp or ISO date, inclusive
+    store_until: Optional[str] = None  # inclusive; a date alone covers that whole day
+    collapse_duplicates: bool = True  # merge near-duplicate stories across sources (MinHash/LSH)
+    duplicate_threshold: float = 0.5  # estimated Jaccard similarity of word shingles
+    text_feature_cache_path: Optional[str] = ".cache/text_features.sqlite"  # None = memoise within the run only
+    co_occurrence_path: str = "co_occurrence_store"
+    co_occurrence_engine: str = "sparse"  # word-bounded matches; 'loop' keeps the original substring counts
+
+    plots: bool = True
+    layout_cache_path: Optional[str] = ".cache/layout.json"  # None = fresh spring layout every run
+    approximate_centrality: bool = False
+    centrality_samples: Optional[int] = None
+    centrality_cache_dir: Optional[str] = None
+    graph_backend: str = "networkx"  # or "csr": vectorised centrality and SCC analytics (the DiGraph is still built)
+
+    max_loop_length: int = 8
+    max_loops: int = 1000
+    loop_time_budget: float = 10.0
+
+    export_formats: List[str] = field(default_factory=lambda: ["csv", "parquet"])
+    parquet_partition_by: Optional[str] = "date"  # 'date', 'source' or None
+    stream_timeline: bool = False  # write the timeline in chunks instead of returning it
+    propagation_model: str = "route"  # 'route' replays signal routes, 'cascade' spreads over the graph
+    cascade_probability_scale: float = 1.0
+    cascade_horizon: Optional[int] = None  # seconds after each signal's timestamp
+    cascade_seed: Optional[int] = 42  # seeds the cascade model's random draws; None = unseeded
+
+    use_stage_cache: bool = True
+    stage_cache_dir: str = ".cache/stages"
+    resume_from: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PipelineConfig":
+        known = {f.name for f in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown pipeline config keys: {sorted(unknown)}")
+        return cls(**data)
+
+    @classmethod
+    def from_file(cls, path: str) -> "PipelineConfig":
+        """Loads a JSON or TOML config file."""
+        if path.endswith(".toml"):
+            import tomllib
+            with open(path, "rb") as f:
+                return cls.from_dict(tomllib.load(f))
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+
+@dataclass
+class PipelineResult:
+    signals: list
+    graph: object = None
+    power_scores: Dict[str, float] = field(default_factory=dict)
+    timeline: list = field(default_factory=list)
+
+
+# === Steps ===
+
+def collect_signals(config: PipelineConfig) -> list:
+    """1-4. Collect from Reddit, Twitter and NewsAPI concurrently."""
+    from src.collector_runtime import CollectorRuntime, make_pooled_session, news_tasks, reddit_tasks, twitter_tasks
+
+    if not config.collect:
+        print("⏭️ Collection disabled. Analyzing stored signals.")
+        return []
+    if not config.subreddits:
+        print("⚠️ No subreddits provided. Skipping Reddit.")
+    if not config.twitter_nodes:
+        print("No Twitter nodes provided. Skipping Twitter collection.")
+
+    cache = None
+    if config.use_response_cache:
+        from src.http_cache import ResponseCache
+        cache = ResponseCache(config.response_cache_path)
+
+    session = None
+    try:
+        print("\n🔍 Collecting signals from Reddit, Twitter and NewsAPI...")
+        tasks = []
+        if config.subreddits:
+            tasks += reddit_tasks(config.subreddits, limit=config.reddit_limit, cache=cache)
+        if config.twitter_nodes:
+            tasks += twitter_tasks(config.twitter_nodes, limit=config.twitter_limit, cache=cache)
+        if config.news_topics:
+            session = make_pooled_session()
+            tasks += news_tasks(config.news_topics, limit=config.news_limit, session=session, cache=cache)
+
+        # ✅ Merge all (kept in Reddit, Twitter, News order)
+        signals = CollectorRuntime().collect(tasks)
+    finally:
+        if session is not None:
+            session.close()
+        if cache is not None:
+            cache.close()
+    print(f"✅ Total signals collected: {len(signals)}")
+    return signals
+
+
+ANALYSIS_SCOPES = ("collected", "new", "store")
+
+
+def store_signals(config: PipelineConfig, signals: list):
+    """
+    4a. Persist collected signals and choose the ones to analyze.
+    Returns (selected, new): new are the signals no earlier run stored.
+    """
+    from src.signal_store import SignalStore, unique_signals
+
+    if config.analysis_scope not in ANALYSIS_SCOPES:
+        raise ValueError(f"Unknown analysis scope '{config.analysis_scope}'")
+    if not config.signal_store_path:
+        if config.analysis_scope != "collected":
+            raise ValueError(f"analysis_scope '{config.analysis_scope}' needs a signal_store_path")
+        signals = unique_signals(signals)
+        return signals, signals
+
+    store = SignalStore(config.signal_store_path)
+    try:
+        new_signals = store.upsert(signals)
+        print(f"🗄️ Signal store: {len(new_signals)} new of {len(signals)} collected, {len(store)} stored")
+        if config.analysis_scope == "store":
+            selected = store.query(
+                sources=config.store_sources or None, since=config.store_since, until=config.store_until
+            )
+            print(f"✅ Loaded {len(selected)} signals from the store")
+        elif config.analysis_scope == "new":
+            selected = new_signals
+        else:
+            selected = unique_signals(signals)
+    finally:
+        store.close()
+    return selected, new_signals
+
+
+def collapse_near_duplicates(config: PipelineConfig, signals: list, new_signals: list):
+    """4b. Merge near-duplicate signals into one per narrative."""
+    if not config.collapse_duplicates:
+        return signals, new_signals
+    from src.dedup import collapse_duplicates
+
+    print("🧬 Collapsing near-duplicate signals...")
+    distinct = collapse_duplicates(signals, threshold=config.duplicate_threshold)
+    return distinct, collapse_duplicates(new_signals, threshold=config.duplicate_threshold)
+
+
+def extract_text_features(config: PipelineConfig, signals: list, new_signals: list, nodes):
+    """4c. Tokenise every text once for recursion, contradiction and entity features."""
+    from src.text_features import FeatureExtractor
+
+    extractor = FeatureExtractor(nodes, path=config.text_feature_cache_path)
+    try:
+        extractor.annotate(signals)
+        extractor.annotate(new_signals)
+        extractor.save()
+    finally:
+        extractor.close()
+    print(f"🔤 Text features: {extractor.analyzed} texts analyzed, {len(extractor.memo) - extractor.analyzed} memoised")
+    return signals, new_signals
+
+
+def update_co_occurrence(config: PipelineConfig, signals: list) -> dict:
+    """
+    4d. Track co-occurrence, accumulated across runs in co_occurrence_path.
+    co_occurrence_map.json is no longer rewritten; CoOccurrenceStore.export() writes it on demand.
+    """
+    from src.co_occurrence_store import CoOccurrenceStore
+
+    print("🔎 Tracking co-occurrence relationships...")
+    co_store = CoOccurrenceStore.open(config.co_occurrence_path, engine=config.co_occurrence_engine)
+    changed_rows = co_store.update(signals)
+    print(f"✅ Co-occurrence memory updated: {len(changed_rows)} rows changed, {len(co_store)} rows total")
+    return co_store.weighted_map()
+
+
+def enrich_routes(signals: list, memory: dict, nodes) -> list:
+    """4e. Auto-resolve missing or short routes."""
+    from src.co_occurrence import CoOccurrenceIndex
+    from src.graph_utils import RouteEnrichmentIndex, detect_cross_platform_bridges
+
+    print("🧠 Enriching routes using co-occurrence and platform memory...")
+    memory_index = CoOccurrenceIndex.from_map(memory)
+    enrichment = RouteEnrichmentIndex(*detect_cross_platform_bridges(signals, nodes))
+
+    for signal in enrichment.enrich(signals, memory_index):
+        if signal.route and len(signal.route) > 1:
+            print(f"⚙️ Final enriched route for {signal.id} → {signal.route}")
+        else:
+            print(f"❌ Still incomplete: {signal.id}")
+    return signals
+
+
+def build_influence_graph(signals: list, nodes):
+    """5. Build graph."""
+    from src.graph_utils import build_graph
+
+    graph = build_graph(nodes, signals)
+    print("✅ Influence graph constructed.")
+    print("📊 Nodes:", graph.nodes(data=True))
+    print("📊 Edges:", graph.edges(data=True))
+    return graph
+
+
+def detect_loops(graph, max_length=8, max_cycles=1000, time_budget=10.0, backend="networkx"):
+    """6. Detect feedback loops (bounded so dense clusters cannot stall the run)."""
+    from src.loop_utils import condensation_summary, find_cycles
+
+    if backend == "csr":
+        from src.csr_graph import CSRGraph
+        summary = CSRGraph.from_networkx(graph).condensation_summary()
+    else:
+        summary = condensation_summary(graph)
+    print(f"\n🧩 {summary['cyclic_components']} cyclic components, "
+          f"{summary['nodes_in_cycles']} of {summary['nodes']} nodes can sit on a loop")
+
+    report = find_cycles(graph, max_length=max_length, max_cycles=max_cycles, time_budget=time_budget)
+    print("\n🔁 Feedback loops detected:")
+    for loop in sorted(report.cycles, key=lambda l: l[0]):
+        print(" → ".join(loop))
+    if report.truncated:
+        print(f"⚠️ Loop listing stopped after {len(report.cycles)} cycles ({report.reason}).")
+    return report
+
+
+def analyze_recursion(signals: list) -> set:
+    """7. Recursion detection."""
+    from src.recursion_utils import analyze_recursions, detect_recursion
+
+    recursive_nodes = detect_recursion(signals)
+    analyze_recursions(signals)
+    return recursive_nodes
+
+
+def plot_graphs(config: PipelineConfig, graph, recursive_nodes):
+    """8. Graph visualizations."""
+    from src.graph_utils import visualize_graph, visualize_structured_graph
+    from src.layout_cache import LayoutCache
+
+    layout_cache = LayoutCache(config.layout_cache_path) if config.layout_cache_path else None
+    visualize_graph(graph, recursion_signals=recursive_nodes, layout_cache=layout_cache)
+    visualize_structured_graph(graph)
+
+
+def score_signals(config: PipelineConfig, graph, signals: list) -> Dict[str, float]:
+    """10. Power & narrative analysis."""
+    from src.graph_utils import PowerIndexCache, compute_power_index
+    from src.signal_batch import SignalBatch
+
+    cache = PowerIndexCache(config.centrality_cache_dir) if config.centrality_cache_dir else None
+    power_scores = compute_power_index(
+        graph,
+        approximate=config.approximate_centrality,
+        samples=config.centrality_samples,
+        cache=cache,
+        backend=config.graph_backend
+    )
+
+    # Drift and NSI as whole-column expressions (same formulas as graph_utils' per-signal versions)
+    batch = SignalBatch.from_signals(signals)
+    drift = batch.compute_truth_drift()
+    print("\nTruth Drift Report:")
+    for signal, drift_score, route_length in zip(signals, drift.tolist(), batch.route_length.tolist()):
+        print(f"- {signal.id}: Drift = {drift_score} | Entropy = {signal.entropy} | Route Length = {route_length}")
+    # ⚙️ Patch: Reassign Reddit signal source to actual final node in route
+    for i, signal in enumerate(signals):
+        if signal.source == "reddit" and signal.route and len(signal.route) > 1:
+            signal.source = signal.route[-1]
+            batch.set_source(i, signal.source)
+            print(f"🔄 Reassigned Reddit signal source: {signal.id} → {signal.source}")
+    nsi = batch.compute_narrative_stability_index(power_scores)
+    batch.assign_metrics(signals)
+    print("\nNarrative Stability Index (NSI):")
+    for signal, nsi_score in zip(signals, nsi.tolist()):
+        print(f"- {signal.id}: NSI = {nsi_score} | Source = {signal.source}")
+    return power_scores
+
+
+def plot_signal_charts(signals: list):
+    """9 + 11. Entropy trend and subreddit profile charts."""
+    from src.visual_stats import plot_entropy_over_time, plot_avg_entropy_by_subreddit, plot_avg_nsi_by_subreddit
+
+    plot_entropy_over_time(signals)
+    plot_avg_entropy_by_subreddit(signals)
+    plot_avg_nsi_by_subreddit(signals)
+
+
+def export_outputs(config: PipelineConfig, signals: list, graph, power_scores: Dict[str, float]):
+    """12. Export outputs."""
+    from src import export_utils
+    from src.signal_batch import SignalBatch
+
+    remove_deselected_exports(config, ("signals", "nodes"))
+    batch = SignalBatch.from_signals(signals)
+    if "csv" in config.export_formats:
+        export_utils.export_signals_to_csv(batch)
+        export_utils.export_nodes_to_csv(graph, power_scores)
+    if "parquet" in config.export_formats:
+        export_utils.export_signals_to_parquet(batch, partition_by=config.parquet_partition_by)
+        export_utils.export_nodes_to_parquet(graph, power_scores)
+    export_utils.export_signal_summary(
+        batch, exports=["signals" + EXPORT_EXTENSIONS[fmt] for fmt in config.export_formats]
+    )
+    export_utils.export_graph_to_json(graph)
+
+
+def simulate_and_export(config: PipelineConfig, signals: list, graph) -> list:
+    """13. Propagation simulation."""
+    from src import export_utils
+    from src.simulator import iter_timeline_chunks, simulate_propagation
+
+    if config.propagation_model not in ("route", "cascade"):
+        raise ValueError(f"Unknown propagation model '{config.propagation_model}'")
+    remove_deselected_exports(config, ("timeline",))
+    simulator = None
+    if config.propagation_model == "cascade":
+        from src.cascade import CascadeSimulator
+
+        simulator = CascadeSimulator(
+            graph, probability_scale=config.cascade_probability_scale,
+            horizon=config.cascade_horizon, seed=config.cascade_seed
+        )
+
+    if config.stream_timeline:
+        export_utils.write_timeline_chunks(
+            simulator.iter_chunks(signals) if simulator else iter_timeline_chunks(signals),
+            filename="timeline.csv" if "csv" in config.export_formats else None,
+            parquet_filename="timeline.parquet" if "parquet" in config.export_formats else None,
+        )
+        return []
+
+    if simulator:
+        from src.cascade import simulate_cascades
+        timeline = simulate_cascades(simulator, signals)
+    else:
+        timeline = simulate_propagation(signals)
+    if "csv" in config.export_formats:
+        export_utils.export_propagation_timeline(timeline)
+        print("✅ Propagation timeline exported to timeline.csv")
+    if "parquet" in config.export_formats:
+        export_utils.export_propagation_timeline_to_parquet(timeline)
+    return timeline
+
+
+EXPORT_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet"}
+
+
+def export_files(stems, extra=()):
+    """Stage file list for the configured export formats."""
+    return lambda config: [
+        stem + EXPORT_EXTENSIONS[fmt] for stem in stems for fmt in config.export_formats
+    ] + list(extra)
+
+
+def remove_deselected_exports(config, stems):
+    """
+    Deletes exports an earlier run wrote in a format not selected now, so
+    read_export (which prefers Parquet) never loads a stale file.
+    """
+    import os
+
+    for stem in stems:
+        for fmt, extension in EXPORT_EXTENSIONS.items():
+            if fmt not in config.export_formats and os.path.exists(stem + extension):
+                os.remove(stem + extension)
+                print(f"🗑️ Removed {stem + extension} left by an earlier {fmt} export")
+
+
+# === Stages ===
+
+def _enrich_stage(config, signals, memory, nodes):
+    return enrich_routes(signals, memory, nodes)
+
+
+def _recursion_stage(config, signals):
+    recursive_nodes = analyze_recursion(signals)
+    return signals, recursive_nodes
+
+
+def _score_stage(config, graph, signals):
+    power_scores = score_signals(config, graph, signals)
+    return signals, power_scores
+
+
+PIPELINE_STAGES = [
+    Stage(
+        "collect", lambda config: collect_signals(config),
+        outputs=("signals_collected",),
+        params=(
+            "collect", "subreddits", "news_topics", "twitter_nodes", "reddit_limit", "news_limit", "twitter_limit",
+        ),
+        volatile=True
+    ),
+    Stage(
+        # Volatile: what counts as new, and what a store query returns, depends on the database
+        "store", store_signals,
+        inputs=("signals_collected",), outputs=("signals_selected", "signals_new"),
+        params=("signal_store_path", "analysis_scope", "store_sources", "store_since", "store_until"),
+        modules=("src.signal_store",), volatile=True
+    ),
+    Stage(
+        "dedup", collapse_near_duplicates,
+        inputs=("signals_selected", "signals_new"), outputs=("signals_distinct", "signals_new_distinct"),
+        params=("collapse_duplicates", "duplicate_threshold"), modules=("src.dedup",)
+    ),
+    Stage(
+        "features", extract_text_features,
+        inputs=("signals_distinct", "signals_new_distinct", "nodes"), outputs=("signals_featured", "signals_new_featured"),
+        params=("text_feature_cache_path",),
+        modules=("src.text_features", "src.recursion_utils", "src.contradiction_utils", "src.co_occurrence")
+    ),
+    Stage(
+        # Only never-seen signals feed the accumulated memory, so recollected posts are not counted twice
+        "co_occurrence", update_co_occurrence,
+        inputs=("signals_new_featured",), outputs=("memory",),
+        params=("co_occurrence_path", "co_occurrence_engine"), modules=("src.co_occurrence", "src.co_occurrence_store")
+    ),
+    Stage(
+        "enrich", _enrich_stage,
+        inputs=("signals_featured", "memory", "nodes"), outputs=("signals_enriched",),
+        modules=("src.co_occurrence", "src.graph_utils")
+    ),
+    Stage(
+        "graph", lambda config, signals, nodes: build_influence_graph(signals, nodes),
+        inputs=("signals_enriched", "nodes"), outputs=("graph",),
+        modules=("src.graph_utils",)
+    ),
+    Stage(
+        "loops", lambda config, graph: detect_loops(
+            graph, config.max_loop_length, config.max_loops, config.loop_time_budget, config.graph_backend
+        ),
+        inputs=("graph",), outputs=("loop_report",),
+        params=("max_loop_length", "max_loops", "loop_time_budget", "graph_backend"),
+        modules=("src.loop_utils", "src.csr_graph")
+    ),
+    Stage(
+        "recursion", _recursion_stage,
+        inputs=("signals_enriched",), outputs=("signals_recursive", "recursive_nodes"),
+        modules=("src.recursion_utils",)
+    ),
+    Stage(
+        "plot_graphs", plot_graphs,
+        inputs=("graph", "recursive_nodes"), params=("layout_cache_path",),
+        modules=("src.graph_utils", "src.layout_cache"), files=("influence_graph.png", "influence_graph_structured.png"),
+        enabled=lambda config: config.plots
+    ),
+    Stage(
+        "score", _score_stage,
+        inputs=("graph", "signals_recursive"), outputs=("signals_scored", "power_scores"),
+        params=("approximate_centrality", "centrality_samples", "graph_backend"),
+        modules=("src.graph_utils", "src.csr_graph", "src.signal_batch")
+    ),
+    Stage(
+        "plot_charts", lambda config, signals: plot_signal_charts(signals),
+        inputs=("signals_scored",),
+        modules=("src.visual_stats",),
+        files=("entropy_over_time.png", "avg_entropy_by_subreddit.png", "avg_nsi_by_subreddit.png"),
+        enabled=lambda config: config.plots
+    ),
+    Stage(
+        "export", export_outputs,
+        inputs=("signals_scored", "graph", "power_scores"),
+        params=("export_formats", "parquet_partition_by"),
+        modules=("src.export_utils", "src.signal_batch"), files=export_files(("signals", "nodes"), extra=("signals_summary.json", "graph.json"))
+    ),
+    Stage(
+        "simulate", simulate_and_export,
+        inputs=("signals_scored", "graph"), outputs=("timeline",),
+        params=(
+            "export_formats", "stream_timeline", "propagation_model",
+            "cascade_probability_scale", "cascade_horizon", "cascade_seed",
+        ),
+        modules=("src.simulator", "src.cascade", "src.export_utils"), files=export_files(("timeline",))
+    ),
+]
+
+STAGE_NAMES = [stage.name for stage in PIPELINE_STAGES]
+
+
+# === Entry point ===
+
+def run_pipeline(config: PipelineConfig, nodes=None) -> PipelineResult:
+    """
+    Runs the full analysis without prompting; all inputs come from config.
+    Stages whose inputs are unchanged since the last run are restored from
+    the stage cache instead of recomputed.
+    """
+    if nodes is None:
+        from src.seed_nodes import seed_nodes as nodes
+
+    runner = StageRunner(
+        config,
+        directory=config.stage_cache_dir,
+        enabled=config.use_stage_cache,
+        resume_from=config.resume_from,
+        stage_names=STAGE_NAMES
+    )
+    runner.provide("nodes", nodes)
+
+    for stage in PIPELINE_STAGES:
+        outputs = runner.run(stage)
+        if stage.name == "store" and not outputs["signals_selected"]:
+            if config.analysis_scope == "new":
+                print("✅ No new signals since the last run. Nothing to analyze.")
+            else:
+                print("❌ No signals to analyze. Exiting.")
+            return PipelineResult(signals=[])
+
+    artifacts = runner.artifacts
+    return PipelineResult(
+        signals=artifacts["signals_scored"],
+        graph=artifacts["graph"],
+        power_scores=artifacts["power_scores"],
+        timeline=artifacts["timeline"]
+    )
@@ -18,13 +18,18 @@ def assign_recursive_depth(signal: Signal):
     Assigns a recursive depth score to a signal.
     - 0: original content (no platform mentions)
     - 1+: self-referential or meta-level reaction detected
+    Uses the precomputed signal.features when text_features has run.
     """
-    depth = 0
-    text = signal.content.lower()
+    features = getattr(signal, "features", None)
+    if features is not None:
+        depth = features.recursive_depth
+    else:
+        depth = 0
+        text = signal.content.lower()
 
-    for keyword in PLATFORM_KEYWORDS:
-        if keyword in text:
-            depth += 1
+        for keyword in PLATFORM_KEYWORDS:
+            if keyword in text:
+                depth += 1
 
     signal.recursive_depth = depth
     signal.is_recursive = depth > 0
@@ -0,0 +1,235 @@
+# src/signal_batch.py
+
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+from src.model import Signal, MISSING_EPOCH
+
+# Derived metrics that pipeline stages attach to Signal instances
+METRIC_FIELDS = Signal.METRICS
+# Held as float64 columns (NaN = never computed); any other metric is an object column (None = unset)
+FLOAT_METRIC_FIELDS = ("drift_score", "nsi_score", "recursion_score", "power_index")
+OBJECT_METRIC_FIELDS = tuple(name for name in METRIC_FIELDS if name not in FLOAT_METRIC_FIELDS)
+
+
+@dataclass
+class SignalBatch:
+    """
+    Struct-of-arrays view of a list of signals.
+
+    Text and identity fields stay as object columns; every numeric field is a
+    NumPy column so drift and NSI are computed as whole column
+    expressions. Metrics a signal never had are NaN (None in
+    object_metrics) and are not set back on conversion.
+    """
+    id: np.ndarray
+    title: np.ndarray
+    content: np.ndarray
+    source: np.ndarray
+    subreddit: np.ndarray
+    node: np.ndarray
+    seed_node: np.ndarray
+    route: np.ndarray
+
+    entropy: np.ndarray
+    velocity: np.ndarray
+    impact: np.ndarray
+    route_length: np.ndarray
+    timestamp: np.ndarray
+    source_code: np.ndarray
+    is_recursive: np.ndarray
+    recursive_depth: np.ndarray
+
+    drift_score: np.ndarray
+    nsi_score: np.ndarray
+    recursion_score: np.ndarray
+    power_index: np.ndarray
+
+    sources: List[str]
+    object_metrics: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self):
+        return len(self.id)
+
+    def metric(self, name: str) -> np.ndarray:
+        """Object metric column by name; all None when the batch was built without it."""
+        column = self.object_metrics.get(name)
+        if column is None:
+            column = np.full(len(self), None, dtype=object)
+        return column
+
+    # --- conversion ---
+
+    @classmethod
+    def from_signals(cls, signals: List[Signal]) -> "SignalBatch":
+        def objects(values):
+            column = np.empty(len(signals), dtype=object)
+            column[:] = values
+            return column
+
+        def metric(name):
+            return np.array([getattr(s, name, math.nan) for s in signals], dtype=np.float64)
+
+        sources = list(dict.fromkeys(s.source for s in signals))
+        source_codes = {source: code for code, source in enumerate(sources)}
+        routes = [list(s.route or []) for s in signals]
+
+        return cls(
+            id=objects([s.id for s in signals]),
+            title=objects([s.title for s in signals]),
+            content=objects([s.content for s in signals]),
+            source=objects([s.source for s in signals]),
+            subreddit=objects([s.subreddit for s in signals]),
+            node=objects([s.node for s in signals]),
+            seed_node=objects([s.seed_node for s in signals]),
+            route=objects(routes),
+            entropy=np.array([s.entropy for s in signals], dtype=np.float64),
+            velocity=np.array([s.velocity for s in signals], dtype=np.float64),
+            impact=np.array([s.impact for s in signals], dtype=np.float64),
+            route_length=np.array([len(r) for r in routes], dtype=np.int32),
+            timestamp=np.array([s.epoch for s in signals], dtype=np.int64),
+            source_code=np.array([source_codes[s.source] for s in signals], dtype=np.int32),
+            is_recursive=np.array([s.is_recursive for s in signals], dtype=bool),
+            recursive_depth=np.array([s.recursive_depth for s in signals], dtype=np.int32),
+            **{name: metric(name) for name in FLOAT_METRIC_FIELDS},
+            sources=sources,
+            object_metrics={name: objects([getattr(s, name, None) for s in signals]) for name in OBJECT_METRIC_FIELDS},
+        )
+
+    def to_signals(self) -> List[Signal]:
+        signals = []
+        for i in range(len(self)):
+            signal = Signal(
+                id=self.id[i],
+                content=self.content[i],
+                title=self.title[i],
+                source=self.source[i],
+                timestamp=int(self.timestamp[i]),
+                entropy=float(self.entropy[i]),
+                velocity=float(self.velocity[i]),
+                impact=float(self.impact[i]),
+                node=self.node[i],
+                route=list(self.route[i]),
+                subreddit=self.subreddit[i],
+                is_recursive=bool(self.is_recursive[i]),
+                recursive_depth=int(self.recursive_depth[i]),
+                seed_node=self.seed_node[i],
+            )
+            signals.append(signal)
+        self.assign_metrics(signals)
+        return signals
+
+    def assign_metrics(self, signals: List[Signal]):
+        """Writes the derived metric columns back onto matching Signal objects."""
+        for name in FLOAT_METRIC_FIELDS:
+            column = getattr(self, name)
+            for signal, value in zip(signals, column.tolist()):
+                if not math.isnan(value):
+                    setattr(signal, name, value)
+        for name, column in self.object_metrics.items():
+            for signal, value in zip(signals, column):
+                if value is not None:
+                    setattr(signal, name, value)
+
+    # --- vectorized metrics ---
+
+    def compute_truth_drift(self) -> np.ndarray:
+        """Same formula as graph_utils.calculate_truth_drift."""
+        self.drift_score = np.round(self.entropy * (self.route_length - 1) * self.velocity, 4)
+        return self.drift_score
+
+    def compute_narrative_stability_index(self, power_scores: Dict[str, float]) -> np.ndarray:
+        """Same formula as graph_utils.compute_narrative_stability_index."""
+        if np.isnan(self.drift_score).any():
+            self.compute_truth_drift()
+        source_power = np.array([power_scores.get(source, 0.0) for source in self.sources], dtype=np.float64)
+        entropy_term = 1 - self.entropy
+        drift_term = 1 / (1 + self.drift_score)
+        power_term = source_power[self.source_code] if len(source_power) else np.zeros(len(self))
+        self.nsi_score = np.round(entropy_term * drift_term * power_term * 10, 4)
+        return self.nsi_score
+
+    def set_source(self, index: int, source: str):
+        """Reassigns one signal's source, keeping source_code consistent."""
+        if source not in self.sources:
+            self.sources.append(source)
+        self.source[index] = source
+        self.source_code[index] = self.sources.index(source)
+
+    # --- export ---
+
+    def export_columns(self) -> Dict[str, list]:
+        """Columns in the layout of export_utils.export_signals_to_csv."""
+        def metric(column):
+            return np.round(np.nan_to_num(column, nan=0.0), 4).tolist()
+
+        return {
+            "id": self.id.tolist(),
+            "title": self.title.tolist(),
+            "subreddit": self.subreddit.tolist(),
+            "source": self.source.tolist(),
+            "entropy": np.round(self.entropy, 4).tolist(),
+            "velocity": np.round(self.velocity, 4).tolist(),
+            "impact": np.round(self.impact, 4).tolist(),
+            "route": [" → ".join(route) for route in self.route],
+            "route_length": self.route_length.tolist(),
+            "drift_score": metric(self.drift_score),
+            "nsi_score": metric(self.nsi_score),
+            "recursion_score": metric(self.recursion_score),
+            "recursive_depth": self.recursive_depth.tolist(),
+            "power_index": metric(self.power_index),
+            "seed_node": self.seed_node.tolist(),
+            # JSON, empty for signals that absorbed no near-duplicates
+            "duplicate_ids": [json.dumps(list(ids)) if ids is not None else "" for ids in self.metric("duplicate_ids")],
+            "source_counts": [
+                json.dumps(counts, sort_keys=True) if counts is not None else "" for counts in self.metric("source_counts")
+            ],
+        }
+
+
+    def to_arrow(self):
+        """
+        Typed Arrow table of the export columns: float32 metrics, list<string>
+        routes and duplicate ids, a source -> count map and a UTC timestamp
+        column. Metrics that were never computed
+        and missing timestamps become nulls instead of 0.0 / "".
+        """
+        import pyarrow as pa
+
+        def text(column):
+            return pa.array(column.tolist(), type=pa.string())
+
+        def float32(column):
+            return pa.array(column.astype(np.float32), mask=np.isnan(column))
+
+        timestamp = pa.array(self.timestamp, type=pa.int64(), mask=self.timestamp == MISSING_EPOCH)
+        return pa.table({
+            "id": text(self.id),
+            "title": text(self.title),
+            "subreddit": text(self.subreddit),
+            "source": text(self.source),
+            "timestamp": timestamp.cast(pa.timestamp("s", tz="UTC")),
+            "entropy": float32(self.entropy),
+            "velocity": float32(self.velocity),
+            "impact": float32(self.impact),
+            "route": pa.array(self.route.tolist(), type=pa.list_(pa.string())),
+            "route_length": pa.array(self.route_length, type=pa.int32()),
+            "drift_score": float32(self.drift_score),
+            "nsi_score": float32(self.nsi_score),
+            "recursion_score": float32(self.recursion_score),
+            "recursive_depth": pa.array(self.recursive_depth, type=pa.int32()),
+            "power_index": float32(self.power_index),
+            "seed_node": text(self.seed_node),
+            "duplicate_ids": pa.array(
+                [list(ids) if ids is not None else None for ids in self.metric("duplicate_ids")],
+                type=pa.list_(pa.string())
+            ),
+            "source_counts": pa.array(
+                [sorted(counts.items()) if counts is not None else None for counts in self.metric("source_counts")],
+                type=pa.map_(pa.string(), pa.int32())
+            ),
+        })
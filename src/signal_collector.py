@@ -1,4 +1,3 @@
-import praw
 from datetime import datetime
 from typing import List
 from src.model import Signal
@@ -61,41 +60,70 @@ def match_route(post_title: str, subreddit: str) -> List[str]:
     # No downstream node matched
     return route  # Only 2 hops: reddit_thread → user_1
 
-def collect_signals_from_reddit(subreddits: List[str], limit=5) -> List[Signal]:
-    reddit = praw.Reddit(
+def make_reddit_client():
+    import praw
+    return praw.Reddit(
         client_id=REDDIT_CLIENT_ID,
         client_secret=REDDIT_CLIENT_SECRET,
         user_agent=REDDIT_USER_AGENT
     )
 
+def collect_signals_from_reddit(subreddits: List[str], limit=5) -> List[Signal]:
+    reddit = make_reddit_client()
+
     signals = []
 
     for subreddit in subreddits:
-        posts = reddit.subreddit(subreddit).hot(limit=limit)
-        for post in posts:
-            hours_old = (datetime.utcnow() - datetime.utcfromtimestamp(post.created_utc)).total_seconds() / 3600
-            entropy = estimate_entropy(post.score, post.num_comments)
-            velocity = estimate_velocity(post.score, hours_old)
-            title = post.title
-            route = match_route(title, subreddit)
-
-            if len(route) < 4:
-                print(f"⚠️ Incomplete route for Reddit signal {subreddit}_{post.id}. Skipping downstream hops.")
-
-            signal = Signal(
-                id=f"{subreddit}_{post.id}",
-                content=title,
-                title=title,
-                source="reddit",
-                timestamp=datetime.utcfromtimestamp(post.created_utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-                entropy=entropy,
-                velocity=velocity,
-                impact=round(min(1.0, (post.upvote_ratio or 0.8)), 2),
-                route=route,
-                node="reddit_thread",
-                subreddit=subreddit,
-                is_recursive=False
-            )
-            signals.append(signal)
+        signals.extend(fetch_subreddit_signals(reddit, subreddit, limit=limit))
+
+    return signals
+
+def post_record(post) -> dict:
+    """The fields we use from a praw submission, as plain JSON-friendly data."""
+    return {
+        "id": post.id,
+        "title": post.title,
+        "score": post.score,
+        "num_comments": post.num_comments,
+        "created_utc": post.created_utc,
+        "upvote_ratio": post.upvote_ratio,
+    }
+
+def fetch_subreddit_signals(reddit, subreddit: str, limit=5, cache=None) -> List[Signal]:
+    """
+    Fetches the hot posts of one subreddit as signals. With a ResponseCache,
+    the post listing is reused while it is younger than the Reddit TTL.
+    """
+    def fetch_posts():
+        return [post_record(post) for post in reddit.subreddit(subreddit).hot(limit=limit)]
+
+    posts = cache.memoize("reddit", ["hot", subreddit, limit], fetch_posts) if cache is not None else fetch_posts()
+
+    signals = []
+    for post in posts:
+        hours_old = (datetime.utcnow() - datetime.utcfromtimestamp(post["created_utc"])).total_seconds() / 3600
+        entropy = estimate_entropy(post["score"], post["num_comments"])
+        velocity = estimate_velocity(post["score"], hours_old)
+        title = post["title"]
+        route = match_route(title, subreddit)
+
+        if len(route) < 4:
+            print(f"⚠️ Incomplete route for Reddit signal {subreddit}_{post['id']}. Skipping downstream hops.")
+
+        signal = Signal(
+            id=f"{subreddit}_{post['id']}",
+            content=title,
+            title=title,
+            source="reddit",
+            timestamp=int(post["created_utc"]),
+            entropy=entropy,
+            velocity=velocity,
+            impact=round(min(1.0, (post["upvote_ratio"] or 0.8)), 2),
+            route=route,
+            node="reddit_thread",
+            subreddit=subreddit,
+            is_recursive=False
+        )
+        signals.append(signal)
 
     return signals
\ No newline at end of file
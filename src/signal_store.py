@@ -0,0 +1,219 @@
+# src/signal_store.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, time as day_time, timezone
+from typing import Iterable, List, Optional, Sequence, Union
+
+from src.model import Signal, parse_epoch
+
+KEY_BATCH = 500  # keys per IN (...) lookup, below SQLite's bound-parameter limit
+
+COLUMNS = (
+    "key", "id", "source", "epoch", "subreddit", "seed_node", "node", "title", "content",
+    "entropy", "velocity", "impact", "route", "is_recursive", "recursive_depth", "metrics",
+    "first_seen", "last_seen",
+)
+# Refreshed when a stored signal is collected again; its identity and first_seen stay
+UPDATED_COLUMNS = (
+    "entropy", "velocity", "impact", "node", "route", "is_recursive", "recursive_depth", "seed_node",
+    "metrics", "last_seen",
+)
+INDEXED_COLUMNS = ("source", "epoch", "subreddit", "seed_node")
+UNSTORED_METRICS = ("features",)  # derived from the text again (and memoised) by text_features
+
+
+def signal_key(signal: Signal) -> str:
+    """
+    Content-derived primary key: the same post or article hashes the same in
+    every run, whatever id the collector gave it.
+    """
+    raw = json.dumps([signal.source, signal.title, signal.content, signal.epoch], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def unique_signals(signals: Iterable[Signal]) -> List[Signal]:
+    """First signal per content key, in collection order."""
+    seen = set()
+    unique = []
+    for signal in signals:
+        key = signal_key(signal)
+        if key not in seen:
+            seen.add(key)
+            unique.append(signal)
+    return unique
+
+
+def as_epoch(value: Union[str, int, None], end_of_day: bool = False) -> Optional[int]:
+    """
+    Epoch seconds from an int, a collector timestamp or an ISO date
+    ('2025-01-31'). A date alone is midnight UTC, or its last second with
+    end_of_day, so an inclusive upper bound covers the whole day.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return parse_epoch(value)
+    except ValueError:
+        try:
+            day = date.fromisoformat(value)
+        except ValueError:
+            day = None
+        if day is not None:
+            parsed = datetime.combine(day, day_time.max if end_of_day else day_time.min, tzinfo=timezone.utc)
+            return int(parsed.timestamp())
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+
+
+class SignalStore:
+    """
+    Every signal ever collected, in one SQLite file.
+
+    Rows are keyed by signal_key(), so collecting the same post twice
+    updates one row instead of adding another. upsert() writes a batch in a
+    single transaction and returns the signals that were not stored before;
+    query() reads signals back by source, topic, seed node and time range
+    through the indexes on those columns.
+    """
+
+    def __init__(self, path=".cache/signals.sqlite"):
+        self.path = path
+        self.lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS signals (
+                key TEXT PRIMARY KEY,
+                id TEXT,
+                source TEXT,
+                epoch INTEGER,
+                subreddit TEXT,
+                seed_node TEXT,
+                node TEXT,
+                title TEXT,
+                content TEXT,
+                entropy REAL,
+                velocity REAL,
+                impact REAL,
+                route TEXT,
+                is_recursive INTEGER,
+                recursive_depth INTEGER,
+                metrics TEXT,
+                first_seen REAL,
+                last_seen REAL
+            )
+        """)
+        for column in INDEXED_COLUMNS:
+            self.db.execute(f"CREATE INDEX IF NOT EXISTS signals_{column} ON signals ({column})")
+        self.db.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM signals").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+    # --- writes ---
+
+    def _existing_keys(self, keys: Sequence[str]) -> set:
+        existing = set()
+        for start in range(0, len(keys), KEY_BATCH):
+            batch = keys[start:start + KEY_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            rows = self.db.execute(f"SELECT key FROM signals WHERE key IN ({placeholders})", batch)
+            existing.update(key for key, in rows)
+        return existing
+
+    def upsert(self, signals: Iterable[Signal]) -> List[Signal]:
+        """
+        Inserts new signals and refreshes the measures of known ones, all in
+        one transaction. Returns the signals not stored before, first
+        occurrence per key.
+        """
+        now = time.time()
+        rows = {}
+        for signal in signals:
+            key = signal_key(signal)
+            if key not in rows:
+                rows[key] = (signal, _row(key, signal, now))
+
+        keys = list(rows)
+        assignments = ", ".join(f"{column} = excluded.{column}" for column in UPDATED_COLUMNS)
+        with self.lock:
+            existing = self._existing_keys(keys)
+            with self.db:
+                self.db.executemany(
+                    f"INSERT INTO signals ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+                    f"ON CONFLICT(key) DO UPDATE SET {assignments}",
+                    (row for _, row in rows.values())
+                )
+        return [signal for key, (signal, _) in rows.items() if key not in existing]
+
+    # --- reads ---
+
+    def query(self, sources: Optional[Sequence[str]] = None, since=None, until=None,
+              subreddits: Optional[Sequence[str]] = None, seed_nodes: Optional[Sequence[str]] = None,
+              limit: Optional[int] = None) -> List[Signal]:
+        """
+        Stored signals matching every given filter, oldest first. since and
+        until are inclusive bounds (epoch seconds, timestamps or dates; an
+        until date includes that whole day); subreddits also matches news
+        topics.
+        """
+        clauses, params = [], []
+        for column, values in (("source", sources), ("subreddit", subreddits), ("seed_node", seed_nodes)):
+            if values:
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if since is not None:
+            clauses.append("epoch >= ?")
+            params.append(as_epoch(since))
+        if until is not None:
+            clauses.append("epoch <= ?")
+            params.append(as_epoch(until, end_of_day=True))
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM signals"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY epoch, key"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self.lock:
+            rows = self.db.execute(sql, params).fetchall()
+        return [_signal(row) for row in rows]
+
+
+def _row(key, signal: Signal, now) -> tuple:
+    metrics = {name: value for name, value in signal._metric_values().items() if name not in UNSTORED_METRICS}
+    return (
+        key, signal.id, signal.source, signal.epoch, signal.subreddit, signal.seed_node, signal.node,
+        signal.title, signal.content, signal.entropy, signal.velocity, signal.impact,
+        json.dumps(list(signal.route)), int(bool(signal.is_recursive)), signal.recursive_depth,
+        json.dumps(metrics, default=float), now, now,
+    )
+
+
+def _signal(row) -> Signal:
+    values = dict(zip(COLUMNS, row))
+    signal = Signal(
+        id=values["id"], content=values["content"], title=values["title"], source=values["source"],
+        timestamp=values["epoch"], entropy=values["entropy"], velocity=values["velocity"],
+        impact=values["impact"], node=values["node"], route=json.loads(values["route"]),
+        subreddit=values["subreddit"], is_recursive=bool(values["is_recursive"]),
+        recursive_depth=values["recursive_depth"], seed_node=values["seed_node"],
+    )
+    for name, value in json.loads(values["metrics"]).items():
+        setattr(signal, name, value)
+    return signal
@@ -1,22 +1,70 @@
-from datetime import datetime, timedelta
-from typing import List, Dict
-from src.model import Signal
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+
+from src.model import Signal, MISSING_EPOCH
+
+TIMELINE_FIELDS = ["signal_id", "node", "arrival_time"]
+TIMELINE_CHUNK_SIGNALS = 50_000
+
+
+def delay_factors(velocity: np.ndarray, entropy: np.ndarray) -> np.ndarray:
+    """Per-hop delay multiplier of a signal or edge; floored so no hop is instant or negative."""
+    return np.maximum(0.1, (1.0 - velocity + entropy) / 2.0)
+
+
+def iter_timeline_chunks(signals: Iterable[Signal], chunk_size: int = TIMELINE_CHUNK_SIGNALS) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yields the propagation timeline as column chunks covering chunk_size
+    signals each: signal_id and node object arrays, and arrival_time as int64
+    epoch seconds (MISSING_EPOCH for signals without a timestamp). Only one
+    chunk is held at a time, so signals may itself be a generator.
+    """
+    signals = iter(signals)
+    while True:
+        chunk = list(islice(signals, chunk_size))
+        if not chunk:
+            return
+
+        lengths = np.fromiter((len(s.route) for s in chunk), dtype=np.int64, count=len(chunk))
+        velocity = np.fromiter((s.velocity for s in chunk), dtype=np.float64, count=len(chunk))
+        entropy = np.fromiter((s.entropy for s in chunk), dtype=np.float64, count=len(chunk))
+        base_time = np.fromiter((s.epoch for s in chunk), dtype=np.int64, count=len(chunk))
+        delay_factor = delay_factors(velocity, entropy)
+
+        # Hop index within each route: 0, 1, ... restarting at every signal
+        starts = np.cumsum(lengths) - lengths
+        hop = np.arange(int(lengths.sum()), dtype=np.int64) - np.repeat(starts, lengths)
+        delay = (hop * 30 * np.repeat(delay_factor, lengths)).astype(np.int64)
+        base_time = np.repeat(base_time, lengths)
+        arrival = np.where(base_time == MISSING_EPOCH, MISSING_EPOCH, base_time + delay)
+
+        ids = np.empty(len(chunk), dtype=object)
+        ids[:] = [s.id for s in chunk]
+        nodes = np.empty(len(hop), dtype=object)
+        nodes[:] = list(chain.from_iterable(s.route for s in chunk))
+        yield {"signal_id": np.repeat(ids, lengths), "node": nodes, "arrival_time": arrival}
+
+
+def format_epochs(epochs: np.ndarray) -> List[str]:
+    """Vectorized model.format_epoch; missing epochs become empty strings."""
+    epochs = np.asarray(epochs, dtype=np.int64)
+    text = np.datetime_as_string(epochs.astype("datetime64[s]"), unit="s")
+    return [value + "Z" if value != "NaT" else "" for value in text.tolist()]
+
 
 def simulate_propagation(signals: List[Signal]) -> List[Dict]:
     timeline = []
 
-    for signal in signals:
-        base_time = datetime.strptime(signal.timestamp, "%Y-%m-%dT%H:%M:%SZ")
-        delay_factor = (1.0 - signal.velocity + signal.entropy) / 2.0
-        delay_factor = max(0.1, delay_factor)  # prevent zero or negative delays
-
-        for i, node in enumerate(signal.route):
-            delay = timedelta(seconds=int(i * 30 * delay_factor))
-            arrival = base_time + delay
+    for chunk in iter_timeline_chunks(signals):
+        for signal_id, node, arrival_time in zip(
+            chunk["signal_id"].tolist(), chunk["node"].tolist(), format_epochs(chunk["arrival_time"])
+        ):
             timeline.append({
-                "signal_id": signal.id,
+                "signal_id": signal_id,
                 "node": node,
-                "arrival_time": arrival.strftime("%Y-%m-%dT%H:%M:%SZ")
+                "arrival_time": arrival_time
             })
 
     return timeline
\ No newline at end of file
@@ -0,0 +1,296 @@
+# src/stages.py
+
+import ast
+import dataclasses
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import networkx as nx
+
+from src.model import Signal
+
+PICKLE_PROTOCOL = 5
+LOCAL_PACKAGES = ("src",)  # imports of these packages are followed when hashing stage code
+
+
+@dataclass
+class Stage:
+    """
+    One named pipeline step.
+
+    run(config, *inputs) receives the declared input artifacts in order and
+    returns the single output, a tuple of outputs, or None when the stage
+    only writes files. params lists the config fields the result depends on,
+    modules the source files whose edits invalidate it (together with every
+    src module they import, and the module defining run), and files the output
+    files that must still exist for a cached result to count (a tuple, or a
+    callable taking the config). Volatile stages
+    (collection) always run unless an explicit resume skips past them.
+    """
+    name: str
+    run: Callable
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    params: Tuple[str, ...] = ()
+    modules: Tuple[str, ...] = ()
+    files: Union[Tuple[str, ...], Callable] = ()
+    volatile: bool = False
+    enabled: Optional[Callable] = None
+
+
+def _canonical(value):
+    """Order-stable structure for hashing (set order varies between processes)."""
+    if isinstance(value, Signal):
+        restore, args = value.__reduce__()
+        return ("Signal", _canonical(args))
+    if isinstance(value, nx.Graph):
+        return (
+            type(value).__name__,
+            [(node, _canonical(data)) for node, data in value.nodes(data=True)],
+            [(u, v, _canonical(data)) for u, v, data in value.edges(data=True)],
+        )
+    if isinstance(value, dict):
+        return ("dict", [(_canonical(k), _canonical(v)) for k, v in value.items()])
+    if isinstance(value, (set, frozenset)):
+        return ("set", sorted((_canonical(item) for item in value), key=repr))
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return (type(value).__name__, _canonical(dataclasses.asdict(value)))
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return value
+
+
+def content_hash(value) -> str:
+    return hashlib.sha256(pickle.dumps(_canonical(value), protocol=PICKLE_PROTOCOL)).hexdigest()
+
+
+_sources: Dict[str, tuple] = {}  # path -> (mtime_ns, size, digest, imported module names)
+
+
+def _module_path(module_name: str) -> Optional[str]:
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not os.path.exists(spec.origin):
+        return None
+    return spec.origin
+
+
+def _read_source(path: str):
+    """(digest, imported names) of a source file, reparsed only when it changes."""
+    stat = os.stat(path)
+    cached = _sources.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2:]
+    with open(path, "rb") as f:
+        source = f.read()
+    # Walk the whole tree: most imports here are local to the function that needs them
+    imported = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            imported.add(node.module)
+            if node.module in LOCAL_PACKAGES:
+                imported.update(f"{node.module}.{alias.name}" for alias in node.names)
+    digest = hashlib.sha256(source).hexdigest()
+    _sources[path] = (stat.st_mtime_ns, stat.st_size, digest, sorted(imported))
+    return digest, sorted(imported)
+
+
+def module_closure(module_name: str) -> List[str]:
+    """The module and every LOCAL_PACKAGES module it imports, directly or not, sorted."""
+    seen, pending = set(), [module_name]
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        path = _module_path(name)
+        if path is None:
+            continue
+        _, imported = _read_source(path)
+        pending.extend(i for i in imported if i.split(".")[0] in LOCAL_PACKAGES and i not in seen)
+    return sorted(name for name in seen if _module_path(name) is not None)
+
+
+def module_hash(module_name: str) -> str:
+    """
+    Hash of a module's source file and of every src module it imports,
+    read without importing them, so an edit to a shared helper invalidates
+    each stage that reaches it.
+    """
+    closure = module_closure(module_name)
+    if not closure:
+        return ""
+    digest = hashlib.sha256()
+    for name in closure:
+        digest.update(f"{name}:{_read_source(_module_path(name))[0]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class StageRunner:
+    """
+    Runs stages with outputs cached on disk under a hash of their inputs.
+
+    Every artifact gets a content hash when it is produced. A stage's key
+    combines its name, its parameter values, the source of its modules and
+    the hashes of its input artifacts, so a stage is skipped exactly when
+    nothing it reads has changed, and an upstream stage that reruns but
+    produces identical output does not invalidate anything downstream.
+
+    Cached outputs are pickled to <directory>/<stage>.pkl and described in
+    manifest.json. With resume_from, stages before that one reuse their last
+    cached outputs unconditionally and that stage and all later ones rerun.
+    """
+
+    def __init__(self, config, directory=".cache/stages", enabled=True, resume_from=None, stage_names=()):
+        self.config = config
+        self.directory = directory
+        self.enabled = enabled
+        self.resume_from = resume_from
+        self.stage_names = list(stage_names)
+        if resume_from is not None and resume_from not in self.stage_names:
+            raise ValueError(f"Unknown stage '{resume_from}'. Stages: {', '.join(self.stage_names)}")
+
+        self.artifacts: Dict[str, object] = {}
+        self.hashes: Dict[str, str] = {}
+        self.manifest = self._load_manifest() if enabled else {}
+        self.resuming = resume_from is not None
+
+    # --- manifest ---
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, "manifest.json")
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, "r") as f:
+            return json.load(f)
+
+    def _save_manifest(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _output_path(self, stage: Stage):
+        return os.path.join(self.directory, f"{stage.name}.pkl")
+
+    # --- artifacts ---
+
+    def provide(self, name, value):
+        """Seeds an artifact that no stage produces (e.g. the seed node list)."""
+        self.artifacts[name] = value
+        self.hashes[name] = content_hash(value)
+
+    def stage_files(self, stage: Stage):
+        return stage.files(self.config) if callable(stage.files) else stage.files
+
+    def stage_modules(self, stage: Stage) -> List[str]:
+        """Declared modules plus the one defining stage.run (a lambda's helpers live there)."""
+        modules = list(stage.modules)
+        defining = getattr(stage.run, "__module__", None)
+        if defining and defining not in modules:
+            modules.append(defining)
+        return modules
+
+    def stage_key(self, stage: Stage) -> str:
+        parts = {
+            "stage": stage.name,
+            "params": {name: getattr(self.config, name) for name in stage.params},
+            "modules": {name: module_hash(name) for name in self.stage_modules(stage)},
+            "inputs": {name: self.hashes[name] for name in stage.inputs},
+        }
+        raw = json.dumps(parts, sort_keys=True, default=repr)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _cached(self, stage: Stage, key=None):
+        entry = self.manifest.get(stage.name)
+        if entry is None or (key is not None and entry["key"] != key):
+            return None
+        if stage.outputs and not os.path.exists(self._output_path(stage)):
+            return None
+        if not all(os.path.exists(path) for path in entry.get("files", [])):
+            return None
+        return entry
+
+    def _load(self, stage: Stage, entry):
+        if stage.outputs:
+            with open(self._output_path(stage), "rb") as f:
+                values = pickle.load(f)
+            self.artifacts.update(values)
+        self.hashes.update(entry["outputs"])
+
+    def _store(self, stage: Stage, key, values, elapsed):
+        hashes = {name: content_hash(value) for name, value in values.items()}
+        self.hashes.update(hashes)
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        if stage.outputs:
+            tmp_path = self._output_path(stage) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(values, f, protocol=PICKLE_PROTOCOL)
+            os.replace(tmp_path, self._output_path(stage))
+        self.manifest[stage.name] = {
+            "key": key,
+            "outputs": hashes,
+            "files": list(self.stage_files(stage)),
+            "created": time.time(),
+            "elapsed": round(elapsed, 3),
+        }
+        self._save_manifest()
+
+    # --- running ---
+
+    def run(self, stage: Stage):
+        """Runs or restores one stage and returns its outputs as a dict."""
+        if stage.enabled is not None and not stage.enabled(self.config):
+            return {}
+
+        if self.resuming and stage.name == self.resume_from:
+            # Forget this stage and everything after it so they all rerun
+            self.resuming = False
+            position = self.stage_names.index(stage.name)
+            for name in self.stage_names[position:]:
+                self.manifest.pop(name, None)
+
+        if self.resuming:
+            entry = self._cached(stage)
+            if entry is None:
+                raise RuntimeError(f"Cannot resume from '{self.resume_from}': no cached output for '{stage.name}'")
+            print(f"⏩ {stage.name}: reused from last run")
+            self._load(stage, entry)
+            return {name: self.artifacts[name] for name in stage.outputs}
+
+        key = self.stage_key(stage)
+        if self.enabled and not stage.volatile:
+            entry = self._cached(stage, key)
+            if entry is not None:
+                print(f"⏩ {stage.name}: inputs unchanged, using cached output")
+                self._load(stage, entry)
+                return {name: self.artifacts[name] for name in stage.outputs}
+
+        start = time.perf_counter()
+        result = stage.run(self.config, *(self.artifacts[name] for name in stage.inputs))
+        elapsed = time.perf_counter() - start
+
+        if len(stage.outputs) == 1:
+            result = (result,)
+        values = dict(zip(stage.outputs, result or ()))
+        self.artifacts.update(values)
+        self._store(stage, key, values, elapsed)
+        return values
@@ -0,0 +1,160 @@
+# src/text_features.py
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.co_occurrence import build_entity_index
+from src.contradiction_utils import CONTRADICTION_KEYWORDS
+from src.model import Signal
+from src.recursion_utils import PLATFORM_KEYWORDS
+from src.signal_store import KEY_BATCH
+
+MEMO_MAX_ENTRIES = 1_000_000  # persisted texts; least recently used rows are evicted beyond this
+
+
+class TextFeatures(NamedTuple):
+    """Everything the analysis stages read from a signal's text."""
+    recursive_depth: int  # distinct PLATFORM_KEYWORDS in the content
+    contradiction: bool  # any CONTRADICTION_KEYWORDS in the content
+    entities: Tuple[str, ...]  # entity ids mentioned in title + content, word-bounded
+    entity_digest: str  # EntityIndex.digest the entities were matched with
+
+
+def text_key(title: str, content: str) -> str:
+    return hashlib.blake2b(f"{title}\0{content}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class FeatureExtractor:
+    """
+    One pass over each text for recursion depth, contradiction markers and
+    entity mentions.
+
+    The platform and contradiction keywords share one compiled alternation,
+    tried at every position of the lowercased content. That keeps the
+    substring semantics of the per-keyword scans: the longest keyword
+    starting at a position wins, and the keywords it contains count as
+    found too. Entities come from the same lowercased text through the
+    co-occurrence EntityIndex.
+
+    Results are memoised by a hash of title and content, so duplicate texts
+    in a batch are analysed once. With a path the memo persists between runs
+    in one SQLite file: annotate() loads only the keys of the texts at hand,
+    save() writes what was analysed, and the least recently used rows beyond
+    max_entries are evicted. Rows from other keyword or entity lists are
+    dropped on open.
+    """
+
+    def __init__(self, nodes=None, path: Optional[str] = None, max_entries: int = MEMO_MAX_ENTRIES):
+        self.entity_index = build_entity_index(nodes)
+        self.platform = frozenset(PLATFORM_KEYWORDS)
+        self.contradiction = frozenset(CONTRADICTION_KEYWORDS)
+        keywords = sorted(self.platform | self.contradiction, key=lambda k: (-len(k), k))
+        self.pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+        self.contained = {keyword: frozenset(k for k in keywords if k in keyword) for keyword in keywords}
+        self.vocabulary = hashlib.blake2b(
+            json.dumps([sorted(self.platform), sorted(self.contradiction), self.entity_index.digest]).encode("utf-8"),
+            digest_size=8
+        ).hexdigest()
+
+        self.path = path
+        self.max_entries = max_entries
+        self.memo: Dict[str, TextFeatures] = {}  # features of the texts seen in this process
+        self.analyzed = 0
+        self._new: List[str] = []
+        self._loaded: List[str] = []
+        self.db = None
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.db = sqlite3.connect(path)
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS features (
+                    key TEXT PRIMARY KEY,
+                    vocabulary TEXT NOT NULL,
+                    recursive_depth INTEGER NOT NULL,
+                    contradiction INTEGER NOT NULL,
+                    entities TEXT NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self.db.execute("CREATE INDEX IF NOT EXISTS features_last_access ON features (last_access)")
+            self.db.execute("DELETE FROM features WHERE vocabulary != ?", (self.vocabulary,))
+            self.db.commit()
+
+    def _load(self, keys: List[str]):
+        """Reads memoised features for the given keys that are not in memory yet."""
+        keys = [key for key in dict.fromkeys(keys) if key not in self.memo]
+        digest = self.entity_index.digest
+        for start in range(0, len(keys), KEY_BATCH):
+            batch = keys[start:start + KEY_BATCH]
+            rows = self.db.execute(
+                f"SELECT key, recursive_depth, contradiction, entities FROM features "
+                f"WHERE vocabulary = ? AND key IN ({', '.join('?' * len(batch))})",
+                [self.vocabulary, *batch]
+            )
+            for key, depth, flag, entities in rows:
+                self.memo[key] = TextFeatures(depth, bool(flag), tuple(json.loads(entities)), digest)
+                self._loaded.append(key)
+
+    def extract(self, title: str, content: str) -> TextFeatures:
+        key = text_key(title, content)
+        features = self.memo.get(key)
+        if features is None and self.db is not None:
+            self._load([key])
+            features = self.memo.get(key)
+        if features is None:
+            content = content.lower()
+            found = set()
+            for keyword in self.pattern.findall(content):
+                found |= self.contained[keyword]
+            columns = self.entity_index.match_lowered(f"{title.lower()} {content}")
+            features = TextFeatures(
+                recursive_depth=len(found & self.platform),
+                contradiction=bool(found & self.contradiction),
+                entities=tuple(self.entity_index.entity_ids[j] for j in sorted(columns)),
+                entity_digest=self.entity_index.digest,
+            )
+            self.memo[key] = features
+            self.analyzed += 1
+            self._new.append(key)
+        return features
+
+    def annotate(self, signals: List[Signal]) -> List[Signal]:
+        """Sets signal.features on every signal and returns the list."""
+        if self.db is not None:
+            self._load([text_key(signal.title or "", signal.content or "") for signal in signals])
+        for signal in signals:
+            signal.features = self.extract(signal.title or "", signal.content or "")
+        return signals
+
+    def save(self):
+        """Writes newly analysed texts, refreshes the ones reused and evicts beyond max_entries."""
+        if self.db is None:
+            return
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (key, self.vocabulary, f.recursive_depth, int(f.contradiction), json.dumps(list(f.entities)), now)
+                    for key, f in ((key, self.memo[key]) for key in self._new)
+                )
+            )
+            self.db.executemany("UPDATE features SET last_access = ? WHERE key = ?", ((now, key) for key in self._loaded))
+            excess = self.db.execute("SELECT COUNT(*) FROM features").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.db.execute(
+                    "DELETE FROM features WHERE key IN (SELECT key FROM features ORDER BY last_access LIMIT ?)",
+                    (excess,)
+                )
+        self._new, self._loaded = [], []
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -1,4 +1,3 @@
-import tweepy
 import os
 from datetime import datetime
 from dotenv import load_dotenv
@@ -8,7 +7,15 @@ from src.twitter_handles import twitter_handles
 load_dotenv()
 BEARER_TOKEN = os.getenv("TWITTER_BEARER_TOKEN")
 
-client = tweepy.Client(bearer_token=BEARER_TOKEN)
+_client = None
+
+def get_client():
+    """tweepy client, created on first use so importing this module stays cheap."""
+    global _client
+    if _client is None:
+        import tweepy
+        _client = tweepy.Client(bearer_token=BEARER_TOKEN)
+    return _client
 
 def estimate_entropy(retweets: int, likes: int) -> float:
     raw = retweets / (likes + 1)
@@ -19,12 +26,13 @@ def estimate_velocity(likes: int, hours_old: float) -> float:
         return 1.0
     return min(round((likes / hours_old) / 100.0, 2), 1.0)
 
-def collect_signals_from_twitter(limit=10):
-    signals = []
-
-    # Prompt user for handles
+def prompt_twitter_nodes(max_nodes=3):
     input_str = input("\nEnter up to 3 Twitter nodes to fetch (comma-separated, e.g., elon_musk, trump, bbc): ")
-    selected_nodes = [s.strip().lower() for s in input_str.split(",") if s.strip()][:3]
+    return [s.strip().lower() for s in input_str.split(",") if s.strip()][:max_nodes]
+
+def collect_signals_from_twitter(nodes, limit=10):
+    signals = []
+    selected_nodes = list(nodes or [])
 
     if not selected_nodes:
         print("No Twitter nodes provided. Skipping Twitter collection.")
@@ -37,54 +45,82 @@ def collect_signals_from_twitter(limit=10):
             continue
 
         try:
-            user_data = client.get_user(username=handle)
-            tweets = client.get_users_tweets(
-                id=user_data.data.id,
-                max_results=limit,
-                tweet_fields=["created_at", "public_metrics"]
-            )
-
-            if not tweets.data:
-                print(f"ℹ️ No tweets found for {handle}")
-                continue
-
-            for tweet in tweets.data:
-                metrics = tweet.public_metrics
-                likes = metrics.get("like_count", 0)
-                retweets = metrics.get("retweet_count", 0)
-                timestamp = tweet.created_at
-                hours_old = (datetime.utcnow() - timestamp.replace(tzinfo=None)).total_seconds() / 3600
-
-                entropy = estimate_entropy(retweets, likes)
-                velocity = estimate_velocity(likes, hours_old)
-
-                # Build route (seed → user) only if valid seed node
-                route = [node_id]
-                seed_node = node_id
-
-                # Optional: simulate one router hop if needed (commented out)
-                # route.append(f"user_{random.randint(1, 5)}")
-
-                signal = Signal(
-                    id=f"{node_id}_{tweet.id}",
-                    content=tweet.text,
-                    title=tweet.text[:80],
-                    source="twitter",
-                    timestamp=timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    entropy=entropy,
-                    velocity=velocity,
-                    impact=round(min(1.0, (likes + 1) / 1000.0), 2),
-                    node=node_id,
-                    route=route,
-                    seed_node=seed_node
-                )
-
-                if len(route) < 2:
-                    print(f"⚠️ Incomplete route for signal {signal.id}. Downstream nodes missing. Skipping extra hops.")
-
-                signals.append(signal)
-
+            signals.extend(fetch_twitter_node_signals(node_id, limit=limit))
         except Exception as e:
             print(f"❌ Error fetching for {handle}: {e}")
 
+    return signals
+
+def fetch_tweet_records(handle: str, limit=10) -> list:
+    """Recent tweets for a handle as plain JSON-friendly records."""
+    client = get_client()
+    user_data = client.get_user(username=handle)
+    tweets = client.get_users_tweets(
+        id=user_data.data.id,
+        max_results=limit,
+        tweet_fields=["created_at", "public_metrics"]
+    )
+    return [
+        {
+            "id": tweet.id,
+            "text": tweet.text,
+            "created_at": int(tweet.created_at.timestamp()),
+            "like_count": tweet.public_metrics.get("like_count", 0),
+            "retweet_count": tweet.public_metrics.get("retweet_count", 0),
+        }
+        for tweet in tweets.data or []
+    ]
+
+def fetch_twitter_node_signals(node_id: str, limit=10, cache=None):
+    """
+    Fetches recent tweets for one seed node's handle as signals. Raises on API errors.
+    With a ResponseCache, the tweet list is reused while it is younger than the Twitter TTL.
+    """
+    signals = []
+    handle = twitter_handles[node_id]
+
+    if cache is not None:
+        tweets = cache.memoize("twitter", ["tweets", handle, limit], lambda: fetch_tweet_records(handle, limit))
+    else:
+        tweets = fetch_tweet_records(handle, limit)
+
+    if not tweets:
+        print(f"ℹ️ No tweets found for {handle}")
+        return signals
+
+    for tweet in tweets:
+        likes = tweet["like_count"]
+        retweets = tweet["retweet_count"]
+        timestamp = tweet["created_at"]
+        hours_old = (datetime.utcnow() - datetime.utcfromtimestamp(timestamp)).total_seconds() / 3600
+
+        entropy = estimate_entropy(retweets, likes)
+        velocity = estimate_velocity(likes, hours_old)
+
+        # Build route (seed → user) only if valid seed node
+        route = [node_id]
+        seed_node = node_id
+
+        # Optional: simulate one router hop if needed (commented out)
+        # route.append(f"user_{random.randint(1, 5)}")
+
+        signal = Signal(
+            id=f"{node_id}_{tweet['id']}",
+            content=tweet["text"],
+            title=tweet["text"][:80],
+            source="twitter",
+            timestamp=timestamp,
+            entropy=entropy,
+            velocity=velocity,
+            impact=round(min(1.0, (likes + 1) / 1000.0), 2),
+            node=node_id,
+            route=route,
+            seed_node=seed_node
+        )
+
+        if len(route) < 2:
+            print(f"⚠️ Incomplete route for signal {signal.id}. Downstream nodes missing. Skipping extra hops.")
+
+        signals.append(signal)
+
     return signals
\ No newline at end of file
@@ -1,10 +1,33 @@
 # src/visual_stats.py
 
-import matplotlib.pyplot as plt
 from collections import defaultdict
+from datetime import datetime, timezone
 from src.model import Signal
 
+def plot_entropy_over_time(signals):
+    import matplotlib.pyplot as plt
+
+    try:
+        signals_sorted = sorted(signals, key=lambda s: s.epoch)
+        times = [datetime.fromtimestamp(s.epoch, tz=timezone.utc) for s in signals_sorted]
+        entropy_vals = [s.entropy for s in signals_sorted]
+
+        plt.figure(figsize=(8, 4))
+        plt.plot(times, entropy_vals, marker='o', linestyle='-', color='blue')
+        plt.title("Signal Entropy Over Time")
+        plt.xlabel("Timestamp")
+        plt.ylabel("Entropy")
+        plt.grid(True)
+        plt.tight_layout()
+        plt.savefig("entropy_over_time.png")
+        print("📈 Entropy trend saved as entropy_over_time.png")
+
+    except Exception as e:
+        print(f"⚠️ Failed to plot entropy over time: {e}")
+
 def plot_avg_entropy_by_subreddit(signals):
+    import matplotlib.pyplot as plt
+
     subreddit_entropy = defaultdict(list)
 
     for s in signals:
@@ -22,6 +45,8 @@ def plot_avg_entropy_by_subreddit(signals):
     print("Saved: avg_entropy_by_subreddit.png")
 
 def plot_avg_nsi_by_subreddit(signals):
+    import matplotlib.pyplot as plt
+
     subreddit_nsi = defaultdict(list)
 
     for s in signals:
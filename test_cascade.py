@@ -0,0 +1,50 @@
+# test_cascade.py
+
+import networkx as nx
+
+from conftest import make_signal
+from src.cascade import CascadeSimulator, simulate_cascades
+
+
+def diamond():
+    # probability_scale=100 makes every edge certain; fast edges take 3s, the direct a -> d edge 19s
+    graph = nx.DiGraph()
+    graph.add_edge("a", "b", velocity=1.0, entropy=0.0)
+    graph.add_edge("b", "d", velocity=1.0, entropy=0.0)
+    graph.add_edge("a", "d", velocity=0.2, entropy=0.5)
+    graph.add_edge("d", "e", velocity=1.0, entropy=0.0)
+    return graph
+
+
+def arrivals(simulator, source):
+    nodes, offsets = simulator.run([simulator.graph.index[source]])
+    return dict(zip((simulator.graph.node_ids[i] for i in nodes.tolist()), offsets.tolist()))
+
+
+def test_run_keeps_earliest_arrival_and_resets_between_runs():
+    simulator = CascadeSimulator(diamond(), probability_scale=100, seed=0)
+    assert arrivals(simulator, "a") == {"a": 0, "b": 3, "d": 6, "e": 9}
+    assert arrivals(simulator, "d") == {"d": 0, "e": 3}
+    assert arrivals(simulator, "a") == {"a": 0, "b": 3, "d": 6, "e": 9}
+
+    bounded = CascadeSimulator(diamond(), probability_scale=100, horizon=5, seed=0)
+    assert arrivals(bounded, "a") == {"a": 0, "b": 3}
+
+
+def test_chunks_flush_by_rows_and_keep_missing_seeds():
+    simulator = CascadeSimulator(diamond(), probability_scale=100, seed=0)
+    signals = [
+        make_signal(id="s0", route=["a", "b"]),
+        make_signal(id="s1", route=["ghost"]),
+        make_signal(id="s2", route=[]),
+        make_signal(id="s3", route=["d"], timestamp=""),
+    ]
+
+    chunks = list(simulator.iter_chunks(signals, chunk_rows=4))
+    assert [len(chunk["node"]) for chunk in chunks] == [4, 3]
+    assert chunks[1]["signal_id"].tolist() == ["s1", "s3", "s3"]
+    assert chunks[1]["node"].tolist() == ["ghost", "d", "e"]
+
+    timeline = simulate_cascades(simulator, signals)
+    assert timeline[4] == {"signal_id": "s1", "node": "ghost", "arrival_time": "2025-01-01T00:00:00Z"}
+    assert [row["arrival_time"] for row in timeline[5:]] == ["", ""]
@@ -0,0 +1,68 @@
+# test_co_occurrence.py
+
+from conftest import make_signal
+from src.model import Node
+from src.co_occurrence import EntityIndex, track_co_occurrence
+
+
+def test_sparse_engine_matches_loop_engine():
+    signals = [
+        make_signal(id="s0", content="trump and modi met while bbc reported"),
+        make_signal(id="s1", content="modi spoke to bbc"),
+        make_signal(id="s2", content="trump, putin and xi in one room"),
+        make_signal(id="s3", content="nothing to see here"),
+        make_signal(id="s4", content="Trump Modi BBC"),
+    ]
+    assert track_co_occurrence(signals, engine="sparse") == track_co_occurrence(signals)
+
+
+def test_entity_index_respects_word_boundaries():
+    index = EntityIndex(["xi", "elon musk"])
+    assert index.match("a taxi driver") == set()
+    assert index.match("Xi met Elon Musk") == {0, 1}
+
+
+def test_custom_nodes():
+    nodes = [Node(id="alpha", type="influencer"), Node(id="beta", type="institution"), Node(id="gamma", type="router")]
+    signals = [make_signal(id="s0", content="alpha beta gamma"), make_signal(id="s1", content="alpha beta")]
+    memory = track_co_occurrence(signals, engine="sparse", nodes=nodes)
+    assert memory == {"alpha": {"beta": {"count": 2, "weight": 1.0}}, "beta": {"alpha": {"count": 2, "weight": 1.0}}}
+
+
+def test_store_accumulates_across_runs(tmp_path):
+    from src.co_occurrence_store import CoOccurrenceStore
+
+    first = [make_signal(id="s0", content="trump and modi"), make_signal(id="s1", content="modi and bbc")]
+    second = [make_signal(id="s2", content="trump and modi again")]
+
+    store = CoOccurrenceStore.open(str(tmp_path))
+    store.update(first)
+    changed = store.update(second)
+    assert changed == {"trump", "modi"}
+    assert store.weighted_map() == track_co_occurrence(first + second, engine="sparse")
+
+    reopened = CoOccurrenceStore.open(str(tmp_path))
+    assert reopened.weighted_map() == store.weighted_map()
+
+    reopened.compact()
+    assert CoOccurrenceStore.open(str(tmp_path)).weighted_map() == store.weighted_map()
+
+
+def test_compiled_index_matches_decay_weighted_lookup():
+    import random
+    from src.co_occurrence import CoOccurrenceIndex, decay_weighted_lookup
+
+    rng = random.Random(7)
+    vocab = [f"w{i}" for i in range(30)]
+    co_map = {
+        word: {t: {"count": 1, "weight": rng.choice([0.25, 0.5, 1.0])} for t in rng.sample(vocab, 5)}
+        for word in vocab[:20]
+    }
+    texts = [" ".join(rng.choices(vocab + ["other"], k=8)) for _ in range(50)] + ["nothing known"]
+
+    index = CoOccurrenceIndex.from_map(co_map)
+    for text in texts:
+        expected = decay_weighted_lookup(text, co_map)
+        assert index.lookup(text) == expected
+        assert index.top_k(text, 3) == expected[:3]
+    assert index.top_1_batch(texts) == [(decay_weighted_lookup(t, co_map) or [None])[0] for t in texts]
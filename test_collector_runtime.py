@@ -0,0 +1,126 @@
+# test_collector_runtime.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from src.collector_runtime import CollectorRuntime, CollectorTask, make_pooled_session, news_tasks
+
+DELAY = 0.3
+ETAG = '"v1"'
+
+
+class StubNewsAPI(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        topic = parse_qs(urlparse(self.path).query)["q"][0]
+        StubNewsAPI.hits.append((topic, self.headers.get("If-None-Match")))
+        time.sleep(DELAY)
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"articles": [{
+            "title": f"{topic} headline",
+            "description": f"Something happened about {topic}",
+            "publishedAt": "2025-01-01T00:00:00Z",
+        }]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubNewsAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v2/everything"
+
+
+def test_topics_are_fetched_concurrently():
+    server, url = serve()
+    try:
+        topics = [f"topic{i}" for i in range(6)]
+        start = time.perf_counter()
+        signals = CollectorRuntime().collect(news_tasks(topics, session=make_pooled_session(), base_url=url))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    assert [s.subreddit for s in signals] == topics
+    assert elapsed < DELAY * len(topics) / 2
+
+
+def test_source_limit_and_failures():
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fetch():
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return []
+
+    def broken():
+        raise RuntimeError("boom")
+
+    tasks = [CollectorTask("twitter", str(i), fetch) for i in range(6)] + [CollectorTask("news", "bad", broken)]
+    assert list(CollectorRuntime(source_limits={"twitter": 2}).stream(tasks)) == []
+    assert active["peak"] == 2
+
+
+def test_response_cache_ttl_and_revalidation(tmp_path):
+    from src.http_cache import ResponseCache, request_key
+    from src.news_collector import fetch_news_topic
+
+    assert request_key("GET", "http://x/a?apiKey=1&q=ai") == request_key("GET", "http://x/a?q=ai&apiKey=2")
+
+    server, url = serve()
+    StubNewsAPI.hits = []
+    try:
+        cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+        first = fetch_news_topic("ai", base_url=url, cache=cache)
+        fetch_news_topic("ai", base_url=url, cache=cache)
+        assert StubNewsAPI.hits == [("ai", None)]
+
+        stale = ResponseCache(str(tmp_path / "cache.sqlite"), ttls={"news": 0})
+        again = fetch_news_topic("ai", base_url=url, cache=stale)
+        assert StubNewsAPI.hits[-1] == ("ai", ETAG)
+        assert [s.title for s in again] == [s.title for s in first]
+    finally:
+        server.shutdown()
+
+
+def test_collect_signals_closes_cache_and_session(tmp_path, monkeypatch):
+    from src import collector_runtime, http_cache
+    from src.pipeline import PipelineConfig, collect_signals
+
+    closed = []
+    sessions = []
+
+    class RecordingCache(http_cache.ResponseCache):
+        def close(self):
+            closed.append("cache")
+            super().close()
+
+    def failing_news_tasks(topics, limit, session, cache):
+        sessions.append(session)
+        monkeypatch.setattr(session, "close", lambda: closed.append("session"))
+        return [CollectorTask("news", topic, lambda: 1 / 0) for topic in topics]
+
+    monkeypatch.setattr(http_cache, "ResponseCache", RecordingCache)
+    monkeypatch.setattr(collector_runtime, "news_tasks", failing_news_tasks)
+    config = PipelineConfig(news_topics=["ai"], response_cache_path=str(tmp_path / "responses.sqlite"))
+    assert collect_signals(config) == []  # a failed task yields no signals, the run goes on
+    assert sorted(closed) == ["cache", "session"] and len(sessions) == 1
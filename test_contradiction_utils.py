@@ -0,0 +1,57 @@
+# test_contradiction_utils.py
+
+import random
+from itertools import combinations
+
+from conftest import make_signal
+from src.contradiction_utils import (
+    ContradictionEngine, analyze_contradictions, detect_contradictions, is_contradictory,
+)
+
+TEXTS = ["this is fake news", "officials confirm the deal", "never happened", "markets rally", "a hoax again"]
+
+
+def make_signals(count, seed=3):
+    rng = random.Random(seed)
+    return [
+        make_signal(id=f"s{i}", content=rng.choice(TEXTS), subreddit=rng.choice(["worldnews", "politics", None]))
+        for i in range(count)
+    ]
+
+
+def brute_force(signals):
+    return [
+        (s1, s2) for s1, s2 in combinations(signals, 2)
+        if s1.subreddit != s2.subreddit and is_contradictory(s1.content, s2.content)
+    ]
+
+
+def test_grouped_engine_matches_pairwise_comparison():
+    signals = make_signals(60)
+    expected = brute_force(signals)
+
+    pairs = detect_contradictions(signals)
+    flagged = {id(s) for pair in expected for s in pair}
+    assert {id(s) for s in signals if getattr(s, "is_contradiction", False)} == flagged  # marked before iterating
+    assert list(pairs) == expected
+    assert list(detect_contradictions(signals, limit=7)) == expected[:7]
+    assert ContradictionEngine(signals).count() == len(expected)
+
+
+def test_pairs_are_lazy_and_capped():
+    engine = ContradictionEngine(make_signals(60))
+    assert len(list(engine.pairs(limit=5))) == 5
+    assert set(engine.index_pairs()) == {
+        (i, j) for i, j in combinations(range(60), 2)
+        if engine.signals[i].subreddit != engine.signals[j].subreddit and engine.flags[i] != engine.flags[j]
+    }
+
+
+def test_analyze_returns_pairs_without_marking(capsys):
+    signals = make_signals(60)
+    expected = brute_force(signals)
+
+    assert analyze_contradictions(signals, limit=4) == expected[:4]
+    assert not any(getattr(s, "is_contradiction", False) for s in signals)
+    assert f"{len(expected)} contradictory pairs in total" in capsys.readouterr().out
+    assert analyze_contradictions(signals) == expected
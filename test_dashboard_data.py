@@ -0,0 +1,49 @@
+# test_dashboard_data.py
+
+import pandas as pd
+
+from conftest import make_signal
+from src.dashboard_data import SignalTable, format_page, page_count
+
+
+def test_query_filters_sorts_and_pages():
+    table = SignalTable(pd.DataFrame({
+        "id": ["a", "b", "c", "d"],
+        "title": ["Border vote", "market", "Vote count", "vote"],
+        "source": ["reddit", "news", "reddit", "reddit"],
+        "entropy": [0.1, 0.5, 0.9, float("nan")],
+        "route": [["x", "y"], ["x"], [], ["z"]],
+    }))
+
+    rows = table.query(search="VOTE", sources=["reddit"], sort_by="entropy")
+    assert table.frame["id"].take(rows).tolist() == ["c", "a", "d"]
+    assert table.query(search="VOTE", sources=["reddit"], sort_by="entropy") is rows
+    assert table.query(ranges={"entropy": (0.2, 1.0)}).tolist() == [1, 2]
+
+    assert page_count(rows, 2) == 2
+    page = table.page(rows, 1, 2)
+    assert page["id"].tolist() == ["d"]
+    assert page["entropy"].tolist() == ["❌"]
+    assert format_page(table.frame.take([0, 2]))["route"].tolist() == ["x → y", "❌"]
+
+
+def test_summary_is_recomputed_when_the_export_changes(tmp_path, monkeypatch):
+    from src.dashboard_data import load_signal_table, load_summary
+    from src.export_utils import export_signal_summary, export_signals_to_csv
+
+    def signals(title):
+        return [make_signal(id=f"s{i}", title=title, source="reddit", entropy=0.1 * i, route=["reddit"])
+                for i in range(3)]
+
+    monkeypatch.chdir(tmp_path)
+    export_signals_to_csv(signals("first"))
+    export_signal_summary(signals("first"), exports=["signals.csv"])
+    summary = load_summary(load_signal_table("signals"))
+    assert summary["exports"][0][0] == "signals.csv"
+
+    # Same row count, different file: the stored aggregates no longer describe it
+    export_signals_to_csv(signals("second export"))
+    table = load_signal_table("signals")
+    recomputed = load_summary(table)
+    assert "exports" not in recomputed and recomputed["rows"] == len(table) == 3
+    assert load_summary() == summary  # without a table the stored summary is all there is
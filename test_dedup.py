@@ -0,0 +1,36 @@
+# test_dedup.py
+
+from conftest import make_signal
+from src.dedup import collapse_duplicates
+
+STORY = "Parliament passes the new border security bill after a long overnight debate in the capital"
+
+
+def test_near_duplicates_collapse_into_earliest_signal():
+    signals = [
+        make_signal(id="news_1", content=STORY, source="newsapi", timestamp=1700000100),
+        make_signal(id="tweet_1", content=STORY + " #breaking", source="twitter", timestamp=1700000200),
+        make_signal(id="other", content="Completely unrelated story about football results tonight", source="reddit",
+                    timestamp=1700000000),
+        make_signal(id="post_1", content=STORY.upper(), source="reddit", timestamp=1700000050),
+        make_signal(id="empty_1", source="reddit", timestamp=1700000000),
+        make_signal(id="empty_2", source="reddit", timestamp=1700000000),
+    ]
+    collapsed = collapse_duplicates(signals)
+
+    assert [s.id for s in collapsed] == ["post_1", "other", "empty_1", "empty_2"]
+    canonical = collapsed[0]
+    assert canonical.duplicate_ids == ["news_1", "tweet_1"]
+    assert canonical.source_counts == {"newsapi": 1, "twitter": 1, "reddit": 1}
+    assert canonical is not signals[3] and not hasattr(signals[3], "duplicate_ids")
+    assert not hasattr(collapsed[1], "duplicate_ids")
+
+
+def test_members_without_timestamp_never_stand_for_the_cluster():
+    signals = [
+        make_signal(id="undated", content=STORY, source="reddit", timestamp=""),
+        make_signal(id="dated", content=STORY + " today", source="newsapi", timestamp=1700000100, impact=0.5),
+    ]
+    collapsed = collapse_duplicates(signals)
+    assert [s.id for s in collapsed] == ["dated"]
+    assert collapsed[0].duplicate_ids == ["undated"]
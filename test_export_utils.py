@@ -0,0 +1,92 @@
+# test_export_utils.py
+
+import csv
+import json
+
+import networkx as nx
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from conftest import make_signal
+from src.export_utils import export_path, export_signals_to_csv, export_signals_to_parquet, read_export
+
+
+def test_parquet_round_trip(tmp_path):
+    signals = [
+        make_signal(id="reddit_0", source="reddit", timestamp="2025-01-01T08:00:00Z", route=["reddit", "user_1"]),
+        make_signal(id="newsapi_1", source="newsapi", timestamp="2025-01-02T09:30:00Z",
+                    route=["newsapi", "bbc", "cnn"]),
+        make_signal(id="reddit_2", source="reddit", timestamp="", route=["reddit"]),
+    ]
+    signals[0].drift_score = 0.125
+    signals[1].duplicate_ids = ["tweet_4", "reddit_7"]
+    signals[1].source_counts = {"newsapi": 1, "twitter": 1, "reddit": 1}
+    path = str(tmp_path / "signals.parquet")
+    export_signals_to_parquet(signals, path, partition_by="source")
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 2  # one per source
+    schema = parquet.schema_arrow
+    assert schema.field("route").type == pa.list_(pa.string())
+    assert pa.types.is_timestamp(schema.field("timestamp").type)  # Parquet stores seconds as ms
+    assert schema.field("timestamp").type.tz == "UTC"
+    assert schema.field("entropy").type == pa.float32()
+    assert schema.field("route_length").type == pa.int32()
+
+    table = pq.read_table(path).to_pydict()
+    assert table["id"] == ["newsapi_1", "reddit_0", "reddit_2"]
+    assert table["route"] == [["newsapi", "bbc", "cnn"], ["reddit", "user_1"], ["reddit"]]
+    assert table["timestamp"][2] is None
+    assert table["drift_score"] == [None, 0.125, None]  # never computed stays null, not 0.0
+    assert table["duplicate_ids"] == [["tweet_4", "reddit_7"], None, None]
+    assert table["source_counts"][0] == [("newsapi", 1), ("reddit", 1), ("twitter", 1)]
+    assert table["source_counts"][1] is None
+
+    export_signals_to_csv(signals, str(tmp_path / "signals.csv"))
+    with open(tmp_path / "signals.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert json.loads(rows[1]["duplicate_ids"]) == ["tweet_4", "reddit_7"]
+    assert json.loads(rows[1]["source_counts"]) == {"newsapi": 1, "reddit": 1, "twitter": 1}
+    assert rows[0]["duplicate_ids"] == rows[0]["source_counts"] == ""
+
+    frame = read_export(str(tmp_path / "signals"), columns=["id", "route"], filters=[("source", "=", "reddit")])
+    assert frame["id"].tolist() == ["reddit_0", "reddit_2"]
+    assert list(frame["route"][0]) == ["reddit", "user_1"]
+
+
+def test_deselected_format_is_removed(tmp_path, monkeypatch):
+    from src.pipeline import PipelineConfig, export_outputs
+
+    monkeypatch.chdir(tmp_path)
+    graph = nx.DiGraph([("reddit", "user_1")])
+    signals = [make_signal(id="reddit_0", source="reddit", route=["reddit", "user_1"])]
+    export_outputs(PipelineConfig(), signals, graph, {"reddit": 1.0})
+    assert export_path("signals") == "signals.parquet"
+
+    # A later CSV-only export must not leave the older Parquet file in front of it
+    export_outputs(PipelineConfig(export_formats=["csv"]), signals, graph, {"reddit": 1.0})
+    assert not (tmp_path / "signals.parquet").exists() and not (tmp_path / "nodes.parquet").exists()
+    assert export_path("signals") == "signals.csv"
+
+
+def test_streamed_timeline_matches_buffered_export(tmp_path):
+    from src.export_utils import export_propagation_timeline, write_timeline_chunks
+    from src.simulator import iter_timeline_chunks, simulate_propagation
+
+    signals = [make_signal(id=f"s{i}", timestamp=f"2025-01-0{i + 1}T08:00:00Z",
+                           route=["reddit", "user_1", "cnn"][:i + 1]) for i in range(3)]
+    signals.append(make_signal(id="s3", timestamp="", route=["newsapi", "bbc"]))
+
+    export_propagation_timeline(simulate_propagation(signals), str(tmp_path / "buffered.csv"))
+    rows = write_timeline_chunks(iter_timeline_chunks(signals, chunk_size=2), str(tmp_path / "streamed.csv"),
+                                 parquet_filename=str(tmp_path / "streamed.parquet"))
+    assert rows == 8
+    assert (tmp_path / "streamed.csv").read_bytes() == (tmp_path / "buffered.csv").read_bytes()
+
+    # Hops of a signal without a timestamp are null arrivals, not the MISSING_EPOCH sentinel
+    table = pq.read_table(str(tmp_path / "streamed.parquet"))
+    assert pq.ParquetFile(str(tmp_path / "streamed.parquet")).metadata.num_row_groups == 2
+    arrival = table.column("arrival_time").to_pylist()
+    assert arrival[-2:] == [None, None]
+    assert None not in arrival[:-2]
+    assert arrival[0].isoformat() == "2025-01-01T08:00:00+00:00"
@@ -0,0 +1,167 @@
+# test_graph_utils.py
+
+import pytest
+
+from conftest import make_signal
+from src.model import Node
+from src.graph_utils import build_graph
+
+
+def test_shared_hops_are_aggregated_not_overwritten():
+    nodes = [Node(id="trump", type="influencer", metadata={"region": "us"})]
+    signals = [
+        make_signal(id="s0", route=["trump", "reddit", "user_1"], velocity=0.2, entropy=0.1),
+        make_signal(id="s1", route=["trump", "reddit"], velocity=0.6, entropy=0.5, is_recursive=True),
+        make_signal(id="s2", route=["reddit", "user_1", "trump"], velocity=1.0, entropy=0.9),
+        make_signal(id="s3", route=["solo"], velocity=1.0, entropy=1.0),
+    ]
+    graph = build_graph(nodes, signals, max_signal_ids=1)
+
+    assert list(graph.nodes()) == ["trump", "reddit", "user_1"]
+    assert graph.nodes["trump"]["type"] == "influencer"
+    assert graph.nodes["trump"]["signal"]["id"] == "s1"
+    assert graph.nodes["reddit"]["type"] == "router"
+
+    hop = graph.edges["trump", "reddit"]
+    assert hop["signal_count"] == 2
+    assert hop["velocity"] == pytest.approx(0.4)
+    assert hop["velocity_max"] == 0.6
+    assert hop["entropy"] == pytest.approx(0.3)
+    assert hop["recursive_fraction"] == 0.5
+    assert hop["is_recursive"] is True
+    assert hop["signal_id"] == "s0"
+    assert hop["signal_ids"] == ["s0"]
+
+    assert graph.edges["reddit", "user_1"]["signal_count"] == 2
+    assert graph.edges["user_1", "trump"]["signal_count"] == 1
+    assert graph.number_of_edges() == 3
+
+
+def test_csr_backend_matches_networkx():
+    import networkx as nx
+    from src.csr_graph import CSRGraph
+    from src.graph_utils import sampled_betweenness_centrality
+    from src.loop_utils import condensation_summary, cycle_participation
+
+    graph = nx.gnm_random_graph(60, 240, seed=5, directed=True)
+    graph.add_edge(3, 3)
+    csr = CSRGraph.from_networkx(graph)
+
+    assert csr.as_dict(csr.in_degree()) == dict(graph.in_degree())
+    assert csr.as_dict(csr.betweenness()) == pytest.approx(nx.betweenness_centrality(graph))
+    assert csr.as_dict(csr.closeness()) == pytest.approx(nx.closeness_centrality(graph))
+    sampled = sampled_betweenness_centrality(graph, 10, seed=1)
+    assert csr.as_dict(csr.betweenness(10, seed=1)) == pytest.approx(sampled)
+    with pytest.raises(ValueError):
+        csr.betweenness(1)
+    assert sampled_betweenness_centrality(graph, 61, seed=1) == pytest.approx(nx.betweenness_centrality(graph))
+    assert csr.condensation_summary() == condensation_summary(graph)
+    assert csr.cycle_participation() == cycle_participation(graph)
+    assert sorted(csr.reachable([0])) == sorted(nx.descendants(graph, 0) | {0})
+    assert sorted(csr.to_networkx().edges()) == sorted(graph.edges())
+
+
+def test_layout_cache_keeps_unchanged_nodes_fixed(tmp_path):
+    import networkx as nx
+    from src.layout_cache import LayoutCache, incremental_layout
+
+    def moved(before, after):
+        return {node for node in before if max(abs(a - b) for a, b in zip(before[node], after[node])) > 1e-5}
+
+    graph = nx.relabel_nodes(nx.gnm_random_graph(40, 80, seed=3, directed=True), str)
+    cache = LayoutCache(str(tmp_path / "layout.json"))
+    first = incremental_layout(graph, cache)
+    cache.save()
+    assert not moved(first, incremental_layout(graph, LayoutCache(str(tmp_path / "layout.json"))))
+
+    graph.add_edge("0", "new")
+    for method in ("spring", "grid"):
+        grown = incremental_layout(graph, LayoutCache(str(tmp_path / "layout.json")), method=method)
+        assert moved(first, grown) <= {"0"}
+        assert "new" in grown
+
+
+def test_route_enrichment_index_is_deterministic():
+    from src.co_occurrence import CoOccurrenceIndex
+    from src.graph_utils import RouteEnrichmentIndex, detect_cross_platform_bridges
+
+    nodes = [Node(id=p, type="platform", metadata={}) for p in ("reddit", "twitter", "youtube")]
+    history = [
+        make_signal(id="s0", route=["reddit", "hub_b", "twitter"]),
+        make_signal(id="s1", route=["reddit", "hub_a", "twitter"]),
+        make_signal(id="s2", route=["reddit", "hub_a", "youtube"]),
+        make_signal(id="s3", route=["twitter", "hub_c", "youtube"]),
+    ]
+    transitions, bridges = detect_cross_platform_bridges(history, nodes)
+    index = RouteEnrichmentIndex(transitions, bridges)
+    assert index.bridges == ["hub_a", "hub_b", "hub_c"]
+    assert index.best_target == {"reddit": "twitter", "twitter": "youtube"}
+
+    memory = CoOccurrenceIndex.from_map({"trump": {"modi": {"count": 1, "weight": 1.0}}})
+    pending = make_signal(id="s4", route=[])
+    pending.content = "trump speaks"
+    pending.source = "Reddit"
+    unchanged = make_signal(id="s5", route=["reddit", "twitter"])
+    assert index.enrich([pending, unchanged], memory) == [pending]
+    assert pending.route == ["user_1", "user_2", "modi", "hub_a", "twitter"]
+
+    index.reinforce(unchanged)
+    assert unchanged.route == ["reddit", "hub_a", "twitter"]
+
+
+def test_power_index_cache_hits_until_graph_changes(tmp_path, monkeypatch):
+    import networkx as nx
+    from src import graph_utils
+    from src.graph_utils import PowerIndexCache, centrality_scores
+
+    calls = []
+    exact = nx.betweenness_centrality
+    monkeypatch.setattr(graph_utils.nx, "betweenness_centrality", lambda *a, **k: calls.append(k) or exact(*a, **k))
+
+    graph = nx.relabel_nodes(nx.gnm_random_graph(30, 90, seed=7, directed=True), str)
+    first = centrality_scores(graph, cache=PowerIndexCache(str(tmp_path)))
+    # A fresh cache over the same directory reads the JSON back, with the graph's own node ids
+    assert centrality_scores(graph, cache=PowerIndexCache(str(tmp_path))) == first
+    assert len(calls) == 1
+
+    cache = PowerIndexCache(str(tmp_path))
+    centrality_scores(graph, approximate=True, samples=5, cache=cache)
+    assert len(list(tmp_path.glob("*.json"))) == 2  # sampling parameters are part of the key
+
+    graph.add_edge("0", "29")
+    between, _ = centrality_scores(graph, cache=cache)
+    assert len(calls) == 2
+    assert between == pytest.approx(exact(graph))
+
+
+def test_sampled_centrality_scaling():
+    import networkx as nx
+    from src.cli import build_parser
+    from src.graph_utils import (
+        betweenness_sample_size,
+        centrality_scores,
+        sampled_betweenness_centrality,
+        sampled_closeness_centrality,
+    )
+
+    assert betweenness_sample_size(2, 0.05) == 2
+    assert betweenness_sample_size(100, 0.05) == 100  # capped at n
+    assert betweenness_sample_size(10 ** 6, 0.05) == 3363  # ln(2e7) / (2 * 0.05 ** 2)
+    assert betweenness_sample_size(10 ** 6, 0.1) < betweenness_sample_size(10 ** 6, 0.05)
+
+    graph = nx.gnm_random_graph(80, 400, seed=2, directed=True)
+    exact = nx.closeness_centrality(graph)
+    # Every node as a pivot is the exact computation, whatever order the pivots come in
+    assert sampled_closeness_centrality(graph, 80, seed=3) == pytest.approx(exact)
+    sampled = sampled_closeness_centrality(graph, 40, seed=3)
+    assert max(abs(sampled[node] - exact[node]) for node in graph) < 0.1
+    assert centrality_scores(graph, approximate=True, samples=80) == centrality_scores(graph)
+
+    # One pivot cannot scale its own score; it is rejected instead of producing NaN
+    with pytest.raises(ValueError):
+        centrality_scores(graph, approximate=True, samples=1)
+    with pytest.raises(ValueError):
+        sampled_betweenness_centrality(graph, 1)
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["--centrality-samples", "1"])
+    assert build_parser().parse_args(["--centrality-samples", "2"]).centrality_samples == 2
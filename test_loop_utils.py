@@ -0,0 +1,42 @@
+# test_loop_utils.py
+
+import networkx as nx
+
+from src.loop_utils import condensation_summary, cycle_participation, find_cycles, iter_cycles
+
+
+def loop_graph():
+    graph = nx.complete_graph(4, create_using=nx.DiGraph)  # 6 two-cycles, 8 three-cycles, 6 four-cycles
+    graph.add_edges_from([(3, "tail"), ("tail", "end"), ("solo", "solo")])
+    return graph
+
+
+def test_condensation_summary_counts_only_cyclic_components():
+    summary = condensation_summary(loop_graph())
+    assert summary == {
+        "nodes": 7,
+        "components": 4,
+        "cyclic_components": 2,
+        "largest_cyclic_component": 4,
+        "nodes_in_cycles": 5,
+        "component_sizes": [4, 1],
+    }
+
+
+def test_length_bound_limits_cycles():
+    graph = loop_graph()
+    assert len(list(iter_cycles(graph, max_length=None))) == 21
+    assert sorted(len(cycle) for cycle in iter_cycles(graph, max_length=2)) == [1] + [2] * 6
+    assert cycle_participation(graph, max_length=2)["solo"] == 1
+
+
+def test_find_cycles_truncates():
+    complete = find_cycles(loop_graph(), max_length=3)
+    assert len(complete.cycles) == 15 and not complete.truncated and complete.reason is None
+
+    capped = find_cycles(loop_graph(), max_length=None, max_cycles=5)
+    assert len(capped.cycles) == 5 and capped.truncated and capped.reason == "max_cycles"
+
+    # An exhausted budget stops before the first component is searched
+    expired = find_cycles(loop_graph(), time_budget=-1)
+    assert expired.cycles == [] and expired.truncated and expired.reason == "time_budget"
@@ -0,0 +1,64 @@
+# test_model.py
+
+import pickle
+
+from conftest import make_signal
+from src.model import MISSING_EPOCH, NodeRegistry, RouteView, format_epoch, node_registry, parse_epoch
+
+
+def test_node_registry_interns_once():
+    registry = NodeRegistry()
+    assert registry.intern("cnn") == 0
+    assert registry.intern("bbc") == 1
+    assert registry.intern("cnn") == 0
+    assert registry.get("fox") is None and "fox" not in registry
+    assert registry.names([1, 0]) == ["bbc", "cnn"]
+    assert len(registry) == 2
+
+
+def test_route_view_equality_and_mutation():
+    signal = make_signal(route=["reddit", "user_1"])
+    route = signal.route
+    assert isinstance(route, RouteView)
+    assert route == ["reddit", "user_1"] and route == ("reddit", "user_1")
+    assert route == make_signal(route=["reddit", "user_1"]).route
+    assert route != ["reddit"]
+
+    route.append("cnn")
+    route.insert(0, "seed")
+    route[1] = "twitter"
+    del route[2]
+    assert signal.route == ["seed", "twitter", "cnn"]  # views write through to the signal
+    assert signal.route[1:] == ["twitter", "cnn"]
+    assert "cnn" in signal.route and "never_seen_node" not in signal.route
+    assert "never_seen_node" not in node_registry  # membership tests do not intern
+    assert signal.route + ["x"] == ["seed", "twitter", "cnn", "x"]
+
+    copy = make_signal(route=signal.route)
+    copy.route.append("bbc")
+    assert signal.route == ["seed", "twitter", "cnn"]  # assigning a view copies its keys
+
+
+def test_signal_pickles_route_by_name_with_metrics():
+    signal = make_signal(route=["reddit", "user_1", "cnn"])
+    signal.drift_score = 0.4
+    signal.duplicate_ids = ["tweet_1"]
+
+    restored = pickle.loads(pickle.dumps(signal))
+    assert restored == signal
+    assert restored.route == ["reddit", "user_1", "cnn"]
+    assert restored._metric_values() == {"drift_score": 0.4, "duplicate_ids": ["tweet_1"]}
+    assert not hasattr(restored, "nsi_score")
+
+
+def test_epoch_round_trip():
+    epoch = parse_epoch("2025-01-31T12:30:00Z")
+    assert epoch == 1738326600
+    assert format_epoch(epoch) == "2025-01-31T12:30:00Z"
+    assert parse_epoch("") == MISSING_EPOCH
+    assert format_epoch(MISSING_EPOCH) == ""
+
+    missing = make_signal(route=[], timestamp="")
+    assert missing.epoch == MISSING_EPOCH and missing.timestamp == ""
+    assert pickle.loads(pickle.dumps(missing)).epoch == MISSING_EPOCH
+    assert make_signal(route=[], timestamp=epoch).timestamp == "2025-01-31T12:30:00Z"
@@ -0,0 +1,51 @@
+# test_propagation_animator.py
+
+import networkx as nx
+import numpy as np
+from PIL import Image, ImageSequence
+
+from propagation_animator import key_frames, load_state, render_gif
+from src.export_utils import export_graph_to_json, export_propagation_timeline
+
+
+def write_inputs(tmp_path):
+    graph = nx.DiGraph()
+    graph.add_node("a", type="influencer")
+    graph.add_node("b", type="platform")
+    graph.add_node("c", type="router")
+    graph.add_edges_from([("a", "b"), ("b", "c")])
+    export_graph_to_json(graph, str(tmp_path / "graph.json"))
+    export_propagation_timeline([
+        {"signal_id": "s1", "node": "a", "arrival_time": "2025-01-01T00:00:00Z"},
+        {"signal_id": "s1", "node": "b", "arrival_time": "2025-01-01T00:00:10Z"},
+        {"signal_id": "s2", "node": "outside", "arrival_time": "2025-01-01T00:00:20Z"},
+        {"signal_id": "s1", "node": "c", "arrival_time": "2025-01-01T00:00:30Z"},
+        {"signal_id": "s2", "node": "b", "arrival_time": "2025-01-01T00:00:30Z"},
+    ], str(tmp_path / "timeline.csv"))
+
+
+def gif_frames(path):
+    with Image.open(path) as gif:
+        return [(np.asarray(frame.convert("RGB")), frame.info["duration"]) for frame in ImageSequence.Iterator(gif)]
+
+
+def test_parallel_render_matches_single_process(tmp_path):
+    write_inputs(tmp_path)
+    state = load_state(str(tmp_path / "graph.json"), str(tmp_path / "timeline"))
+
+    assert state.nodes == ["a", "b", "c"]
+    assert state.frames == 4
+    assert state.node_step.tolist() == [0, 1, 3]  # earliest arrival per node
+    assert state.edges.tolist() == [[0, 1], [1, 2]]
+    # Step 2 only reaches a node outside the graph, so it extends the previous frame
+    assert key_frames(state) == ([0, 1, 3], [1, 2, 1])
+
+    render_gif(state, str(tmp_path / "single.gif"), dpi=20, workers=1, duration=100)
+    render_gif(state, str(tmp_path / "parallel.gif"), dpi=20, workers=2, duration=100)
+    single, parallel = gif_frames(tmp_path / "single.gif"), gif_frames(tmp_path / "parallel.gif")
+
+    assert [duration for _, duration in single] == [100, 200, 100]
+    assert len(single) == len(parallel)
+    for (expected, _), (actual, _) in zip(single, parallel):
+        assert np.array_equal(expected, actual)
+    assert not np.array_equal(single[0][0], single[-1][0])
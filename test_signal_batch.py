@@ -0,0 +1,45 @@
+# test_signal_batch.py
+
+import pytest
+
+from conftest import make_signal
+from src.graph_utils import calculate_truth_drift, compute_narrative_stability_index
+from src.signal_batch import SignalBatch
+from src.text_features import TextFeatures
+
+
+def test_round_trip_keeps_fields_and_every_metric():
+    first = make_signal(id="reddit_0", content="body 0", source="reddit", timestamp=1700000000, entropy=0.3,
+                        impact=0.4, node="cnn", route=["reddit", "user_1", "cnn"], subreddit="worldnews",
+                        seed_node="reddit")
+    first.drift_score = 0.36
+    first.is_contradiction = True
+    first.duplicate_ids = ["tweet_9"]
+    first.source_counts = {"reddit": 1, "twitter": 1}
+    first.features = TextFeatures(2, True, ("cnn",), "abc")
+    second = make_signal(id="newsapi_1", source="newsapi", timestamp=1700000001, node="newsapi", route=["newsapi"])
+    second.is_contradiction = False
+
+    restored = SignalBatch.from_signals([first, second]).to_signals()
+
+    assert restored == [first, second]
+    assert restored[0]._metric_values() == first._metric_values()
+    assert restored[1]._metric_values() == {"is_contradiction": False}
+
+
+def test_vectorized_metrics_match_per_signal_functions(capsys):
+    routes = [["reddit"], ["reddit", "user_1"], ["newsapi", "bbc", "cnn", "user_2"], ["twitter", "user_3", "cnn"]]
+    signals = [make_signal(id=f"s{i}", source=route[0], entropy=0.1 * (i + 1), velocity=0.9 - 0.2 * i,
+                           impact=0.4 + i / 10, route=route) for i, route in enumerate(routes)]
+    power_scores = {"reddit": 1.25, "newsapi": 3.5}
+
+    batch = SignalBatch.from_signals(signals)
+    drift = batch.compute_truth_drift().tolist()
+    nsi = batch.compute_narrative_stability_index(power_scores).tolist()
+
+    calculate_truth_drift(signals)
+    compute_narrative_stability_index(None, signals, power_scores)
+    capsys.readouterr()
+    assert drift == pytest.approx([s.drift_score for s in signals])
+    assert nsi == pytest.approx([s.nsi_score for s in signals])
+    assert nsi[3] == 0.0  # unscored source
@@ -0,0 +1,53 @@
+# test_signal_store.py
+
+from conftest import make_signal
+from src.signal_store import SignalStore
+
+
+def test_upsert_deduplicates_and_query_filters(tmp_path):
+    path = str(tmp_path / "signals.sqlite")
+    first = [
+        make_signal(id="reddit_0", content="body 0", source="reddit", subreddit="worldnews"),
+        make_signal(id="newsapi_1", content="body 1", source="newsapi", timestamp="2025-01-02T00:00:00Z"),
+    ]
+    store = SignalStore(path)
+    assert store.upsert(first + [make_signal(id="reddit_0", content="body 0", source="reddit")]) == first
+    store.close()
+
+    # Same content under a different id is the same row; measures are refreshed
+    store = SignalStore(path)
+    again = make_signal(id="renamed", content="body 0", source="reddit", velocity=0.9, route=["reddit", "user_1"])
+    new = make_signal(id="reddit_2", content="body 2", source="reddit", timestamp="2025-01-03T00:00:00Z",
+                      subreddit="worldnews")
+    assert store.upsert([again, new]) == [new]
+    assert len(store) == 3
+
+    reddit = store.query(sources=["reddit"])
+    assert [s.id for s in reddit] == ["reddit_0", "reddit_2"]
+    assert reddit[0].velocity == 0.9
+    assert reddit[0].route == ["reddit", "user_1"]
+    assert [s.id for s in store.query(since="2025-01-02", until="2025-01-02T23:59:59Z")] == ["newsapi_1"]
+    assert [s.id for s in store.query(subreddits=["worldnews"], limit=1)] == ["reddit_0"]
+
+
+def test_until_date_includes_the_whole_day(tmp_path):
+    store = SignalStore(str(tmp_path / "signals.sqlite"))
+    store.upsert([
+        make_signal(id="reddit_0", content="body 0", source="reddit", timestamp="2025-01-31T18:30:00Z"),
+        make_signal(id="reddit_1", content="body 1", source="reddit", timestamp="2025-02-01T00:00:00Z"),
+    ])
+    assert [s.id for s in store.query(until="2025-01-31")] == ["reddit_0"]
+    assert [s.id for s in store.query(since="2025-02-01")] == ["reddit_1"]
+    assert store.query(until="2025-01-31T18:29:59Z") == []
+
+
+def test_cli_nothing_new_is_not_an_error(tmp_path, monkeypatch):
+    import json
+    from src.cli import main
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config.json").write_text(json.dumps({
+        "signal_store_path": "signals.sqlite", "stage_cache_dir": "stages", "plots": False,
+    }))
+    assert main(["--config", "config.json", "--no-collect", "--analysis-scope", "new"]) == 0
+    assert main(["--config", "config.json", "--no-collect"]) == 1  # an empty store query is
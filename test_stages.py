@@ -0,0 +1,93 @@
+# test_stages.py
+
+from dataclasses import dataclass
+
+import pytest
+
+from src.stages import Stage, StageRunner, module_closure, module_hash
+
+NAMES = ["collect", "double", "report"]
+
+
+@dataclass
+class Config:
+    factor: int = 2
+    report_path: str = ""
+
+
+def make_stages(calls):
+    def collect(config):
+        calls.append("collect")
+        return [1, 2, 3]
+
+    def double(config, values):
+        calls.append("double")
+        return [v * config.factor for v in values]
+
+    def report(config, values):
+        calls.append("report")
+        with open(config.report_path, "w") as f:
+            f.write(str(sum(values)))
+
+    return [
+        Stage("collect", collect, outputs=("values",), volatile=True),
+        Stage("double", double, inputs=("values",), outputs=("doubled",), params=("factor",),
+              modules=("src.dedup",)),
+        Stage("report", report, inputs=("doubled",), files=lambda config: (config.report_path,)),
+    ]
+
+
+def run_all(config, directory, **options):
+    calls = []
+    runner = StageRunner(config, directory=str(directory), stage_names=NAMES, **options)
+    for stage in make_stages(calls):
+        runner.run(stage)
+    return calls, runner
+
+
+def test_cache_hits_and_misses(tmp_path):
+    config = Config(report_path=str(tmp_path / "report.txt"))
+    cache = tmp_path / "stages"
+
+    calls, runner = run_all(config, cache)
+    assert calls == NAMES and runner.artifacts["doubled"] == [2, 4, 6]
+
+    # The volatile stage always reruns; unchanged output leaves the rest cached
+    calls, runner = run_all(config, cache)
+    assert calls == ["collect"]
+    assert runner.artifacts["doubled"] == [2, 4, 6]
+
+    config.factor = 3
+    assert run_all(config, cache)[0] == NAMES
+
+    # A cached stage whose output file is gone runs again
+    (tmp_path / "report.txt").unlink()
+    assert run_all(config, cache)[0] == ["collect", "report"]
+
+    assert run_all(config, cache, enabled=False)[0] == NAMES
+
+
+def test_resume_from(tmp_path):
+    config = Config(report_path=str(tmp_path / "report.txt"))
+    cache = tmp_path / "stages"
+    with pytest.raises(RuntimeError):
+        run_all(config, cache, resume_from="report")
+
+    run_all(config, cache)
+    # Earlier stages are restored even when volatile; the named stage and later ones rerun
+    calls, runner = run_all(config, cache, resume_from="double")
+    assert calls == ["double", "report"]
+    assert runner.artifacts["values"] == [1, 2, 3]
+
+    with pytest.raises(ValueError):
+        run_all(config, cache, resume_from="missing")
+
+
+def test_module_hash_follows_src_imports():
+    assert module_closure("src.dedup") == ["src.dedup", "src.model"]
+    assert "src.model" in module_closure("src.pipeline")  # through function-local imports
+    assert module_hash("src.dedup") != module_hash("src.model")
+    assert module_hash("src.no_such_module") == ""
+
+    runner = StageRunner(Config(), enabled=False, stage_names=NAMES)
+    assert runner.stage_modules(make_stages([])[1]) == ["src.dedup", __name__]
@@ -0,0 +1,69 @@
+# test_text_features.py
+
+from conftest import make_signal
+from src.co_occurrence import build_entity_index, build_incidence_matrix
+from src.contradiction_utils import ContradictionEngine, has_contradiction_marker
+from src.model import Node
+from src.recursion_utils import PLATFORM_KEYWORDS, assign_recursive_depth
+from src.text_features import FeatureExtractor
+
+NODES = [Node(id="trump", type="influencer"), Node(id="elon_musk", type="influencer"), Node(id="nyt", type="institution")]
+TEXTS = [
+    ("Trump on Twitter", "Elon Musk says it is NOT true, the thread went viral on reddit"),
+    ("nyt report", "Nothreads here, only a tweetstorm about elon_musk and Trump"),
+    ("Taxi drivers", "no platform mentioned"),
+    ("Trump on Twitter", "Elon Musk says it is NOT true, the thread went viral on reddit"),
+]
+
+
+def make_signals():
+    return [make_signal(id=f"s{i}", content=content, title=title, source="reddit", subreddit=f"r{i % 2}")
+            for i, (title, content) in enumerate(TEXTS)]
+
+
+def test_features_match_the_per_module_scans(tmp_path):
+    plain, featured = make_signals(), make_signals()
+    extractor = FeatureExtractor(NODES, path=str(tmp_path / "features.sqlite"))
+    extractor.annotate(featured)
+    assert len(extractor.memo) == extractor.analyzed == 3  # the repeated text is analysed once
+    extractor.save()
+    extractor.close()
+
+    index = build_entity_index(NODES)
+    assert (build_incidence_matrix(plain, index) != build_incidence_matrix(featured, index)).nnz == 0
+    for a, b in zip(plain, featured):
+        assign_recursive_depth(a)
+        assign_recursive_depth(b)
+        assert a.recursive_depth == b.recursive_depth
+        assert b.features.contradiction == has_contradiction_marker(a.content)
+    assert ContradictionEngine(featured).count() == ContradictionEngine(plain).count()
+
+    reloaded = FeatureExtractor(NODES, path=str(tmp_path / "features.sqlite"))
+    assert reloaded.annotate(make_signals())[0].features == featured[0].features
+    assert reloaded.analyzed == 0 and reloaded.memo == extractor.memo
+    reloaded.close()
+    changed = FeatureExtractor(NODES[:2], path=str(tmp_path / "features.sqlite"))
+    changed.annotate(make_signals())
+    assert changed.analyzed == 3  # other entity lists invalidate the stored rows
+    changed.close()
+    assert featured[0].features.recursive_depth == sum(k in TEXTS[0][1].lower() for k in PLATFORM_KEYWORDS)
+
+
+def test_persisted_memo_evicts_least_recently_used(tmp_path, monkeypatch):
+    from src import text_features
+
+    monkeypatch.setattr(text_features.time, "time", iter(range(1, 10)).__next__)  # one distinct tick per save
+    path = str(tmp_path / "features.sqlite")
+    first = FeatureExtractor(NODES, path=path, max_entries=2)
+    first.extract(*TEXTS[0])
+    first.save()
+    first.extract(*TEXTS[1])
+    first.save()
+    first.extract(*TEXTS[2])
+    first.save()
+    first.close()
+
+    reopened = FeatureExtractor(NODES, path=path, max_entries=2)
+    reopened.annotate(make_signals())
+    assert reopened.analyzed == 1  # TEXTS[0] was the oldest row and was evicted
+    reopened.close()